@@ -21,6 +21,14 @@ Modules:
 - summarizer: Content rewriting and summarization (T5/mT5)
 - intent_classifier: WhatsApp message intent detection (DistilBERT)
 - validator: Document and field validation (OCR + CNN)
+- model_registry: Process-wide cache of loaded ML models
+- quantization: Int8 export/load of transformer models for CPU serving
+- micro_batcher: Coalesces concurrent inference requests into batches
+- recommendation_cache: Result cache keyed by profile fingerprint + catalogue version
+- form_schema_cache: Classified form schemas keyed by field-list fingerprint
+- ocr_cache: OCR results keyed by image content hash + engine version
+- summary_store: Generated summaries keyed by content hash + language, style, model version
+- store_utils: File lock and model-file identity shared by the on-disk stores
 - learning_system: Self-learning AI with OpenAI integration (optional)
 - language_helper: Bilingual support (English + Hindi)
 """
@@ -60,9 +68,13 @@ try:
     # Advanced ML modules
     from .job_recommender import (
         AdvancedJobRecommender,
+        EncodedJobCatalog,
         FeatureExtractor,
         TwoTowerRetriever,
+        FlatIndex,
+        IVFIndex,
         LambdaMARTRanker,
+        get_advanced_recommender,
         get_recommendations
     )
     from .field_classifier import (
@@ -85,6 +97,35 @@ try:
         BagOfWordsClassifier,
         predict_intent
     )
+    from .recommendation_cache import (
+        RecommendationCache,
+        get_recommendation_cache,
+        stable_digest
+    )
+    from .form_schema_cache import (
+        FormSchemaCache,
+        get_form_schema_cache,
+        form_fingerprint
+    )
+    from .ocr_cache import (
+        OCRCache,
+        get_ocr_cache
+    )
+    from .summary_store import (
+        SummaryStore,
+        get_summary_store
+    )
+    from .micro_batcher import MicroBatcher
+    from .quantization import (
+        export_quantized_models,
+        compare_outputs
+    )
+    from .model_registry import (
+        ModelRegistry,
+        get_model_registry,
+        get_model,
+        preload_models
+    )
     from .validator import (
         AdvancedDocumentValidator,
         TesseractOCR,
@@ -124,9 +165,13 @@ __all__ = [
     # ========== Advanced ML Modules ==========
     # Job Recommender (LambdaMART + Two-Tower)
     "AdvancedJobRecommender",
+    "EncodedJobCatalog",
     "FeatureExtractor",
     "TwoTowerRetriever",
+    "FlatIndex",
+    "IVFIndex",
     "LambdaMARTRanker",
+    "get_advanced_recommender",
     "get_recommendations",
     
     # Field Classifier (CNN + Transformer)
@@ -158,6 +203,37 @@ __all__ = [
     "validate_document",
     "check_document_quality",
     
+    # Recommendation result cache (profile fingerprint + catalogue version)
+    "RecommendationCache",
+    "get_recommendation_cache",
+    "stable_digest",
+    
+    # Form schema cache (field-list fingerprint + classifier version)
+    "FormSchemaCache",
+    "get_form_schema_cache",
+    "form_fingerprint",
+    
+    # OCR result cache (image content hash + engine, language, version)
+    "OCRCache",
+    "get_ocr_cache",
+    
+    # Summary store (content hash + language, style, model version)
+    "SummaryStore",
+    "get_summary_store",
+    
+    # Dynamic micro-batching for concurrent model inference
+    "MicroBatcher",
+    
+    # Int8 quantized transformer artifacts (CPU inference)
+    "export_quantized_models",
+    "compare_outputs",
+    
+    # Model Registry (load once per process, LRU under a RAM budget)
+    "ModelRegistry",
+    "get_model_registry",
+    "get_model",
+    "preload_models",
+    
     # ========== Language Support ==========
     "LanguageHelper",
     "get_language_helper",
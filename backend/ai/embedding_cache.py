@@ -0,0 +1,285 @@
+"""
+Persistent Text Embedding Cache
+Keeps sentence embeddings across restarts and shares them between workers
+
+Layout (one directory per embedding model):
+    <cache_dir>/<model>/meta.json      model name, dim, dtype
+    <cache_dir>/<model>/vectors.f32    float32 matrix, one row per text (append-only)
+    <cache_dir>/<model>/index.tsv      "<key>\\t<row>" lines (append-only)
+
+Keys are SHA-256 digests of (model name, text), so they are stable across
+processes, unlike Python's salted hash(). The matrix is memory-mapped
+read-only, so uvicorn workers share one copy through the page cache.
+Writers append under an exclusive file lock; vector rows are written before
+their index lines, so readers never see a key whose row is incomplete.
+
+Lookups go through a bounded in-memory LRU first, then the on-disk index;
+misses are encoded in one batch.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .store_utils import file_lock
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+
+def embedding_key(model_name: str, text: str) -> str:
+    """Stable cache key for a (model, text) pair"""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()[:32]
+
+
+class EmbeddingCache:
+    """
+    Two-level (LRU + memory-mapped disk) cache of text embeddings
+
+    Args:
+        model_name: Embedding model identifier (part of every key)
+        cache_dir: Directory for the persistent store; None keeps the
+            cache in memory only
+        max_memory_items: Bound on the in-memory LRU
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: Optional[str] = None,
+        max_memory_items: int = 10000
+    ):
+        self.model_name = model_name
+        self.max_memory_items = max_memory_items
+        self.dim: Optional[int] = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "encoded": 0}
+
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        # Persistent store
+        self.store_dir: Optional[Path] = None
+        self._index: Dict[str, int] = {}
+        self._index_offset = 0  # Bytes of index.tsv already read
+        self._matrix: Optional[np.ndarray] = None
+        if cache_dir:
+            safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name).strip("_") or "default"
+            self.store_dir = Path(cache_dir) / safe_name
+            try:
+                self.store_dir.mkdir(parents=True, exist_ok=True)
+                self._load_meta()
+                self._refresh_index()
+            except OSError as e:
+                logger.warning(f"Embedding cache disabled, cannot use {self.store_dir}: {e}")
+                self.store_dir = None
+
+    # ------------------------------------------------------------------
+    # Persistent store
+    # ------------------------------------------------------------------
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.store_dir / "meta.json"
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.store_dir / "vectors.f32"
+
+    @property
+    def _index_path(self) -> Path:
+        return self.store_dir / "index.tsv"
+
+    def _file_lock(self):
+        return file_lock(self.store_dir / ".lock")
+
+    def _load_meta(self):
+        if not self._meta_path.exists():
+            return
+        with open(self._meta_path) as f:
+            meta = json.load(f)
+        if meta.get("model_name") != self.model_name or meta.get("version") != FORMAT_VERSION:
+            logger.warning(f"Ignoring embedding cache at {self.store_dir}: written for another model/format")
+            self.store_dir = None
+            return
+        self.dim = int(meta["dim"])
+
+    def _write_meta(self, dim: int):
+        meta = {"model_name": self.model_name, "dim": dim, "dtype": "float32", "version": FORMAT_VERSION}
+        tmp_path = self._meta_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _refresh_index(self):
+        """Read index lines appended (by any worker) since the last refresh"""
+        if self.store_dir is None or not self._index_path.exists():
+            return
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_offset)
+            chunk = f.read()
+        # Only consume complete lines; a concurrent writer may be mid-line
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].decode("utf-8").splitlines():
+            key, _, row = line.partition("\t")
+            if row:
+                self._index[key] = int(row)
+        self._index_offset += end
+        if self.dim is None and self._index:
+            self._load_meta()
+
+    def _map_rows(self, min_rows: int) -> Optional[np.ndarray]:
+        """Memory-map vectors.f32 read-only, remapping when it has grown"""
+        if self._matrix is not None and len(self._matrix) >= min_rows:
+            return self._matrix
+        if not self.dim or not self._vectors_path.exists():
+            return None
+        n_rows = os.path.getsize(self._vectors_path) // (self.dim * 4)
+        if n_rows == 0:
+            return None
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(n_rows, self.dim))
+        return self._matrix
+
+    def _disk_lookup(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        if self.store_dir is None:
+            return {}
+        if any(key not in self._index for key in keys):
+            self._refresh_index()
+        rows = {key: self._index[key] for key in keys if key in self._index}
+        if not rows:
+            return {}
+        matrix = self._map_rows(max(rows.values()) + 1)
+        if matrix is None:
+            return {}
+        return {key: matrix[row] for key, row in rows.items() if row < len(matrix)}
+
+    def _disk_append(self, keys: List[str], vectors: np.ndarray):
+        if self.store_dir is None or not keys:
+            return
+        try:
+            with self._file_lock():
+                self._refresh_index()
+                if self.dim is None:
+                    self._load_meta()
+                    if self.store_dir is None:
+                        return
+                if self.dim is None:
+                    self.dim = vectors.shape[1]
+                    self._write_meta(self.dim)
+                elif self.dim != vectors.shape[1]:
+                    logger.warning(f"Embedding dim {vectors.shape[1]} does not match cache dim {self.dim}")
+                    return
+                fresh = [i for i, key in enumerate(keys) if key not in self._index]
+                if not fresh:
+                    return
+                row_bytes = self.dim * 4
+                with open(self._vectors_path, "ab") as f:
+                    size = f.tell()
+                    if size % row_bytes:  # Torn row from a writer that crashed mid-append
+                        size -= size % row_bytes
+                        f.truncate(size)
+                    start_row = size // row_bytes
+                    f.write(np.ascontiguousarray(vectors[fresh], dtype=np.float32).tobytes())
+                    f.flush()
+                lines = "".join(f"{keys[i]}\t{start_row + n}\n" for n, i in enumerate(fresh))
+                with open(self._index_path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+                for n, i in enumerate(fresh):
+                    self._index[keys[i]] = start_row + n
+        except OSError as e:
+            logger.warning(f"Could not persist embeddings: {e}")
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_memory_items:
+            self._lru.popitem(last=False)
+
+    def get_many(
+        self,
+        texts: Sequence[str],
+        encode_fn: Callable[[List[str]], np.ndarray]
+    ) -> List[np.ndarray]:
+        """
+        Embeddings for texts, encoding only the cache misses
+
+        Args:
+            texts: Input texts (duplicates are encoded once)
+            encode_fn: Batch encoder, list of texts -> (n, dim) array
+
+        Returns:
+            One float32 vector per input text
+        """
+        keys = [embedding_key(self.model_name, text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for key in keys:
+                if key in found:
+                    continue
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = vector
+                    self.stats["memory_hits"] += 1
+
+            missing = list(dict.fromkeys(key for key in keys if key not in found))
+            for key, vector in self._disk_lookup(missing).items():
+                found[key] = vector
+                self._remember(key, vector)
+                self.stats["disk_hits"] += 1
+
+        miss_texts: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in miss_texts:
+                miss_texts[key] = text
+        if miss_texts:
+            miss_keys = list(miss_texts)
+            encoded = np.asarray(encode_fn(list(miss_texts.values())), dtype=np.float32)
+            encoded = encoded.reshape(len(miss_keys), -1)
+            with self._lock:
+                self.stats["misses"] += len(miss_keys)
+                self.stats["encoded"] += len(miss_keys)
+                for key, vector in zip(miss_keys, encoded):
+                    found[key] = vector
+                    self._remember(key, vector)
+                self._disk_append(miss_keys, encoded)
+
+        return [found[key] for key in keys]
+
+    def get(self, text: str, encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """Embedding for a single text"""
+        return self.get_many([text], encode_fn)[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh_index()
+            return len(self._index) if self.store_dir is not None else len(self._lru)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            return {
+                **self.stats,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_items": len(self._lru),
+                "disk_items": len(self._index),
+                "persistent": self.store_dir is not None,
+            }
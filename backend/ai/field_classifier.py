@@ -22,11 +22,23 @@ import logging
 import re
 import os
 import json
-from typing import Dict, List, Tuple, Optional, Any
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Tuple, Optional, Any, Iterator
 from enum import Enum
 from pathlib import Path
 
+import numpy as np
+
 from .language_helper import get_language_helper, EDUCATION_BILINGUAL, CATEGORY_BILINGUAL, STATE_BILINGUAL
+from .form_schema_cache import FormSchemaCache, form_fingerprint
+from .model_registry import get_model
+from .recommendation_cache import stable_digest
+from .quantization import export_loaded, try_load_quantized
+from .store_utils import model_file_stats
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +107,13 @@ class FieldClassifier:
     1. Field detection: Extract field labels and identify type
     2. Semantic understanding: Match labels to known patterns
     3. Profile mapping: Map user data to classified fields
+    
+    Args:
+        cache_size: Bound on memoized label classifications
+        schema_cache: Cache of classified forms shared across requests
+            (see form_schema_cache); None classifies every form
+        model_version: Identifier of any model behind the classification,
+            part of schema_version so cached forms follow model changes
     """
     
     # Field detection patterns (regex)
@@ -249,8 +268,81 @@ class FieldClassifier:
         FieldType.DOB: r"^\d{2}/\d{2}/\d{4}$|^\d{4}-\d{2}-\d{2}$",
     }
     
-    def __init__(self):
+    # Confidence tiers of a pattern match (see _calculate_confidence)
+    EXACT_CONFIDENCE = 1.0
+    WORD_CONFIDENCE = 0.85
+    PARTIAL_CONFIDENCE = 0.6
+    
+    def __init__(
+        self,
+        cache_size: int = 10000,
+        schema_cache: Optional[FormSchemaCache] = None,
+        model_version: str = ""
+    ):
         self.confidence_threshold = 0.6
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[FieldType, float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self._bank = self.compile_patterns()
+        self.schema_cache = schema_cache
+        self.model_version = model_version
+    
+    @property
+    def schema_version(self) -> str:
+        """Version tag of cached form schemas: patterns, confidence tiers and model"""
+        return f"{self._bank['version']}:{self.model_version}"
+    
+    @classmethod
+    def compile_patterns(cls) -> Dict[str, Any]:
+        """
+        Compiled FIELD_PATTERNS bank (built once per class and reused)
+        
+        A pattern's confidence is 1.0 if it fullmatches the text, else 0.85
+        if its word-boundary variant matches, else 0.6 if it matches at all,
+        so a field type's best confidence is the first tier at which any of
+        its patterns matches. Each tier is one regex: an alternation with one
+        named group per field type, in FIELD_PATTERNS order, so the group that
+        matches is the first field type reaching that tier.
+        """
+        bank = cls.__dict__.get("_compiled_bank")
+        if bank is not None and bank["source"] is cls.FIELD_PATTERNS:
+            return bank
+        
+        field_types = list(cls.FIELD_PATTERNS)
+        
+        def tier(variant, search: bool) -> re.Pattern:
+            alternatives = []
+            for i, field_type in enumerate(field_types):
+                # Lazy prefix = re.search semantics (any start position) within this
+                # type before the next type is tried; ^-anchored patterns need none
+                body = "|".join(
+                    f"{'(?s:.*?)' if search and not p.startswith('^') else ''}(?:{variant(p)})"
+                    for p in cls.FIELD_PATTERNS[field_type]
+                )
+                alternatives.append(f"(?P<f{i}>{body})")
+            return re.compile("|".join(alternatives), re.IGNORECASE)
+        
+        bank = {
+            "source": cls.FIELD_PATTERNS,
+            "version": stable_digest([
+                [[field_type.value, patterns] for field_type, patterns in cls.FIELD_PATTERNS.items()],
+                [cls.EXACT_CONFIDENCE, cls.WORD_CONFIDENCE, cls.PARTIAL_CONFIDENCE],
+            ]),
+            "field_types": field_types,
+            "tiers": [
+                (tier(lambda p: p, search=False), True, cls.EXACT_CONFIDENCE),
+                (tier(lambda p: rf"\b{p}\b", search=True), False, cls.WORD_CONFIDENCE),
+                (tier(lambda p: p, search=True), False, cls.PARTIAL_CONFIDENCE),
+            ],
+            # Per-pattern regexes for _calculate_confidence
+            "patterns": {
+                p: (re.compile(p, re.IGNORECASE), re.compile(rf"\b{p}\b", re.IGNORECASE))
+                for patterns in cls.FIELD_PATTERNS.values() for p in patterns
+            },
+        }
+        cls._compiled_bank = bank
+        return bank
     
     def classify_field(self, field_label: str, field_id: str = "") -> Tuple[FieldType, float]:
         """
@@ -268,41 +360,78 @@ class FieldClassifier:
         if not combined_text:
             return FieldType.OTHER, 0.0
         
-        best_match = (FieldType.OTHER, 0.0)
-        
-        # Check each field type's patterns
-        for field_type, patterns in self.FIELD_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, combined_text, re.IGNORECASE):
-                    confidence = self._calculate_confidence(pattern, combined_text)
-                    if confidence > best_match[1]:
-                        best_match = (field_type, confidence)
-        
-        return best_match
+        # Portal forms repeat the same labels; memoize per normalized text
+        with self._cache_lock:
+            cached = self._cache.get(combined_text)
+            if cached is not None:
+                self._cache.move_to_end(combined_text)
+                self.cache_stats["hits"] += 1
+                return cached
+            self.cache_stats["misses"] += 1
+        
+        result = self._classify_text(combined_text)
+        
+        if self.cache_size:
+            with self._cache_lock:
+                self._cache[combined_text] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+    
+    def _classify_text(self, text: str) -> Tuple[FieldType, float]:
+        """Best (first) field type over the confidence tiers, highest tier first"""
+        bank = self._bank
+        for regex, full, confidence in bank["tiers"]:
+            match = regex.fullmatch(text) if full else regex.match(text)
+            if match is not None:
+                field_index = next(int(name[1:]) for name, value in match.groupdict().items() if value is not None)
+                return bank["field_types"][field_index], confidence
+        return FieldType.OTHER, 0.0
     
     def classify_form_fields(self, fields: List[Dict]) -> List[Dict]:
         """
         Classify multiple form fields
         
+        Forms already in the schema cache (same labels and ids, in order)
+        reuse their stored types and confidences without classifying.
+        
         Args:
             fields: List of {"label": "...", "id": "...", "value": "..."} dicts
         
         Returns:
             List of {"label": "...", "id": "...", "type": "...", "confidence": 0.xx}
         """
+        schema = None
+        if self.schema_cache is not None and fields:
+            fingerprint = form_fingerprint(fields)
+            schema = self.schema_cache.get(fingerprint, self.schema_version)
+            if schema is None:
+                schema = []
+                for field in fields:
+                    field_type, confidence = self.classify_field(
+                        field.get("label", ""),
+                        field.get("id", "")
+                    )
+                    schema.append((field_type.value, round(confidence, 2)))
+                self.schema_cache.put(fingerprint, self.schema_version, schema)
+        
         classified = []
         
-        for field in fields:
-            field_type, confidence = self.classify_field(
-                field.get("label", ""),
-                field.get("id", "")
-            )
+        for i, field in enumerate(fields):
+            if schema is not None:
+                field_type, confidence = schema[i]
+            else:
+                field_type, confidence = self.classify_field(
+                    field.get("label", ""),
+                    field.get("id", "")
+                )
+                field_type, confidence = field_type.value, round(confidence, 2)
             
             classified.append({
                 "label": field.get("label"),
                 "id": field.get("id"),
-                "type": field_type.value,
-                "confidence": round(confidence, 2),
+                "type": field_type,
+                "confidence": confidence,
                 "value": field.get("value", ""),
             })
         
@@ -321,13 +450,14 @@ class FieldClassifier:
             classified_fields: Output from classify_form_fields()
         
         Returns:
-            Mapping of field_id -> suggested_value with confidence
+            Mapping of field_id (the label for fields without an id) ->
+            suggested_value with confidence
         """
         mapping = {}
         
         for field in classified_fields:
             field_type = field["type"]
-            field_id = field["id"]
+            field_id = field.get("id") or field.get("label")
             
             # Get suggested value based on field type
             suggested_value, confidence = self._get_field_value(
@@ -347,16 +477,21 @@ class FieldClassifier:
     
     def _calculate_confidence(self, pattern: str, text: str) -> float:
         """Calculate confidence score for a pattern match"""
+        compiled = self._bank["patterns"].get(pattern)
+        if compiled is None:
+            compiled = (re.compile(pattern, re.IGNORECASE), re.compile(rf"\b{pattern}\b", re.IGNORECASE))
+        plain, word_bounded = compiled
+        
         # Exact match = high confidence
-        if re.fullmatch(pattern, text, re.IGNORECASE):
-            return 1.0
+        if plain.fullmatch(text):
+            return self.EXACT_CONFIDENCE
         
         # Word boundary match = medium confidence
-        if re.search(rf"\b{pattern}\b", text, re.IGNORECASE):
-            return 0.85
+        if word_bounded.search(text):
+            return self.WORD_CONFIDENCE
         
         # Partial match = lower confidence
-        return 0.6
+        return self.PARTIAL_CONFIDENCE
     
     def _get_field_value(self, field_type: str, user_profile: Dict) -> Tuple[Optional[str], float]:
         """Get suggested value from user profile for a field type"""
@@ -602,8 +737,16 @@ class TransformerLabelUnderstanding:
     """
     Transformer-based field label understanding
     Uses BERT/RoBERTa to process field labels and infer their semantic meaning
+    
+    The FIELD_SEMANTICS examples are embedded once at load into a row-
+    normalized prototype matrix, so classifying labels is one encoder pass
+    plus one matrix product. With a model_path the matrix is persisted to
+    <model_path>_prototypes.npz and reused while the model and examples are
+    unchanged.
     """
     
+    PROTOTYPES_SUFFIX = "_prototypes.npz"
+    
     # Known field type embeddings (pre-computed for common fields)
     FIELD_SEMANTICS = {
         "name": ["full name", "applicant name", "candidate name", "your name", "नाम"],
@@ -631,13 +774,26 @@ class TransformerLabelUnderstanding:
         "ifsc": ["ifsc", "ifsc code", "आईएफएससी"],
     }
     
-    def __init__(self, model_name: str = "bert-base-multilingual-cased", model_path: Optional[str] = None):
+    def __init__(
+        self,
+        model_name: str = "bert-base-multilingual-cased",
+        model_path: Optional[str] = None,
+        use_quantized: Optional[bool] = None
+    ):
         self.model_name = model_name
         self.model_path = model_path
+        self.use_quantized = use_quantized
         self.model = None
         self.tokenizer = None
+        self.backend = "pytorch"
         self._embeddings_cache: Dict[str, Any] = {}
+        self._prototypes: Optional[np.ndarray] = None  # (n_examples, dim), unit rows
+        self._prototype_types: List[str] = [
+            field_type for field_type, examples in self.FIELD_SEMANTICS.items() for _ in examples
+        ]
         self._load_model()
+        if self.model is not None:
+            self._load_prototypes()
     
     def _load_model(self):
         """Load transformer model for label understanding"""
@@ -645,6 +801,13 @@ class TransformerLabelUnderstanding:
             from transformers import AutoModel, AutoTokenizer
             import torch
             
+            # Int8 artifact (see quantization.py) when one has been exported
+            quantized = try_load_quantized(self.model_path, AutoModel, AutoTokenizer, self.use_quantized)
+            if quantized is not None:
+                self.model, self.tokenizer = quantized
+                self.backend = "int8"
+                return
+            
             if self.model_path and os.path.exists(self.model_path):
                 self.model = AutoModel.from_pretrained(self.model_path)
                 self.tokenizer = AutoTokenizer.from_pretrained(self.model_path)
@@ -661,24 +824,76 @@ class TransformerLabelUnderstanding:
     
     def get_embedding(self, text: str) -> Optional[Any]:
         """Get embedding for a text string"""
-        if not self.model or not self.tokenizer:
-            return None
+        return self.get_embeddings([text])
+    
+    def get_embeddings(self, texts: List[str]) -> Optional[np.ndarray]:
+        """
+        CLS embeddings of several texts, shape (len(texts), dim)
         
-        if text in self._embeddings_cache:
-            return self._embeddings_cache[text]
+        Texts not in the embedding cache are encoded in one padded batch.
+        """
+        if not self.model or not self.tokenizer or not texts:
+            return None
         
-        try:
-            import torch
-            
-            inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=128)
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-            embedding = outputs.last_hidden_state[:, 0, :].numpy()  # CLS token
-            self._embeddings_cache[text] = embedding
-            return embedding
-        except Exception as e:
-            logger.warning(f"Embedding failed: {e}")
+        missing = [text for text in dict.fromkeys(texts) if text not in self._embeddings_cache]
+        if missing:
+            try:
+                import torch
+                
+                inputs = self.tokenizer(missing, return_tensors="pt", truncation=True, max_length=128, padding=True)
+                with torch.no_grad():
+                    outputs = self.model(**inputs)
+                embeddings = outputs.last_hidden_state[:, 0, :].numpy()  # CLS token
+            except Exception as e:
+                logger.warning(f"Embedding failed: {e}")
+                return None
+            for i, text in enumerate(missing):
+                self._embeddings_cache[text] = embeddings[i:i + 1]
+        return np.concatenate([self._embeddings_cache[text] for text in texts])
+    
+    def _prototypes_path(self) -> Optional[Path]:
+        if not self.model_path:
             return None
+        path = Path(self.model_path)
+        return path.with_name(path.name + self.PROTOTYPES_SUFFIX)
+    
+    def _prototypes_digest(self) -> str:
+        """Identity of the prototype matrix: model files, backend and examples"""
+        model_files = model_file_stats(self.model_path, self.backend)
+        return stable_digest([self.model_path or self.model_name, self.backend, model_files, self.FIELD_SEMANTICS])
+    
+    def _load_prototypes(self):
+        """Load (or embed and persist) the normalized FIELD_SEMANTICS matrix"""
+        path = self._prototypes_path()
+        digest = self._prototypes_digest()
+        if path is not None and path.exists():
+            try:
+                with np.load(path) as stored:
+                    if str(stored["digest"]) == digest:
+                        self._prototypes = stored["matrix"]
+                        return
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable label prototypes {path}: {e}")
+        
+        examples = [example for examples in self.FIELD_SEMANTICS.values() for example in examples]
+        embeddings = self.get_embeddings(examples)
+        if embeddings is None:
+            return
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        self._prototypes = (embeddings / (norms + 1e-8)).astype(np.float32)
+        
+        if path is not None:
+            try:
+                with open(path, "wb") as f:
+                    np.savez(f, matrix=self._prototypes, digest=np.array(digest))
+            except OSError as e:
+                logger.warning(f"Could not save label prototypes to {path}: {e}")
+    
+    def export_quantized(self, output_dir: Optional[str] = None) -> Optional[str]:
+        """Write an int8 copy of the loaded PyTorch model (see quantization.export_loaded)"""
+        return export_loaded(
+            self.model, self.tokenizer, self.backend, self.model_path, self.model_name, output_dir
+        )
     
     def infer_field_type(self, label: str) -> Tuple[str, float]:
         """
@@ -687,31 +902,36 @@ class TransformerLabelUnderstanding:
         Returns:
             (field_type, confidence)
         """
-        if self.model is None:
-            # Fallback to rule-based matching
-            return self._rule_based_match(label)
+        return self.infer_many([label])[0]
+    
+    def infer_many(self, labels: List[str]) -> List[Tuple[str, float]]:
+        """
+        Infer the field types of several labels (e.g. a whole form)
         
-        label_embedding = self.get_embedding(label.lower())
-        if label_embedding is None:
-            return self._rule_based_match(label)
+        The labels are encoded in one forward pass and scored against every
+        prototype with one matrix product; the confidence is the cosine
+        similarity to the closest FIELD_SEMANTICS example.
         
-        best_match = "other"
-        best_score = 0.0
+        Returns:
+            (field_type, confidence) per label
+        """
+        if self.model is None or self._prototypes is None:
+            # Fallback to rule-based matching
+            return [self._rule_based_match(label) for label in labels]
         
-        for field_type, examples in self.FIELD_SEMANTICS.items():
-            for example in examples:
-                example_embedding = self.get_embedding(example)
-                if example_embedding is not None:
-                    # Cosine similarity
-                    import numpy as np
-                    similarity = np.dot(label_embedding.flatten(), example_embedding.flatten()) / (
-                        np.linalg.norm(label_embedding) * np.linalg.norm(example_embedding) + 1e-8
-                    )
-                    if similarity > best_score:
-                        best_score = float(similarity)
-                        best_match = field_type
+        embeddings = self.get_embeddings([label.lower() for label in labels])
+        if embeddings is None:
+            return [self._rule_based_match(label) for label in labels]
         
-        return best_match, best_score
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        scores = (embeddings / (norms + 1e-8)) @ self._prototypes.T
+        best = scores.argmax(axis=1)
+        
+        results = []
+        for i, j in enumerate(best):
+            score = float(scores[i, j])
+            results.append((self._prototype_types[j], score) if score > 0 else ("other", 0.0))
+        return results
     
     def _rule_based_match(self, label: str) -> Tuple[str, float]:
         """Fallback rule-based matching"""
@@ -723,15 +943,203 @@ class TransformerLabelUnderstanding:
         return "other", 0.3
 
 
+# Form field detection helpers (module level so process-pool workers can import them)
+
+def _otsu_threshold(sample: np.ndarray) -> int:
+    """Otsu's threshold of a uint8 image sample (dark ink vs paper)"""
+    hist = np.bincount(sample.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    weight_dark = np.cumsum(hist)
+    weight_light = weight_dark[-1] - weight_dark
+    mass_dark = np.cumsum(hist * levels)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_dark = mass_dark / weight_dark
+        mean_light = (mass_dark[-1] - mass_dark) / weight_light
+        between = weight_dark * weight_light * (mean_dark - mean_light) ** 2
+    return int(np.nanargmax(between)) + 1
+
+
+def _min_pool(array: np.ndarray, factor: int) -> np.ndarray:
+    """Downscale by an integer factor keeping the darkest pixel of each block"""
+    height, width = array.shape[0] // factor * factor, array.shape[1] // factor * factor
+    return np.minimum.reduce([
+        array[i:height:factor, j:width:factor] for i in range(factor) for j in range(factor)
+    ])
+
+
+def _horizontal_runs(dark: np.ndarray, min_length: int) -> np.ndarray:
+    """(row, x0, x1) of horizontal dark runs at least min_length long, row-major"""
+    edges = np.diff(np.pad(dark, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    keep = ends - starts >= min_length
+    return np.stack([rows[keep], starts[keep], ends[keep]], axis=1)
+
+
+def _detect_tile_fields(tile: np.ndarray, top: int, owned: Tuple[int, int], threshold: int, params: Dict) -> List[Dict]:
+    """
+    Rule-based fields in one horizontal tile of a page
+    
+    Horizontal rules are dark runs stacked over a few rows. Two rules with
+    the same extent a box-height apart and dark vertical edges form a text
+    box (or a checkbox when square and small); other long rules are
+    underlines with the text field above them. A field is returned only if
+    its top rule starts inside the rows this tile owns, so fields in the
+    overlap between tiles are reported once.
+    
+    Returns:
+        Fields with bboxes in page (working resolution) coordinates
+    """
+    dark = tile < threshold
+    dark[:, 1:-1] |= dark[:, :-2] & dark[:, 2:]  # Close 1 px gaps in scanned rules
+    
+    # Stack runs on consecutive rows into rules: [y0, y1, x0, x1]
+    tolerance = params["edge_tolerance"]
+    open_rules: List[List[int]] = []
+    rules: List[List[int]] = []
+    for y, x0, x1 in _horizontal_runs(dark, params["checkbox_size"][0]).tolist():
+        for rule in open_rules:
+            if rule[1] == y - 1 and abs(rule[2] - x0) <= tolerance and abs(rule[3] - x1) <= tolerance:
+                rule[1] = y
+                rule[2], rule[3] = min(rule[2], x0), max(rule[3], x1)
+                break
+        else:
+            rule = [y, y, x0, x1]
+            open_rules.append(rule)
+            rules.append(rule)
+        open_rules = [r for r in open_rules if r[1] >= y - 1]
+    # Thick "rules" are filled regions (photos, stamps, headers), not lines
+    rules = [r for r in rules if r[1] - r[0] < params["max_line_thickness"]]
+    
+    def isolated(rule: List[int]) -> bool:
+        """Light rows just above and below the rule (not the edge of a dark region)"""
+        above, below = dark[max(0, rule[0] - 2), rule[2]:rule[3]], dark[min(len(dark) - 1, rule[1] + 2), rule[2]:rule[3]]
+        return rule[0] < 2 or rule[1] + 2 >= len(dark) or (above.mean() < 0.5 and below.mean() < 0.5)
+    
+    def edge_coverage(x: int, y0: int, y1: int) -> float:
+        column = dark[y0:y1 + 1, max(0, x - 2):x + 3]
+        return float(column.any(axis=1).mean()) if column.size else 0.0
+    
+    fields = []
+    used = set()
+    min_box, max_box = params["box_height"]
+    min_checkbox, max_checkbox = params["checkbox_size"]
+    for i, upper in enumerate(rules):
+        if i in used:
+            continue
+        width = upper[3] - upper[2]
+        paired = False
+        for j in range(i + 1, len(rules)):
+            lower = rules[j]
+            gap = lower[0] - upper[1]
+            if gap > max(max_box, max_checkbox):
+                break
+            if j in used or abs(lower[2] - upper[2]) > tolerance or abs(lower[3] - upper[3]) > tolerance:
+                continue
+            height = lower[1] - upper[0]
+            is_checkbox = min_checkbox <= width <= max_checkbox and abs(height - width) <= max(3, width * 0.3)
+            if not is_checkbox and not (min_box <= height <= max_box and width >= params["min_field_length"]):
+                continue
+            coverage = min(edge_coverage(upper[2], upper[0], lower[1]), edge_coverage(upper[3] - 1, upper[0], lower[1]))
+            if coverage < 0.8:
+                continue
+            used.update((i, j))
+            paired = True
+            fields.append({
+                "bbox": [min(upper[2], lower[2]), upper[0], max(upper[3], lower[3]), lower[1] + 1],
+                "field_type": "checkbox" if is_checkbox else "text_box",
+                "confidence": round(0.6 + 0.3 * coverage, 2),
+                "_anchor": upper[0],
+            })
+            break
+        if not paired and width >= params["min_field_length"] and isolated(upper):
+            used.add(i)
+            fields.append({
+                "bbox": [upper[2], upper[0] - params["field_height"], upper[3], upper[1] + 1],
+                "field_type": "text_field",
+                "confidence": 0.6,
+                "_anchor": upper[0],
+            })
+    
+    owned_fields = []
+    for field in fields:
+        if owned[0] <= field.pop("_anchor") + top < owned[1]:
+            x0, y0, x1, y1 = field["bbox"]
+            field["bbox"] = [x0, max(0, y0 + top), x1, y1 + top]
+            owned_fields.append(field)
+    return owned_fields
+
+
+def _non_max_suppression(fields: List[Dict], iou_threshold: float) -> List[Dict]:
+    """Greedy NMS: drop fields overlapping a more confident one by IoU >= iou_threshold"""
+    if len(fields) < 2:
+        return list(fields)
+    boxes = np.array([field["bbox"] for field in fields], dtype=np.float64)
+    areas = np.maximum(boxes[:, 2] - boxes[:, 0], 0) * np.maximum(boxes[:, 3] - boxes[:, 1], 0)
+    order = np.argsort([-field["confidence"] for field in fields], kind="stable")
+    keep = []
+    while order.size:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        width = np.minimum(boxes[best, 2], boxes[rest, 2]) - np.maximum(boxes[best, 0], boxes[rest, 0])
+        height = np.minimum(boxes[best, 3], boxes[rest, 3]) - np.maximum(boxes[best, 1], boxes[rest, 1])
+        overlap = np.maximum(width, 0) * np.maximum(height, 0)
+        iou = overlap / np.maximum(areas[best] + areas[rest] - overlap, 1e-9)
+        order = rest[iou < iou_threshold]
+    return [fields[i] for i in sorted(keep)]
+
+
 class CNNFieldDetector:
     """
     CNN-based field detection for scanned PDFs
     Detects form fields (text boxes, checkboxes, etc.) from images
+    
+    Input may be an image path, a PDF path (one entry per page, needs
+    pdf2image), a PIL image, or a list of these; pages are decoded one at a
+    time and reduced to at most max_working_pixels (AI_FIELD_DETECT_MAX_PIXELS)
+    before detection, which bounds peak memory. Boxes are reported in the
+    coordinates of the original page.
+    
+    Without a CNN, pages go through a rule-based detector: a min-pooled
+    downscale finds the rows that contain ink, then full-width overlapping
+    tiles with ink are searched for rules, boxes and checkboxes at working
+    resolution. Tiles are searched in this process by default: shipping
+    them to worker processes costs more than it saves on typical pages.
+    With workers > 1 (AI_FIELD_DETECT_WORKERS) multi-tile pages go to a
+    process pool that is started on first use and kept until close().
+    Detections are merged with non-maximum suppression.
     """
     
-    def __init__(self, model_path: Optional[str] = None):
+    MAX_WORKING_PIXELS = 4_000_000  # ~A4 at 200 dpi
+    TILE_HEIGHT = 512
+    COARSE_FACTOR = 4
+    PDF_DPI = 150
+    NMS_IOU = 0.5
+    
+    # Rule-based detector geometry, in working-resolution pixels
+    DETECTION_PARAMS = {
+        "min_field_length": 60,
+        "checkbox_size": (10, 40),
+        "box_height": (15, 80),
+        "field_height": 30,
+        "max_line_thickness": 6,
+        "edge_tolerance": 4,
+    }
+    
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        max_working_pixels: Optional[int] = None,
+        workers: Optional[int] = None
+    ):
         self.model_path = model_path
         self.model = None
+        self.max_working_pixels = max_working_pixels or int(
+            os.environ.get("AI_FIELD_DETECT_MAX_PIXELS", self.MAX_WORKING_PIXELS)
+        )
+        self.workers = workers or int(os.environ.get("AI_FIELD_DETECT_WORKERS", "0")) or 1
+        self.last_timings: List[Dict] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
         self._load_model()
     
     def _load_model(self):
@@ -747,74 +1155,213 @@ class CNNFieldDetector:
             except Exception as e:
                 logger.warning(f"Could not load CNN model: {e}")
     
-    def detect_fields(self, image_path: str) -> List[Dict]:
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Shared tile worker pool (None when tiles are searched in this process)"""
+        if self.workers <= 1:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+    
+    def close(self):
+        """Shut down the tile worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+    
+    def detect_fields(self, source: Any) -> List[Dict]:
         """
-        Detect form fields in an image
+        Detect form fields in an image, a PDF or a list of pages
         
         Returns:
-            List of detected fields with bounding boxes and types
+            List of detected fields with bounding boxes, types and page index
         """
-        if self.model is None:
-            # Fallback: use basic image processing
-            return self._basic_field_detection(image_path)
+        return [field for page in self.detect_pages(source) for field in page["fields"]]
+    
+    def detect_pages(self, source: Any) -> List[Dict]:
+        """
+        Detect form fields page by page
         
-        try:
-            import torch
-            from PIL import Image
-            import torchvision.transforms as transforms
-            
-            transform = transforms.Compose([
-                transforms.Resize((800, 600)),
-                transforms.ToTensor(),
-                transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
-            ])
-            
-            image = Image.open(image_path).convert("RGB")
-            image_tensor = transform(image).unsqueeze(0)
-            
-            with torch.no_grad():
-                predictions = self.model(image_tensor)
+        Returns:
+            Per page: {"page", "size", "working_size", "fields", "timing_ms"}
+            (timings are also kept in last_timings)
+        """
+        results = []
+        pages = self._iter_pages(source)
+        while True:
+            start = time.perf_counter()
+            try:
+                page = next(pages)
+            except StopIteration:
+                break
+            except Exception as e:
+                logger.warning(f"Could not read form page {len(results)}: {e}")
+                break
+            load_ms = (time.perf_counter() - start) * 1000
+            size = list(page.size)
             
-            fields = []
-            for pred in predictions:
-                fields.append({
-                    "bbox": pred["box"].tolist(),
-                    "field_type": pred["label"],
-                    "confidence": float(pred["score"])
-                })
+            fields, timing = None, {}
+            if self.model is not None:
+                try:
+                    fields, timing = self._model_detection(page)
+                except Exception as e:
+                    logger.warning(f"Field detection failed: {e}")
+            if fields is None:
+                fields, timing = self._basic_field_detection(page)
             
-            return fields
-        except Exception as e:
-            logger.warning(f"Field detection failed: {e}")
-            return self._basic_field_detection(image_path)
+            for field in fields:
+                field["page"] = len(results)
+            timing = {"load": round(load_ms, 2), **timing, "total": round((time.perf_counter() - start) * 1000, 2)}
+            results.append({
+                "page": len(results),
+                "size": size,
+                "working_size": timing.pop("working_size", size),
+                "fields": fields,
+                "timing_ms": timing,
+            })
+        self.last_timings = [{"page": r["page"], **r["timing_ms"]} for r in results]
+        return results
     
-    def _basic_field_detection(self, image_path: str) -> List[Dict]:
-        """Basic field detection using image processing"""
+    def _iter_pages(self, source: Any) -> Iterator[Any]:
+        """PIL pages of an image path, PDF path, PIL image or list of these (lazily)"""
+        from PIL import Image, ImageSequence
+        
+        if isinstance(source, (list, tuple)):
+            for item in source:
+                yield from self._iter_pages(item)
+        elif isinstance(source, Image.Image):
+            yield source
+        elif str(source).lower().endswith(".pdf"):
+            yield from self._iter_pdf_pages(str(source))
+        else:
+            with Image.open(source) as image:
+                for frame in ImageSequence.Iterator(image):  # Multi-page TIFF
+                    yield frame
+    
+    def _iter_pdf_pages(self, pdf_path: str) -> Iterator[Any]:
         try:
-            from PIL import Image
-            import numpy as np
-            
-            image = Image.open(image_path).convert("L")
-            img_array = np.array(image)
-            
-            # Simple edge detection for form fields
-            # This is a placeholder - real implementation would use OpenCV
-            fields = []
-            
-            # Detect horizontal lines (potential text fields)
-            height, width = img_array.shape
-            for y in range(0, height, 50):
-                for x in range(0, width, 100):
-                    fields.append({
-                        "bbox": [x, y, x + 200, y + 30],
-                        "field_type": "text_field",
-                        "confidence": 0.5
-                    })
-            
-            return fields[:20]  # Limit to 20 fields
-        except Exception as e:
-            logger.warning(f"Basic field detection failed: {e}")
-            return []
+            from pdf2image import convert_from_path, pdfinfo_from_path
+        except ImportError:
+            logger.warning("pdf2image not installed, cannot read PDF forms")
+            return
+        for page_number in range(1, pdfinfo_from_path(pdf_path)["Pages"] + 1):
+            yield convert_from_path(
+                pdf_path, dpi=self.PDF_DPI, first_page=page_number, last_page=page_number, grayscale=True
+            )[0]
+    
+    def _working_image(self, page: Any) -> Tuple[np.ndarray, float, float]:
+        """Grayscale array of the page within max_working_pixels, and its x/y scale"""
+        from PIL import Image
+        
+        width, height = page.size
+        scale = min(1.0, (self.max_working_pixels / max(width * height, 1)) ** 0.5)
+        target = (max(1, int(width * scale)), max(1, int(height * scale)))
+        if scale < 1.0:
+            page.draft("L", target)  # JPEG: decode at reduced size (no-op otherwise)
+        array = np.asarray(page.convert("L"), dtype=np.uint8)
+        if array.shape[1] > target[0]:
+            # Min-pooling and a 2x2 min filter keep thin dark rules visible
+            factor = array.shape[1] // target[0]
+            if factor >= 2:
+                array = _min_pool(array, factor)
+            if array.shape[1] > target[0]:
+                widened = array.copy()
+                widened[:-1] = np.minimum(array[:-1], array[1:])
+                widened[:, :-1] = np.minimum(widened[:, :-1], widened[:, 1:])
+                array = np.asarray(Image.fromarray(widened).resize(target, Image.BILINEAR))
+        return array, array.shape[1] / width, array.shape[0] / height
+    
+    def _model_detection(self, page: Any) -> Tuple[List[Dict], Dict]:
+        """
+        CNN detection on one page
+        
+        The network takes whole pages at 800x600, so pages are not tiled;
+        boxes are mapped back to page coordinates and merged with NMS.
+        """
+        import torch
+        import torchvision.transforms as transforms
+        
+        transform = transforms.Compose([
+            transforms.Resize((800, 600)),
+            transforms.ToTensor(),
+            transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
+        ])
+        
+        start = time.perf_counter()
+        scale_x, scale_y = page.size[0] / 600, page.size[1] / 800
+        page.draft("RGB", (600, 800))  # JPEG: decode near the network's input size
+        image_tensor = transform(page.convert("RGB")).unsqueeze(0)
+        with torch.no_grad():
+            predictions = self.model(image_tensor)
+        inference_ms = (time.perf_counter() - start) * 1000
+        
+        fields = []
+        for pred in predictions:
+            x0, y0, x1, y1 = pred["box"].tolist()
+            fields.append({
+                "bbox": [round(x0 * scale_x), round(y0 * scale_y), round(x1 * scale_x), round(y1 * scale_y)],
+                "field_type": pred["label"],
+                "confidence": float(pred["score"])
+            })
+        return _non_max_suppression(fields, self.NMS_IOU), {"inference": round(inference_ms, 2)}
+    
+    def _basic_field_detection(self, page: Any) -> Tuple[List[Dict], Dict]:
+        """Rule-based detection on one page (downscale, then refine ink tiles)"""
+        timing = {}
+        start = time.perf_counter()
+        array, scale_x, scale_y = self._working_image(page)
+        height, width = array.shape
+        timing["working_size"] = [width, height]
+        timing["resize"] = round((time.perf_counter() - start) * 1000, 2)
+        
+        # Coarse pass: min-pooling keeps thin dark rules visible at 1/COARSE_FACTOR
+        start = time.perf_counter()
+        params = self.DETECTION_PARAMS
+        factor = self.COARSE_FACTOR
+        if int(array.max()) - int(array.min()) < 32:
+            return [], {**timing, "coarse": round((time.perf_counter() - start) * 1000, 2), "tiles": 0}
+        threshold = _otsu_threshold(array[::factor, ::factor])
+        pooled = _min_pool(array, factor)
+        ink_rows = np.unique(_horizontal_runs(pooled < threshold, max(1, params["checkbox_size"][0] // factor))[:, 0])
+        
+        # Full-width tiles own TILE_HEIGHT rows each; they extend above by a rule
+        # thickness and below by the tallest box so owned fields are always whole
+        above = params["max_line_thickness"]
+        below = max(params["box_height"][1], params["checkbox_size"][1]) + params["max_line_thickness"] + 4
+        tasks = []
+        skipped = 0
+        for owned_start in range(0, height, self.TILE_HEIGHT):
+            owned_end = min(owned_start + self.TILE_HEIGHT, height)
+            first = np.searchsorted(ink_rows, owned_start // factor)
+            if first == len(ink_rows) or ink_rows[first] * factor >= owned_end:
+                skipped += 1
+                continue
+            top = max(0, owned_start - above)
+            tasks.append((array[top:min(height, owned_end + below)], top, (owned_start, owned_end), threshold, params))
+        timing["coarse"] = round((time.perf_counter() - start) * 1000, 2)
+        
+        start = time.perf_counter()
+        tile_fields = None
+        pool = self._get_pool() if len(tasks) > 1 else None
+        if pool is not None:
+            try:
+                tile_fields = list(pool.map(_detect_tile_fields, *zip(*tasks)))
+            except BrokenProcessPool as e:
+                logger.warning(f"Field detection workers failed, detecting in process: {e}")
+                self._pool = None
+        if tile_fields is None:
+            tile_fields = [_detect_tile_fields(*task) for task in tasks]
+        timing["tiles"] = len(tasks)
+        timing["tiles_skipped"] = skipped
+        timing["detect"] = round((time.perf_counter() - start) * 1000, 2)
+        
+        start = time.perf_counter()
+        fields = _non_max_suppression([field for fields in tile_fields for field in fields], self.NMS_IOU)
+        for field in fields:
+            x0, y0, x1, y1 = field["bbox"]
+            field["bbox"] = [round(x0 / scale_x), round(y0 / scale_y), round(x1 / scale_x), round(y1 / scale_y)]
+        timing["merge"] = round((time.perf_counter() - start) * 1000, 2)
+        return fields, timing
 
 
 class AdvancedFieldClassifier:
@@ -858,40 +1405,55 @@ class AdvancedFieldClassifier:
         Returns:
             Classification result with field type and confidence
         """
-        # Try transformer-based classification
-        if self.label_model:
-            field_type, confidence = self.label_model.infer_field_type(label)
-            if confidence > 0.7:
-                return {
-                    "field_type": field_type,
-                    "confidence": confidence,
-                    "method": "transformer"
-                }
+        return self.classify_fields([label])[0]
+    
+    def classify_fields(self, labels: List[str]) -> List[Dict]:
+        """
+        Classify several field labels (one transformer pass for all of them)
         
-        # Fall back to rule-based
-        rule_result = self.rule_classifier.classify_field(label)
-        return {
-            "field_type": rule_result["type"].value if hasattr(rule_result["type"], "value") else rule_result["type"],
-            "confidence": rule_result["confidence"],
-            "method": "rules"
-        }
+        Returns:
+            Classification result per label
+        """
+        inferred = self.label_model.infer_many(labels) if self.label_model else [None] * len(labels)
+        
+        results = []
+        for label, transformer_result in zip(labels, inferred):
+            # Transformer-based classification when it is confident
+            if transformer_result is not None and transformer_result[1] > 0.7:
+                results.append({
+                    "field_type": transformer_result[0],
+                    "confidence": transformer_result[1],
+                    "method": "transformer"
+                })
+                continue
+            
+            # Fall back to rule-based
+            field_type, confidence = self.rule_classifier.classify_field(label)
+            results.append({
+                "field_type": field_type.value,
+                "confidence": confidence,
+                "method": "rules"
+            })
+        return results
     
-    def detect_form_fields(self, image_path: str) -> List[Dict]:
+    def detect_form_fields(self, image_path: Any) -> List[Dict]:
         """
         Detect and classify fields from a form image
         
+        Args:
+            image_path: Image or PDF path, PIL image, or a list of pages
+        
         Returns:
             List of detected fields with types and positions
         """
         if self.field_detector:
             detected = self.field_detector.detect_fields(image_path)
             
-            # Classify each detected field
-            for field in detected:
-                if "label" in field:
-                    classification = self.classify_field(field["label"])
-                    field["classified_type"] = classification["field_type"]
-                    field["classification_confidence"] = classification["confidence"]
+            # Classify all labelled fields together
+            labelled = [field for field in detected if "label" in field]
+            for field, classification in zip(labelled, self.classify_fields([f["label"] for f in labelled])):
+                field["classified_type"] = classification["field_type"]
+                field["classification_confidence"] = classification["confidence"]
             
             return detected
         
@@ -976,12 +1538,12 @@ class AdvancedFieldClassifier:
         
         return str(value)
     
-    def process_form(self, image_path: str, user_profile: Dict) -> Dict:
+    def process_form(self, image_path: Any, user_profile: Dict) -> Dict:
         """
         Complete form processing pipeline
         
         Args:
-            image_path: Path to form image
+            image_path: Form image or PDF path (or a list of pages)
             user_profile: User profile data
             
         Returns:
@@ -1017,7 +1579,7 @@ def classify_field(label: str, use_ml: bool = False, models_dir: Optional[str] =
         Classification result with field type and confidence
     """
     if use_ml:
-        classifier = AdvancedFieldClassifier(models_dir=models_dir)
+        classifier = get_model("field_classifier", models_dir)
         return classifier.classify_field(label)
     else:
         classifier = FieldClassifier()
@@ -1041,7 +1603,7 @@ def auto_fill_form(fields: List[Dict], user_profile: Dict, use_ml: bool = False)
     Returns:
         Mapping of field IDs to values
     """
-    classifier = AdvancedFieldClassifier() if use_ml else FieldClassifier()
+    classifier = get_model("field_classifier") if use_ml else FieldClassifier()
     
     if hasattr(classifier, 'auto_fill_form'):
         return classifier.auto_fill_form(fields, user_profile)
@@ -0,0 +1,300 @@
+"""
+Form Schema Cache
+Reuses field classifications for forms that have been seen before
+
+Government portals serve the same forms to every applicant, so the field
+list of a form (labels and ids, in order) recurs across requests. Entries
+are keyed by a structural fingerprint of that list and store the classified
+type and confidence of every field; values typed into the form are not part
+of the key. Each entry is tagged with the classifier version (a digest of
+FIELD_PATTERNS, the confidence tiers and any model in use), and an entry
+written by another version is dropped on lookup, so editing patterns or
+swapping models invalidates old schemas automatically.
+
+Layout (when a cache directory is configured):
+    <cache_dir>/<fingerprint[:2]>/<fingerprint>.json   one entry per file
+
+A new schema costs one small atomic file write, independent of how many
+schemas are stored; a memory miss checks the entry's file, so schemas
+written by other workers are picked up. Hit counters are accumulated in
+memory and merged into the files of the hit entries every flush_every hits
+(and on flush()), under an exclusive file lock so workers sharing one
+directory do not lose each other's hits. The disk store drops its least
+recently used files (by mtime, refreshed when hits are merged) once it
+holds more than max_entries schemas. A form_schemas.json written by the
+previous single-file layout is migrated on startup.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .recommendation_cache import stable_digest
+from .store_utils import file_lock
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+LEGACY_STORE_FILE = "form_schemas.json"
+
+
+def form_fingerprint(fields: Sequence[Dict]) -> str:
+    """Structural fingerprint of a form: field labels and ids, in order"""
+    return stable_digest([[str(f.get("label") or ""), str(f.get("id") or "")] for f in fields])
+
+
+class FormSchemaCache:
+    """
+    LRU cache of classified form schemas, optionally persisted to disk
+
+    Args:
+        cache_dir: Directory for the persistent store; None keeps the cache
+            in memory only
+        max_entries: Bound on cached schemas (least recently used dropped)
+        flush_every: Hits accumulated before counters are written to disk
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 5000, flush_every: int = 100):
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pending_hits: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0, "evictions": 0}
+
+        self.store_dir: Optional[Path] = None
+        self._disk_entries = 0
+        if cache_dir:
+            try:
+                self.store_dir = Path(cache_dir)
+                self.store_dir.mkdir(parents=True, exist_ok=True)
+                self._migrate_legacy_store()
+                stored = sorted(self._scan_store(), key=lambda entry: entry[1])
+                self._disk_entries = len(stored)
+                for path, _ in stored[-self.max_entries:]:
+                    entry = self._read_entry(Path(path))
+                    if entry is not None:
+                        self._entries[Path(path).stem] = entry
+                logger.info(f"Form schema cache: {len(self._entries)} schemas from {self.store_dir}")
+            except OSError as e:
+                logger.warning(f"Form schema cache at {cache_dir} unavailable, using memory only: {e}")
+                self.store_dir = None
+
+    # ------------------------------------------------------------------
+    # Persistent store
+    # ------------------------------------------------------------------
+
+    def _file_lock(self):
+        return file_lock(self.store_dir / ".lock")
+
+    def _entry_path(self, fingerprint: str) -> Path:
+        return self.store_dir / fingerprint[:2] / f"{fingerprint}.json"
+
+    def _scan_store(self):
+        """(path, mtime) of every stored entry"""
+        entries = []
+        for shard in os.scandir(self.store_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        entries.append((entry.path, entry.stat().st_mtime))
+                    except OSError:
+                        continue  # Evicted by another worker
+        return entries
+
+    def _read_entry(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable form schema {path}: {e}")
+            return None
+        if entry.get("format") != FORMAT_VERSION:
+            return None
+        return entry
+
+    def _write_entry(self, fingerprint: str, entry: Dict[str, Any]):
+        path = self._entry_path(fingerprint)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**entry, "format": FORMAT_VERSION}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _migrate_legacy_store(self):
+        """Split a form_schemas.json from the single-file layout into entry files"""
+        legacy_path = self.store_dir / LEGACY_STORE_FILE
+        if not legacy_path.exists():
+            return
+        with self._file_lock():
+            try:
+                with open(legacy_path, encoding="utf-8") as f:
+                    store = json.load(f)
+                if store.get("format") == FORMAT_VERSION:
+                    for fingerprint, entry in store.get("entries", {}).items():
+                        self._write_entry(fingerprint, entry)
+            except ValueError as e:
+                logger.warning(f"Dropping unreadable form schema cache {legacy_path}: {e}")
+            legacy_path.unlink(missing_ok=True)
+
+    def _disk_get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        if self.store_dir is None:
+            return None
+        return self._read_entry(self._entry_path(fingerprint))
+
+    def _disk_put(self, fingerprint: str):
+        """Write one schema (the only file touched by a store)"""
+        try:
+            existed = self._entry_path(fingerprint).exists()
+            self._write_entry(fingerprint, self._entries[fingerprint])
+        except OSError as e:
+            logger.warning(f"Could not write form schema {fingerprint}: {e}")
+            return
+        if not existed:
+            self._disk_entries += 1
+            if self._disk_entries > self.max_entries:
+                self._evict_disk()
+
+    def _evict_disk(self):
+        """Drop least recently used entry files down to 90% of max_entries"""
+        stored = sorted(self._scan_store(), key=lambda entry: entry[1])
+        target = int(self.max_entries * 0.9)
+        for path, _ in stored[:max(0, len(stored) - target)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._disk_entries = min(len(stored), target)
+
+    def _sync_store(self):
+        """Merge pending hits into the files of the hit entries"""
+        if self.store_dir is None:
+            self._pending_hits.clear()
+            return
+        try:
+            with self._file_lock():
+                for fingerprint, hits in self._pending_hits.items():
+                    entry = self._entries.get(fingerprint)
+                    stored = self._disk_get(fingerprint)
+                    if entry is None or stored is None or stored["version"] != entry["version"]:
+                        continue
+                    stored["hits"] = stored.get("hits", 0) + hits
+                    stored["last_hit"] = entry["last_hit"]
+                    self._write_entry(fingerprint, stored)
+            self._pending_hits.clear()
+        except OSError as e:
+            logger.warning(f"Could not write form schema hits to {self.store_dir}: {e}")
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, fingerprint: str, version: str) -> Optional[List[Tuple[str, float]]]:
+        """Cached (type, confidence) per field for a form under a classifier version, or None"""
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                entry = self._disk_get(fingerprint)  # Stored by another worker
+                if entry is not None:
+                    self._entries[fingerprint] = entry
+                    self._evict()
+            if entry is not None and entry["version"] != version:
+                del self._entries[fingerprint]
+                self._pending_hits.pop(fingerprint, None)
+                self.stats["invalidations"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(fingerprint)
+            entry["hits"] = entry.get("hits", 0) + 1
+            entry["last_hit"] = time.time()
+            self._pending_hits[fingerprint] = self._pending_hits.get(fingerprint, 0) + 1
+            self.stats["hits"] += 1
+            if sum(self._pending_hits.values()) >= self.flush_every:
+                self._sync_store()
+            return [(field_type, confidence) for field_type, confidence in entry["fields"]]
+
+    def put(self, fingerprint: str, version: str, fields: Sequence[Tuple[str, float]]):
+        """Store the classification of a form computed by the given classifier version"""
+        with self._lock:
+            self._entries[fingerprint] = {
+                "version": version,
+                "fields": [[field_type, confidence] for field_type, confidence in fields],
+                "hits": 0,
+                "created_at": time.time(),
+                "last_hit": None,
+            }
+            self._entries.move_to_end(fingerprint)
+            self.stats["stores"] += 1
+            self._evict()
+            if self.store_dir is not None:
+                self._disk_put(fingerprint)
+
+    def flush(self):
+        """Write accumulated hit counters to disk"""
+        with self._lock:
+            if self._pending_hits:
+                self._sync_store()
+
+    def invalidate(self):
+        """Drop all cached schemas (memory and disk)"""
+        with self._lock:
+            self._entries.clear()
+            self._pending_hits.clear()
+            self.stats["invalidations"] += 1
+            if self.store_dir is not None:
+                for path, _ in self._scan_store():
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                self._disk_entries = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            top = sorted(self._entries.items(), key=lambda item: item[1].get("hits", 0), reverse=True)[:10]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "persistent": self.store_dir is not None,
+                "top_forms": [
+                    {"fingerprint": key, "fields": len(entry["fields"]), "hits": entry.get("hits", 0)}
+                    for key, entry in top
+                ],
+            }
+
+
+# Global cache instance
+_form_schema_cache: Optional[FormSchemaCache] = None
+
+
+def get_form_schema_cache() -> FormSchemaCache:
+    """Get the process-wide form schema cache (AI_FORM_SCHEMA_CACHE_DIR / _SIZE)"""
+    global _form_schema_cache
+    if _form_schema_cache is None:
+        _form_schema_cache = FormSchemaCache(
+            cache_dir=os.environ.get("AI_FORM_SCHEMA_CACHE_DIR") or None,
+            max_entries=int(os.environ.get("AI_FORM_SCHEMA_CACHE_SIZE", "5000")),
+        )
+    return _form_schema_cache
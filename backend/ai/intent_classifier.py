@@ -21,11 +21,24 @@ import logging
 import re
 import os
 import json
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Any
+from itertools import islice
+from typing import Dict, List, Optional, Tuple, Any, Iterable, Iterator
 from pathlib import Path
 
+import numpy as np
+
 from .language_helper import get_language_helper, detect_lang
+from .keyword_automaton import KeywordAutomaton
+from .micro_batcher import MicroBatcher
+from .model_registry import get_model
+from .quantization import export_loaded, try_load_quantized
 
 logger = logging.getLogger(__name__)
 
@@ -228,6 +241,37 @@ class IntentClassifier:
     
     def __init__(self):
         self.min_confidence = 0.5  # Minimum confidence threshold
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_key: Optional[Tuple[int, int]] = None
+        self._pool_lock = threading.Lock()
+    
+    def _get_pool(self, workers: int) -> ProcessPoolExecutor:
+        """
+        Shared scoring pool, started on first use and reused by later batches
+        
+        The pool is rebuilt only when the worker count or INTENT_PATTERNS
+        change; concurrent batches share its workers.
+        """
+        key = (workers, id(self.INTENT_PATTERNS))
+        with self._pool_lock:
+            if self._pool is not None and self._pool_key != key:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_intent_worker,
+                    initargs=(type(self), self.INTENT_PATTERNS)
+                )
+                self._pool_key = key
+            return self._pool
+    
+    def close(self):
+        """Shut down the batch scoring pool"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
     
     def preprocess_message(self, message: str) -> str:
         """Preprocess message for analysis"""
@@ -258,7 +302,8 @@ class IntentClassifier:
         
         return keywords
     
-    def _get_all_keywords(self, pattern: Dict) -> List[str]:
+    @staticmethod
+    def _get_all_keywords(pattern: Dict) -> List[str]:
         """Get all keywords from pattern (en + hi + hinglish)"""
         all_keywords = []
         all_keywords.extend(pattern.get("keywords_en", []))
@@ -266,55 +311,109 @@ class IntentClassifier:
         all_keywords.extend(pattern.get("keywords_hinglish", []))
         return [kw.lower() for kw in all_keywords]
     
-    def _get_all_phrases(self, pattern: Dict) -> List[str]:
+    @staticmethod
+    def _get_all_phrases(pattern: Dict) -> List[str]:
         """Get all phrases from pattern (en + hi)"""
         all_phrases = []
         all_phrases.extend(pattern.get("phrases_en", []))
         all_phrases.extend(pattern.get("phrases_hi", []))
         return [p.lower() for p in all_phrases]
     
-    def calculate_intent_score(self, message: str, intent: IntentType) -> float:
-        """Calculate score for a specific intent using pre-defined bilingual keywords"""
-        text = self.preprocess_message(message)
-        keywords = self.extract_keywords(text)
+    @classmethod
+    def compile_patterns(cls) -> Dict[str, Any]:
+        """
+        INTENT_PATTERNS compiled into one keyword automaton (built once per class and reused)
         
-        if not keywords:
-            return 0.0
+        Every distinct lowercased keyword/phrase becomes one automaton
+        pattern that records, per intent, how many keyword and phrase list
+        entries it stands for. The automaton is rebuilt when INTENT_PATTERNS
+        is replaced.
+        """
+        compiled = cls.__dict__.get("_compiled_bank")
+        if compiled is not None and compiled["source"] is cls.INTENT_PATTERNS:
+            return compiled
         
-        pattern = self.INTENT_PATTERNS.get(intent, {})
-        base_weight = pattern.get("weight", 0.5)
+        intents = list(cls.INTENT_PATTERNS)
+        pattern_ids: Dict[str, int] = {}
+        pattern_hits: List[List[Tuple[int, int, int]]] = []  # [(intent, keyword entries, phrase entries)]
+        word_intents: Dict[str, List[int]] = {}  # keyword -> intents listing it (word-by-word match)
         
-        score = 0.0
+        for intent_idx, intent in enumerate(intents):
+            pattern = cls.INTENT_PATTERNS[intent]
+            counts: Dict[str, List[int]] = {}
+            for kw in cls._get_all_keywords(pattern):
+                counts.setdefault(kw, [0, 0])[0] += 1
+            for phrase in cls._get_all_phrases(pattern):
+                counts.setdefault(phrase, [0, 0])[1] += 1
+            for text, (n_keywords, n_phrases) in counts.items():
+                if text not in pattern_ids:
+                    pattern_ids[text] = len(pattern_hits)
+                    pattern_hits.append([])
+                pattern_hits[pattern_ids[text]].append((intent_idx, n_keywords, n_phrases))
+                if n_keywords:
+                    word_intents.setdefault(text, []).append(intent_idx)
         
-        # Check for phrase matches (highest priority) - bilingual
-        all_phrases = self._get_all_phrases(pattern)
-        phrase_match = 0
-        for phrase in all_phrases:
-            if phrase in text:
-                phrase_match += 1
-                score += 0.3  # High weight for phrase match
+        # The empty string is "in" every text
+        always = [hits for text, hits in zip(pattern_ids, pattern_hits) if not text]
+        compiled = {
+            "source": cls.INTENT_PATTERNS,
+            "intents": intents,
+            "weights": [cls.INTENT_PATTERNS[intent].get("weight", 0.5) for intent in intents],
+            "automaton": KeywordAutomaton(pattern_ids),
+            "pattern_hits": pattern_hits,
+            "always_hits": [hit for hits in always for hit in hits],
+            "word_intents": word_intents,
+        }
+        cls._compiled_bank = compiled
+        return compiled
+    
+    def score_intents(self, message: str) -> Dict[IntentType, float]:
+        """
+        calculate_intent_score for every intent in one pass over the message
         
-        # Check keyword matches - bilingual (en + hi + hinglish)
-        all_pattern_keywords = self._get_all_keywords(pattern)
-        keyword_matches = 0
+        The automaton reports each keyword/phrase present in the text once;
+        counts, weights and the float arithmetic follow calculate_intent_score
+        exactly, so scores are identical.
+        """
+        return self._score_text(self.preprocess_message(message))
+    
+    def _score_text(self, text: str) -> Dict[IntentType, float]:
+        """score_intents for an already preprocessed message"""
+        compiled = self.compile_patterns()
+        keywords = self.extract_keywords(text)
         
-        # Check each keyword in text (not just words)
-        for pattern_kw in all_pattern_keywords:
-            if pattern_kw in text:
-                keyword_matches += 1
+        scores = {intent: 0.0 for intent in IntentType}
+        if not keywords:
+            return scores
         
-        # Also check word-by-word match
-        for kw in keywords:
-            if kw in all_pattern_keywords:
-                keyword_matches += 1
+        n = len(compiled["intents"])
+        phrase_matches = [0] * n
+        keyword_matches = [0] * n
+        pattern_hits = compiled["pattern_hits"]
+        hit_lists = [pattern_hits[pid] for pid in compiled["automaton"].find_all(text)]
+        hit_lists.append(compiled["always_hits"])
+        for hits in hit_lists:
+            for intent_idx, n_keywords, n_phrases in hits:
+                keyword_matches[intent_idx] += n_keywords
+                phrase_matches[intent_idx] += n_phrases
         
-        if keyword_matches > 0:
-            # Scale score based on matches
-            keyword_score = min(keyword_matches * 0.15, 0.7) * base_weight
-            score += keyword_score
+        word_intents = compiled["word_intents"]
+        for kw in keywords:
+            for intent_idx in word_intents.get(kw, ()):
+                keyword_matches[intent_idx] += 1
         
-        # Normalize to 0-1
-        return min(score, 1.0)
+        for intent_idx, intent in enumerate(compiled["intents"]):
+            score = 0.0
+            for _ in range(phrase_matches[intent_idx]):
+                score += 0.3  # Same float accumulation as the per-phrase loop
+            if keyword_matches[intent_idx] > 0:
+                score += min(keyword_matches[intent_idx] * 0.15, 0.7) * compiled["weights"][intent_idx]
+            scores[intent] = min(score, 1.0)
+        return scores
+    
+    def calculate_intent_score(self, message: str, intent: IntentType) -> float:
+        """Calculate score for a specific intent using pre-defined bilingual keywords"""
+        return self.score_intents(message).get(intent, 0.0)
     
     def classify(self, message: str) -> Tuple[IntentType, float, Dict]:
         """
@@ -326,12 +425,12 @@ class IntentClassifier:
         if not message or not message.strip():
             return IntentType.UNCLEAR, 0.0, {"error": "Empty message"}
         
-        # Calculate scores for all intents
-        scores = {}
-        for intent in IntentType:
-            score = self.calculate_intent_score(message, intent)
-            scores[intent] = score
-        
+        # Calculate scores for all intents (one automaton pass)
+        scores = self.score_intents(message)
+        return self._classify_scores(message, scores)
+    
+    def _classify_scores(self, message: str, scores: Dict[IntentType, float]) -> Tuple[IntentType, float, Dict]:
+        """Pick the top intent and build the classify() details from intent scores"""
         # Get top intent
         top_intent = max(scores, key=scores.get)
         top_score = scores[top_intent]
@@ -355,9 +454,123 @@ class IntentClassifier:
         
         return top_intent, top_score, details
     
-    def classify_batch(self, messages: List[str]) -> List[Tuple[IntentType, float, Dict]]:
-        """Classify multiple messages"""
-        return [self.classify(msg) for msg in messages]
+    def classify_batch(
+        self,
+        messages: List[str],
+        workers: int = 1,
+        chunk_size: int = 2000
+    ) -> List[Tuple[IntentType, float, Dict]]:
+        """Classify multiple messages (see iter_classify)"""
+        return list(self.iter_classify(messages, workers=workers, chunk_size=chunk_size))
+    
+    def iter_classify(
+        self,
+        messages: Iterable[str],
+        workers: int = 1,
+        chunk_size: int = 2000,
+        cache_size: int = 100_000
+    ) -> Iterator[Tuple[IntentType, float, Dict]]:
+        """
+        Stream classify() results for a (possibly huge) iterable of messages
+        
+        Messages are read in chunks and preprocessed once; identical
+        normalized messages are scored once (within a chunk and via a
+        bounded cache across chunks). With workers > 1, chunks of unique
+        texts are scored in the classifier's shared process pool (see
+        close()) with a bounded number of chunks in flight, so memory stays
+        flat. Results come back in input order
+        and match classify() exactly.
+        
+        Args:
+            messages: Messages to classify (any iterable, consumed lazily)
+            workers: Scoring processes (1 = score in this process)
+            chunk_size: Messages per chunk
+            cache_size: Normalized texts remembered across chunks
+        """
+        templates: "OrderedDict[str, Tuple]" = OrderedDict()
+        
+        def prepare(chunk: List[str]):
+            texts = [self.preprocess_message(m) if m and m.strip() else None for m in chunk]
+            known, pending = {}, []
+            for text in dict.fromkeys(texts):
+                if text is None:
+                    continue
+                if text in templates:
+                    templates.move_to_end(text)
+                    known[text] = templates[text]
+                else:
+                    pending.append(text)
+            return chunk, texts, known, pending
+        
+        def emit(prepared, score_rows):
+            chunk, texts, known, pending = prepared
+            for text, row in zip(pending, score_rows):
+                scores = row if isinstance(row, dict) else dict(zip(IntentType, row))
+                intent, score, details = self._classify_scores(None, scores)
+                known[text] = templates[text] = (intent, score, details)
+            while len(templates) > cache_size:
+                templates.popitem(last=False)
+            for message, text in zip(chunk, texts):
+                if text is None:
+                    yield IntentType.UNCLEAR, 0.0, {"error": "Empty message"}
+                    continue
+                intent, score, details = known[text]
+                yield intent, score, {
+                    "original_message": message,
+                    "top_intent": details["top_intent"],
+                    "confidence": details["confidence"],
+                    "runner_ups": list(details["runner_ups"]),
+                    "all_scores": dict(details["all_scores"]),
+                }
+        
+        chunks = _chunked(messages, chunk_size)
+        if workers <= 1:
+            for chunk in chunks:
+                prepared = prepare(chunk)
+                yield from emit(prepared, [self._score_text(text) for text in prepared[3]])
+            return
+        
+        pool = self._get_pool(workers)
+        
+        def drop_pool(error: Exception):
+            nonlocal pool
+            logger.warning(f"Intent scoring workers failed, scoring in process: {error}")
+            with self._pool_lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool = None
+        
+        def submit(prepared):
+            if pool is not None:
+                try:
+                    return pool.submit(_score_texts_worker, prepared[3])
+                except BrokenProcessPool as e:
+                    drop_pool(e)
+            return None
+        
+        def results(prepared, future):
+            if future is not None:
+                try:
+                    return future.result()
+                except BrokenProcessPool as e:
+                    if pool is not None:
+                        drop_pool(e)
+            return [self._score_text(text) for text in prepared[3]]
+        
+        in_flight = deque()
+        for chunk in chunks:
+            prepared = prepare(chunk)
+            in_flight.append((prepared, submit(prepared)))
+            if len(in_flight) >= 2 * workers:
+                prepared, future = in_flight.popleft()
+                yield from emit(prepared, results(prepared, future))
+        while in_flight:
+            prepared, future = in_flight.popleft()
+            yield from emit(prepared, results(prepared, future))
+    
+    def _score_row(self, text: str) -> Tuple[float, ...]:
+        """Scores of a preprocessed text in IntentType order (compact, picklable)"""
+        return tuple(self._score_text(text).values())
     
     def get_suggested_response(self, intent: IntentType, lang: str = "en") -> Dict[str, str]:
         """
@@ -489,6 +702,30 @@ class IntentClassifier:
 # Advanced ML Components (DistilBERT Intent Classification)
 # ==============================================================================
 
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Per-process classifier for IntentClassifier.iter_classify(workers > 1)
+_worker_classifier: Optional[IntentClassifier] = None
+
+
+def _init_intent_worker(classifier_cls: type, patterns: Dict):
+    global _worker_classifier
+    _worker_classifier = classifier_cls()
+    _worker_classifier.INTENT_PATTERNS = patterns
+    _worker_classifier.compile_patterns()
+
+
+def _score_texts_worker(texts: List[str]) -> List[Tuple[float, ...]]:
+    return [_worker_classifier._score_row(text) for text in texts]
+
+
 class DistilBERTIntentClassifier:
     """
     DistilBERT-based intent classification
@@ -508,15 +745,20 @@ class DistilBERTIntentClassifier:
         self,
         model_name: str = "distilbert-base-multilingual-cased",
         model_path: Optional[str] = None,
-        num_labels: int = 19
+        num_labels: int = 19,
+        use_quantized: Optional[bool] = None
     ):
         self.model_name = model_name
         self.model_path = model_path
         self.num_labels = num_labels
+        self.use_quantized = use_quantized
         self.model = None
         self.tokenizer = None
+        self.backend = "pytorch"
         self.label2id = {label: i for i, label in enumerate(self.INTENT_LABELS)}
         self.id2label = {i: label for i, label in enumerate(self.INTENT_LABELS)}
+        self._batcher: Optional[MicroBatcher] = None
+        self._batcher_lock = threading.Lock()
         self._load_model()
     
     def _load_model(self):
@@ -524,6 +766,15 @@ class DistilBERTIntentClassifier:
         try:
             from transformers import DistilBertForSequenceClassification, DistilBertTokenizer
             
+            # Int8 artifact (see quantization.py) when one has been exported
+            quantized = try_load_quantized(
+                self.model_path, DistilBertForSequenceClassification, DistilBertTokenizer, self.use_quantized
+            )
+            if quantized is not None:
+                self.model, self.tokenizer = quantized
+                self.backend = "int8"
+                return
+            
             if self.model_path and os.path.exists(self.model_path):
                 self.model = DistilBertForSequenceClassification.from_pretrained(
                     self.model_path,
@@ -555,41 +806,111 @@ class DistilBERTIntentClassifier:
         Returns:
             (predicted_intent, confidence, all_probabilities)
         """
+        return self.predict_batch([text])[0]
+    
+    def predict_batch(self, texts: List[str]) -> List[Tuple[str, float, Dict[str, float]]]:
+        """
+        Predict intents for several texts in one forward pass
+        
+        Texts are padded to the longest sequence in the batch; the attention
+        mask keeps padding from affecting each text's prediction.
+        
+        Args:
+            texts: Input messages
+            
+        Returns:
+            One (predicted_intent, confidence, all_probabilities) per text
+        """
+        if not texts:
+            return []
         if self.model is None or self.tokenizer is None:
-            return "unclear", 0.5, {}
+            return [("unclear", 0.5, {}) for _ in texts]
         
         try:
             import torch
             import torch.nn.functional as F
             
-            inputs = self.tokenizer(
-                text,
-                return_tensors="pt",
-                truncation=True,
-                max_length=128,
-                padding=True
-            )
-            
             with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
-                probs = F.softmax(logits, dim=-1)
-            
-            # Get prediction
-            pred_idx = torch.argmax(probs, dim=-1).item()
-            confidence = probs[0, pred_idx].item()
+                probs = F.softmax(self._forward(texts), dim=-1)
             
-            # Get all probabilities
-            all_probs = {
-                self.id2label[i]: probs[0, i].item()
-                for i in range(self.num_labels)
-            }
+            pred_ids = torch.argmax(probs, dim=-1).tolist()
+            prob_rows = probs.tolist()
             
-            return self.id2label[pred_idx], confidence, all_probs
+            results = []
+            for pred_idx, row in zip(pred_ids, prob_rows):
+                all_probs = {self.id2label[i]: row[i] for i in range(self.num_labels)}
+                results.append((self.id2label[pred_idx], row[pred_idx], all_probs))
+            return results
             
         except Exception as e:
             logger.warning(f"DistilBERT prediction failed: {e}")
+            return [("unclear", 0.5, {}) for _ in texts]
+    
+    def _forward(self, texts: List[str]) -> Any:
+        """Logits tensor for a batch, padded to its longest sequence"""
+        import torch
+        
+        inputs = self.tokenizer(
+            list(texts),
+            return_tensors="pt",
+            truncation=True,
+            max_length=128,
+            padding=True
+        )
+        with torch.no_grad():
+            return self.model(**inputs).logits
+    
+    def predict_logits(self, texts: List[str]) -> Any:
+        """Raw logits as a (len(texts), num_labels) numpy array (for parity checks)"""
+        return self._forward(texts).numpy()
+    
+    def export_quantized(self, output_dir: Optional[str] = None) -> Optional[str]:
+        """Write an int8 copy of the loaded PyTorch model (see quantization.export_loaded)"""
+        return export_loaded(
+            self.model, self.tokenizer, self.backend, self.model_path, self.model_name, output_dir
+        )
+    
+    def get_batcher(self) -> MicroBatcher:
+        """
+        Shared micro-batching front end for concurrent callers
+        
+        Configured by AI_INTENT_MAX_BATCH (default 32) and AI_INTENT_MAX_WAIT_MS
+        (default 5); created on first use.
+        """
+        with self._batcher_lock:
+            if self._batcher is None:
+                # Weak binding: the worker thread must not keep an unloaded model alive
+                owner = weakref.ref(self)
+                self._batcher = MicroBatcher(
+                    lambda texts: owner().predict_batch(texts),
+                    max_batch_size=int(os.environ.get("AI_INTENT_MAX_BATCH", "32")),
+                    max_wait_ms=float(os.environ.get("AI_INTENT_MAX_WAIT_MS", "5")),
+                    name="distilbert-intent-batcher",
+                )
+            return self._batcher
+    
+    def get_batcher_stats(self) -> Optional[Dict]:
+        """Batch size / latency histograms of the micro-batcher (None until first use)"""
+        batcher = self._batcher
+        return batcher.get_stats() if batcher is not None else None
+    
+    def close(self):
+        """Stop the micro-batching worker thread (if started)"""
+        if self._batcher is not None:
+            self._batcher.close(timeout=0)
+            self._batcher = None
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    async def predict_async(self, text: str) -> Tuple[str, float, Dict[str, float]]:
+        """Predict intent without blocking the event loop, batched with concurrent requests"""
+        if self.model is None or self.tokenizer is None:
             return "unclear", 0.5, {}
+        return await self.get_batcher().submit(text)
     
     def train(self, train_data: List[Dict], val_data: Optional[List[Dict]] = None, epochs: int = 3):
         """
@@ -681,19 +1002,41 @@ class BagOfWordsClassifier:
     """
     Lightweight bag-of-words intent classifier
     Fast alternative when DistilBERT is too heavy
+    
+    Weights live in a sparse intent x term matrix in CSR form (indptr,
+    indices, data numpy arrays) over a vocabulary index, plus a term-major
+    copy used for scoring. Scoring a batch of messages is one vectorized
+    gather + bincount (the sparse product messages x terms . terms x intents).
+    
+    Model files: JSON ({intent: {word: weight}}, human-readable) or a
+    compact binary .npz of the CSR arrays; the format follows the file suffix.
     """
     
+    TOKEN_PATTERN = re.compile(r'\b\w+\b')
+    
     def __init__(self, model_path: Optional[str] = None):
         self.model_path = model_path
-        self.word_weights: Dict[str, Dict[str, float]] = {}
+        self.intents: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        # intent x term CSR
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.data = np.zeros(0, dtype=np.float64)
+        # term x intent CSR (transpose, for scoring)
+        self._term_indptr = np.zeros(1, dtype=np.int64)
+        self._term_intents = np.zeros(0, dtype=np.int64)
+        self._term_weights = np.zeros(0, dtype=np.float64)
         self._load_model()
     
     def _load_model(self):
         """Load pre-computed word weights"""
         if self.model_path and os.path.exists(self.model_path):
             try:
-                with open(self.model_path, "r", encoding="utf-8") as f:
-                    self.word_weights = json.load(f)
+                if self.model_path.endswith(".npz"):
+                    self._load_binary(self.model_path)
+                else:
+                    with open(self.model_path, "r", encoding="utf-8") as f:
+                        self.word_weights = json.load(f)
                 logger.info("Loaded BoW classifier")
             except Exception as e:
                 logger.warning(f"Could not load BoW model: {e}")
@@ -715,8 +1058,141 @@ class BagOfWordsClassifier:
             "check_status": ["status", "check", "track", "स्थिति"],
         }
         
-        for intent, words in intent_words.items():
-            self.word_weights[intent] = {word: 1.0 for word in words}
+        self.word_weights = {
+            intent: {word: 1.0 for word in words}
+            for intent, words in intent_words.items()
+        }
+    
+    # ------------------------------------------------------------------
+    # Sparse weight matrix
+    # ------------------------------------------------------------------
+    
+    def _set_matrix(self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray):
+        """Build the CSR matrices from (intent, term, weight) triples (no duplicates)"""
+        n_intents, n_terms = len(self.intents), len(self.vocabulary)
+        
+        order = np.lexsort((cols, rows))
+        self.indices = cols[order].astype(np.int64)
+        self.data = values[order].astype(np.float64)
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n_intents)))).astype(np.int64)
+        
+        order = np.lexsort((rows, cols))
+        self._term_intents = rows[order].astype(np.int64)
+        self._term_weights = values[order].astype(np.float64)
+        self._term_indptr = np.concatenate(([0], np.cumsum(np.bincount(cols, minlength=n_terms)))).astype(np.int64)
+    
+    def _triples(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(intent, term, weight) arrays of the stored weights"""
+        rows = np.repeat(np.arange(len(self.intents), dtype=np.int64), np.diff(self.indptr))
+        return rows, self.indices, self.data
+    
+    @property
+    def word_weights(self) -> Dict[str, Dict[str, float]]:
+        """Weights as {intent: {word: weight}} (the JSON model format)"""
+        terms = list(self.vocabulary)
+        return {
+            intent: {
+                terms[col]: float(weight)
+                for col, weight in zip(
+                    self.indices[self.indptr[i]:self.indptr[i + 1]].tolist(),
+                    self.data[self.indptr[i]:self.indptr[i + 1]].tolist()
+                )
+            }
+            for i, intent in enumerate(self.intents)
+        }
+    
+    @word_weights.setter
+    def word_weights(self, weights: Dict[str, Dict[str, float]]):
+        self.intents = list(weights)
+        self.vocabulary = {}
+        rows, cols, values = [], [], []
+        for row, intent in enumerate(self.intents):
+            for word, weight in weights[intent].items():
+                rows.append(row)
+                cols.append(self.vocabulary.setdefault(word, len(self.vocabulary)))
+                values.append(float(weight))
+        self._set_matrix(
+            np.asarray(rows, dtype=np.int64),
+            np.asarray(cols, dtype=np.int64),
+            np.asarray(values, dtype=np.float64)
+        )
+    
+    # ------------------------------------------------------------------
+    # Prediction
+    # ------------------------------------------------------------------
+    
+    def vectorize(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Messages as a sparse message x term matrix in coordinate form
+        
+        Returns:
+            (message_ids, term_ids): one entry per known-word occurrence, in
+            message and word order (duplicates are counted by repetition)
+        """
+        vocabulary = self.vocabulary
+        message_ids: List[int] = []
+        term_ids: List[int] = []
+        for i, text in enumerate(texts):
+            for word in self.TOKEN_PATTERN.findall(text.lower()):
+                term = vocabulary.get(word)
+                if term is not None:
+                    message_ids.append(i)
+                    term_ids.append(term)
+        return np.asarray(message_ids, dtype=np.int64), np.asarray(term_ids, dtype=np.int64)
+    
+    def score_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Intent scores for a batch of messages
+        
+        Returns:
+            (len(texts), len(self.intents)) matrix; entry = sum of the
+            intent's weights over the message's words
+        """
+        n_intents = len(self.intents)
+        message_ids, term_ids = self.vectorize(texts)
+        
+        # Expand every word occurrence to the (intent, weight) entries of its term
+        starts = self._term_indptr[term_ids]
+        lengths = self._term_indptr[term_ids + 1] - starts
+        total = int(lengths.sum())
+        offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(starts, lengths) + offsets
+        
+        # bincount adds in input order, i.e. in word order per (message, intent)
+        bins = np.repeat(message_ids, lengths) * n_intents + self._term_intents[positions]
+        scores = np.bincount(bins, weights=self._term_weights[positions], minlength=len(texts) * n_intents)
+        return scores.reshape(len(texts), n_intents)
+    
+    def predict_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Predict intents for a batch of messages
+        
+        Args:
+            texts: Input messages
+            
+        Returns:
+            (predicted_intent, confidence) per message
+        """
+        if not texts:
+            return []
+        scores = self.score_batch(texts)
+        positive = scores > 0
+        masked = np.where(positive, scores, -np.inf)
+        best = masked.argmax(axis=1) if self.intents else np.zeros(len(texts), dtype=np.int64)
+        # Sequential sum over intents (same order as the per-intent loop)
+        totals = np.cumsum(np.where(positive, scores, 0.0), axis=1)[:, -1] if self.intents else np.zeros(len(texts))
+        has_score = positive.any(axis=1)
+        
+        results = []
+        for i, (row_best, has, total) in enumerate(zip(best.tolist(), has_score.tolist(), totals.tolist())):
+            if not has:
+                results.append(("unclear", 0.3))
+                continue
+            max_score = float(scores[i, row_best])
+            # Normalize to confidence
+            confidence = max_score / total if total > 0 else 0.5
+            results.append((self.intents[row_best], confidence))
+        return results
     
     def predict(self, text: str) -> Tuple[str, float]:
         """
@@ -728,56 +1204,112 @@ class BagOfWordsClassifier:
         Returns:
             (predicted_intent, confidence)
         """
-        text_lower = text.lower()
-        words = re.findall(r'\b\w+\b', text_lower)
+        # Single message: walk the term-major rows directly (no batch setup)
+        vocabulary, indptr = self.vocabulary, self._term_indptr
+        scores = [0.0] * len(self.intents)
+        for word in self.TOKEN_PATTERN.findall(text.lower()):
+            term = vocabulary.get(word)
+            if term is not None:
+                start, end = indptr[term], indptr[term + 1]
+                for intent, weight in zip(self._term_intents[start:end].tolist(), self._term_weights[start:end].tolist()):
+                    scores[intent] += weight
         
-        scores = {}
-        for intent, weights in self.word_weights.items():
-            score = sum(weights.get(word, 0) for word in words)
+        best, max_score, total = -1, 0.0, 0.0
+        for intent, score in enumerate(scores):
             if score > 0:
-                scores[intent] = score
+                total += score
+                if best < 0 or score > max_score:
+                    best, max_score = intent, score
         
-        if not scores:
+        if best < 0:
             return "unclear", 0.3
         
-        best_intent = max(scores, key=scores.get)
-        max_score = scores[best_intent]
-        
         # Normalize to confidence
-        total = sum(scores.values())
         confidence = max_score / total if total > 0 else 0.5
-        
-        return best_intent, confidence
+        return self.intents[best], confidence
+    
+    # ------------------------------------------------------------------
+    # Training / persistence
+    # ------------------------------------------------------------------
     
     def train(self, data: List[Dict]):
-        """Train BoW classifier from labeled data"""
-        # Count word occurrences per intent
-        word_counts: Dict[str, Dict[str, int]] = {}
-        intent_counts: Dict[str, int] = {}
+        """
+        Train BoW classifier from labeled data
+        
+        One counting pass over the messages; weights are TF-IDF-like:
+        (count of word in intent / messages of intent) *
+        (trained intents / trained intents using the word). Intents that do
+        not occur in data keep their current weights.
+        """
+        old_rows, old_cols, old_values = self._triples()
+        intent_rows = {intent: row for row, intent in enumerate(self.intents)}
+        vocabulary = self.vocabulary
+        trained_rows: Dict[int, int] = {}  # row -> number of messages
+        message_rows: List[int] = []
+        message_lengths: List[int] = []
+        words: List[str] = []
         
         for item in data:
-            intent = item.get("intent", "unclear")
-            text = item.get("text", "").lower()
-            words = re.findall(r'\b\w+\b', text)
-            
-            if intent not in word_counts:
-                word_counts[intent] = {}
-            intent_counts[intent] = intent_counts.get(intent, 0) + 1
-            
-            for word in words:
-                word_counts[intent][word] = word_counts[intent].get(word, 0) + 1
-        
-        # Compute TF-IDF-like weights
-        for intent, counts in word_counts.items():
-            self.word_weights[intent] = {}
-            for word, count in counts.items():
-                # Weight by frequency and inverse document frequency
-                tf = count / intent_counts[intent]
-                idf = len(word_counts) / sum(1 for ic in word_counts.values() if word in ic)
-                self.word_weights[intent][word] = tf * idf
+            row = intent_rows.setdefault(item.get("intent", "unclear"), len(intent_rows))
+            trained_rows[row] = trained_rows.get(row, 0) + 1
+            tokens = self.TOKEN_PATTERN.findall(item.get("text", "").lower())
+            words.extend(tokens)
+            message_rows.append(row)
+            message_lengths.append(len(tokens))
+        
+        # New words get ids in first-seen order
+        for word in dict.fromkeys(words):
+            if word not in vocabulary:
+                vocabulary[word] = len(vocabulary)
+        
+        self.intents = list(intent_rows)
+        n_terms = len(vocabulary)
+        
+        # Word counts per (intent, word)
+        token_rows = np.repeat(np.asarray(message_rows, dtype=np.int64), message_lengths)
+        token_cols = np.fromiter(map(vocabulary.__getitem__, words), dtype=np.int64, count=len(words))
+        keys = token_rows * n_terms + token_cols
+        keys, counts = np.unique(keys, return_counts=True)
+        rows, cols = np.divmod(keys, max(n_terms, 1))
+        
+        # Document frequency over the trained intents
+        df = np.bincount(cols, minlength=n_terms)
+        n_trained = len(trained_rows)
+        message_counts = np.zeros(len(self.intents), dtype=np.float64)
+        message_counts[list(trained_rows)] = list(trained_rows.values())
+        
+        tf = counts / message_counts[rows]
+        idf = n_trained / df[cols]
+        
+        # Untrained intents keep their weights; trained ones are replaced
+        keep = ~np.isin(old_rows, np.fromiter(trained_rows, dtype=np.int64))
+        self._set_matrix(
+            np.concatenate((old_rows[keep], rows)),
+            np.concatenate((old_cols[keep], cols)),
+            np.concatenate((old_values[keep], tf * idf))
+        )
+    
+    def _load_binary(self, path: str):
+        with np.load(path, allow_pickle=False) as archive:
+            self.intents = bytes(archive["intents"]).decode("utf-8").split("\0") if archive["intents"].size else []
+            terms = bytes(archive["terms"]).decode("utf-8").split("\0") if archive["terms"].size else []
+            self.vocabulary = {term: i for i, term in enumerate(terms)}
+            indptr, indices, data = archive["indptr"], archive["indices"], archive["data"]
+        rows = np.repeat(np.arange(len(self.intents), dtype=np.int64), np.diff(indptr))
+        self._set_matrix(rows, indices.astype(np.int64), data.astype(np.float64))
     
     def save(self, path: str):
-        """Save word weights"""
+        """Save word weights (binary CSR arrays for .npz paths, JSON otherwise)"""
+        if path.endswith(".npz"):
+            np.savez_compressed(
+                path,
+                intents=np.frombuffer("\0".join(self.intents).encode("utf-8"), dtype=np.uint8),
+                terms=np.frombuffer("\0".join(self.vocabulary).encode("utf-8"), dtype=np.uint8),
+                indptr=self.indptr,
+                indices=self.indices.astype(np.int32),
+                data=self.data,
+            )
+            return
         with open(path, "w", encoding="utf-8") as f:
             json.dump(self.word_weights, f, ensure_ascii=False, indent=2)
 
@@ -787,13 +1319,30 @@ class AdvancedIntentClassifier:
     Advanced Intent Classification for WhatsApp/Chat
     
     Combines DistilBERT with keyword-based fallback for reliable intent detection
+    
+    Two routing modes:
+    - Ensemble (default): every model runs, weighted vote
+    - Cascade: keywords -> BoW -> DistilBERT; a stage answers alone when its
+      confidence clears its threshold, so the transformer only runs for
+      messages the cheap models are unsure about. Enabled by passing
+      cascade_thresholds or by a calibrated cascade_thresholds.json in
+      models_dir (see calibrate_cascade). When no stage exits, the answer
+      is the same weighted vote as the ensemble.
     """
     
+    # Cascade order (cheapest first); the last stage never exits early
+    CASCADE_STAGES = ("keywords", "bow", "distilbert")
+    CASCADE_FILE = "cascade_thresholds.json"
+    
+    # Vote weights per model
+    MODEL_WEIGHTS = {"distilbert": 0.5, "bow": 0.2, "keywords": 0.3}
+    
     def __init__(
         self,
         models_dir: Optional[str] = None,
         use_distilbert: bool = True,
-        use_bow: bool = True
+        use_bow: bool = True,
+        cascade_thresholds: Optional[Dict[str, float]] = None
     ):
         self.models_dir = Path(models_dir) if models_dir else None
         
@@ -806,17 +1355,52 @@ class AdvancedIntentClassifier:
         
         # Initialize BoW classifier
         if use_bow:
-            bow_path = str(self.models_dir / "bow_weights.json") if self.models_dir else None
+            bow_path = None
+            if self.models_dir:
+                # Binary CSR weights when present, JSON otherwise
+                bow_path = str(self.models_dir / "bow_weights.npz")
+                if not os.path.exists(bow_path):
+                    bow_path = str(self.models_dir / "bow_weights.json")
             self.bow_classifier = BagOfWordsClassifier(model_path=bow_path)
         else:
             self.bow_classifier = None
         
         # Keyword-based fallback
         self.keyword_classifier = IntentClassifier()
+        
+        # Cascade routing (None = ensemble)
+        self.cascade_thresholds = cascade_thresholds
+        if self.cascade_thresholds is None and self.models_dir:
+            self.cascade_thresholds = self._load_cascade_thresholds(self.models_dir / self.CASCADE_FILE)
+        self._cascade_lock = threading.Lock()
+        self.cascade_stats = self._empty_cascade_stats()
+    
+    # ------------------------------------------------------------------
+    # Per-model predictions
+    # ------------------------------------------------------------------
+    
+    def _has_distilbert(self) -> bool:
+        return self.distilbert is not None and self.distilbert.model is not None
+    
+    def _prediction(self, model: str, intent: str, confidence: float) -> Dict:
+        return {
+            "model": model,
+            "intent": intent,
+            "confidence": confidence,
+            "weight": self.MODEL_WEIGHTS[model]
+        }
+    
+    def _keyword_prediction(self, text: str) -> Dict:
+        intent, confidence, _ = self.keyword_classifier.classify(text)
+        return self._prediction("keywords", intent.value, confidence)
+    
+    def _bow_prediction(self, text: str) -> Dict:
+        intent, confidence = self.bow_classifier.predict(text)
+        return self._prediction("bow", intent, confidence)
     
     def predict_intent(self, text: str) -> Dict:
         """
-        Predict intent using ensemble of models
+        Predict intent using ensemble of models (or the cascade, when configured)
         
         Args:
             text: Input message
@@ -824,38 +1408,70 @@ class AdvancedIntentClassifier:
         Returns:
             Prediction result with intent, confidence, and metadata
         """
+        if self.cascade_thresholds is not None:
+            result, results = self._cascade_cheap_stages(text)
+            if result is not None:
+                return result
+            distilbert_prediction = None
+            if self._has_distilbert():
+                start = time.perf_counter()
+                distilbert_prediction = self.distilbert.predict(text)
+                self._record_stage("distilbert", start, exited=True)
+            return self._cascade_final(text, results, distilbert_prediction)
+        
+        distilbert_prediction = None
+        if self._has_distilbert():
+            distilbert_prediction = self.distilbert.predict(text)
+        return self._combine_predictions(text, distilbert_prediction)
+    
+    async def predict_intent_async(self, text: str) -> Dict:
+        """
+        Async predict_intent for concurrent chat traffic
+        
+        The DistilBERT forward pass goes through the model's micro-batcher
+        (shared worker thread), so concurrent requests share one batched pass
+        and the event loop stays free; the cheap BoW/keyword models run inline.
+        """
+        if self.cascade_thresholds is not None:
+            result, results = self._cascade_cheap_stages(text)
+            if result is not None:
+                return result
+            distilbert_prediction = None
+            if self._has_distilbert():
+                start = time.perf_counter()
+                distilbert_prediction = await self.distilbert.predict_async(text)
+                self._record_stage("distilbert", start, exited=True)
+            return self._cascade_final(text, results, distilbert_prediction)
+        
+        distilbert_prediction = None
+        if self._has_distilbert():
+            distilbert_prediction = await self.distilbert.predict_async(text)
+        return self._combine_predictions(text, distilbert_prediction)
+    
+    def _combine_predictions(
+        self,
+        text: str,
+        distilbert_prediction: Optional[Tuple[str, float, Dict[str, float]]]
+    ) -> Dict:
+        """Weighted vote of the DistilBERT, BoW and keyword predictions"""
         results = []
         
         # DistilBERT prediction
-        if self.distilbert and self.distilbert.model is not None:
-            intent, confidence, probs = self.distilbert.predict(text)
-            results.append({
-                "model": "distilbert",
-                "intent": intent,
-                "confidence": confidence,
-                "weight": 0.5
-            })
+        if distilbert_prediction is not None:
+            intent, confidence, probs = distilbert_prediction
+            results.append(self._prediction("distilbert", intent, confidence))
         
         # BoW prediction
         if self.bow_classifier:
-            intent, confidence = self.bow_classifier.predict(text)
-            results.append({
-                "model": "bow",
-                "intent": intent,
-                "confidence": confidence,
-                "weight": 0.2
-            })
+            results.append(self._bow_prediction(text))
         
         # Keyword prediction (always available)
-        keyword_result = self.keyword_classifier.classify_intent(text)
-        results.append({
-            "model": "keywords",
-            "intent": keyword_result["intent"].value if hasattr(keyword_result["intent"], "value") else keyword_result["intent"],
-            "confidence": keyword_result["confidence"],
-            "weight": 0.3
-        })
-        
-        # Combine results
+        results.append(self._keyword_prediction(text))
+        
+        return self._vote(text, results)
+    
+    def _vote(self, text: str, results: List[Dict]) -> Dict:
+        """Combine per-model predictions by weighted voting"""
         if results:
             # Weighted voting
             intent_scores: Dict[str, float] = {}
@@ -886,9 +1502,216 @@ class AdvancedIntentClassifier:
             "language": "en"
         }
     
+    # ------------------------------------------------------------------
+    # Cascade
+    # ------------------------------------------------------------------
+    
+    def _empty_cascade_stats(self) -> Dict[str, Dict[str, float]]:
+        return {stage: {"runs": 0, "exits": 0, "total_ms": 0.0} for stage in self.CASCADE_STAGES}
+    
+    def _record_stage(self, stage: str, start: float, exited: bool):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._cascade_lock:
+            stats = self.cascade_stats[stage]
+            stats["runs"] += 1
+            stats["exits"] += int(exited)
+            stats["total_ms"] += elapsed_ms
+    
+    def _stage_exits(self, stage: str, prediction: Dict) -> bool:
+        threshold = self.cascade_thresholds.get(stage)
+        return (
+            threshold is not None
+            and prediction["intent"] != IntentType.UNCLEAR.value
+            and prediction["confidence"] >= threshold
+        )
+    
+    def _cascade_cheap_stages(self, text: str) -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        Run the keyword and BoW stages
+        
+        Returns:
+            (early-exit result or None, predictions made so far)
+        """
+        results = []
+        stages = [("keywords", self._keyword_prediction)]
+        if self.bow_classifier:
+            stages.append(("bow", self._bow_prediction))
+        
+        for position, (stage, predict) in enumerate(stages):
+            start = time.perf_counter()
+            prediction = predict(text)
+            results.append(prediction)
+            # Without DistilBERT the last cheap stage is final
+            final = position == len(stages) - 1 and not self._has_distilbert()
+            exited = self._stage_exits(stage, prediction)
+            self._record_stage(stage, start, exited=exited or final)
+            if exited:
+                return {
+                    "intent": prediction["intent"],
+                    "confidence": round(prediction["confidence"], 3),
+                    "model_used": stage,
+                    "exit_stage": stage,
+                    "all_predictions": results,
+                    "language": detect_lang(text)
+                }, results
+        return None, results
+    
+    def _cascade_final(
+        self,
+        text: str,
+        results: List[Dict],
+        distilbert_prediction: Optional[Tuple[str, float, Dict[str, float]]]
+    ) -> Dict:
+        """No stage was confident enough: weighted vote over every prediction"""
+        # Same order as the ensemble (distilbert, bow, keywords) so ties break identically
+        votes = list(reversed(results))
+        if distilbert_prediction is not None:
+            intent, confidence, probs = distilbert_prediction
+            votes.insert(0, self._prediction("distilbert", intent, confidence))
+        result = self._vote(text, votes)
+        result["exit_stage"] = votes[0]["model"]
+        return result
+    
+    def get_cascade_stats(self) -> Dict:
+        """Per-stage runs, exit rate and mean latency; share of messages reaching DistilBERT"""
+        with self._cascade_lock:
+            stats = {stage: dict(values) for stage, values in self.cascade_stats.items()}
+        total = stats["keywords"]["runs"]
+        return {
+            "enabled": self.cascade_thresholds is not None,
+            "thresholds": self.cascade_thresholds,
+            "messages": total,
+            "transformer_rate": round(stats["distilbert"]["runs"] / total, 4) if total else 0.0,
+            "stages": {
+                stage: {
+                    "runs": values["runs"],
+                    "exits": values["exits"],
+                    "exit_rate": round(values["exits"] / total, 4) if total else 0.0,
+                    "mean_ms": round(values["total_ms"] / values["runs"], 4) if values["runs"] else 0.0,
+                }
+                for stage, values in stats.items()
+            },
+        }
+    
+    def reset_cascade_stats(self):
+        with self._cascade_lock:
+            self.cascade_stats = self._empty_cascade_stats()
+    
+    @staticmethod
+    def _load_cascade_thresholds(path: Path) -> Optional[Dict[str, float]]:
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                thresholds = json.load(f)["thresholds"]
+            logger.info(f"Intent cascade enabled with thresholds {thresholds}")
+            return thresholds
+        except Exception as e:
+            logger.warning(f"Could not load cascade thresholds from {path}: {e}")
+            return None
+    
+    def calibrate_cascade(
+        self,
+        data: List[Dict],
+        tolerance: float = 0.01,
+        max_candidates: int = 50
+    ) -> Dict:
+        """
+        Pick cascade thresholds on a labelled set
+        
+        Every model is run once per message (DistilBERT in batches); then all
+        (keyword, BoW) threshold pairs drawn from the observed confidences
+        are evaluated. The chosen pair minimises how often DistilBERT runs
+        while keeping accuracy within `tolerance` of the full ensemble.
+        
+        Args:
+            data: List of {"text": str, "intent": str}
+            tolerance: Allowed absolute accuracy drop vs. the ensemble
+            max_candidates: Threshold candidates per stage (confidence quantiles)
+            
+        Returns:
+            {"thresholds", "accuracy", "ensemble_accuracy", "transformer_rate", ...}
+        """
+        texts = [item.get("text", "") for item in data]
+        labels = np.array([item.get("intent", "unclear") for item in data], dtype=object)
+        
+        keyword_predictions = [self._keyword_prediction(text) for text in texts]
+        bow_predictions = [self._bow_prediction(text) for text in texts] if self.bow_classifier else None
+        distilbert_predictions: List[Optional[Tuple]] = [None] * len(texts)
+        if self._has_distilbert():
+            distilbert_predictions = []
+            for batch in _chunked(texts, 64):
+                distilbert_predictions.extend(self.distilbert.predict_batch(batch))
+        
+        def stage_arrays(predictions: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            intents = np.array([p["intent"] for p in predictions], dtype=object)
+            confidence = np.array([p["confidence"] for p in predictions], dtype=np.float64)
+            can_exit = intents != IntentType.UNCLEAR.value
+            return confidence, can_exit, intents == labels
+        
+        # Answer when no stage exits = full weighted vote
+        final_correct = np.array([
+            self._combine_predictions(text, prediction)["intent"] == label
+            for text, prediction, label in zip(texts, distilbert_predictions, labels)
+        ])
+        ensemble_accuracy = float(final_correct.mean()) if len(texts) else 0.0
+        
+        def candidates(confidence: np.ndarray, can_exit: np.ndarray) -> List[float]:
+            values = np.unique(confidence[can_exit])
+            if len(values) > max_candidates:
+                values = np.unique(np.quantile(values, np.linspace(0, 1, max_candidates)))
+            return [float(v) for v in values] + [float("inf")]
+        
+        kw_conf, kw_ok, kw_correct = stage_arrays(keyword_predictions)
+        if bow_predictions is not None:
+            bow_conf, bow_ok, bow_correct = stage_arrays(bow_predictions)
+        else:
+            bow_conf, bow_ok, bow_correct = kw_conf, np.zeros(len(texts), dtype=bool), kw_correct
+        
+        best = None
+        for kw_threshold in candidates(kw_conf, kw_ok):
+            kw_exit = kw_ok & (kw_conf >= kw_threshold)
+            bow_candidates = candidates(bow_conf, bow_ok) if bow_predictions is not None else [float("inf")]
+            for bow_threshold in bow_candidates:
+                bow_exit = ~kw_exit & bow_ok & (bow_conf >= bow_threshold)
+                correct = np.where(kw_exit, kw_correct, np.where(bow_exit, bow_correct, final_correct))
+                accuracy = float(correct.mean()) if len(texts) else 0.0
+                transformer_rate = float(np.mean(~kw_exit & ~bow_exit)) if len(texts) else 0.0
+                if accuracy < ensemble_accuracy - tolerance:
+                    continue
+                key = (transformer_rate, -accuracy)
+                if best is None or key < best[0]:
+                    best = (key, kw_threshold, bow_threshold, accuracy, transformer_rate)
+        
+        _, kw_threshold, bow_threshold, accuracy, transformer_rate = best
+        thresholds = {}
+        if kw_threshold != float("inf"):
+            thresholds["keywords"] = kw_threshold
+        if bow_threshold != float("inf"):
+            thresholds["bow"] = bow_threshold
+        return {
+            "thresholds": thresholds,
+            "accuracy": round(accuracy, 4),
+            "ensemble_accuracy": round(ensemble_accuracy, 4),
+            "transformer_rate": round(transformer_rate, 4),
+            "tolerance": tolerance,
+            "n_samples": len(texts),
+            "distilbert_available": self._has_distilbert(),
+        }
+    
+    def save_cascade_thresholds(self, calibration: Dict, output_dir: Optional[str] = None) -> Path:
+        """Persist a calibrate_cascade() result and enable the cascade"""
+        output_path = Path(output_dir) if output_dir else self.models_dir
+        output_path.mkdir(parents=True, exist_ok=True)
+        path = output_path / self.CASCADE_FILE
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(calibration, f, indent=2)
+        self.cascade_thresholds = calibration["thresholds"]
+        return path
+    
     def get_response(self, intent: str, language: str = "en") -> Dict:
         """Get appropriate response for intent"""
-        return self.keyword_classifier.get_response(
+        return self.keyword_classifier.get_suggested_response(
             IntentType[intent.upper()] if intent.upper() in IntentType.__members__ else IntentType.UNCLEAR,
             language
         )
@@ -926,6 +1749,7 @@ class AdvancedIntentClassifier:
         
         if self.bow_classifier:
             self.bow_classifier.save(str(output_path / "bow_weights.json"))
+            self.bow_classifier.save(str(output_path / "bow_weights.npz"))
 
 
 # Convenience function for API integration
@@ -942,14 +1766,14 @@ def predict_intent(text: str, use_ml: bool = False, models_dir: Optional[str] =
         Prediction result with intent and confidence
     """
     if use_ml:
-        classifier = AdvancedIntentClassifier(models_dir=models_dir)
+        classifier = get_model("intent_classifier", models_dir)
         return classifier.predict_intent(text)
     else:
         classifier = IntentClassifier()
-        result = classifier.classify_intent(text)
+        intent, confidence, _ = classifier.classify(text)
         return {
-            "intent": result["intent"].value if hasattr(result["intent"], "value") else str(result["intent"]),
-            "confidence": result["confidence"],
+            "intent": intent.value,
+            "confidence": confidence,
             "model_used": "keywords",
             "language": detect_lang(text)
         }
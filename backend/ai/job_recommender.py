@@ -19,10 +19,15 @@ Dependencies (optional for ML mode):
 """
 
 import os
+import re
 import json
+import math
 import pickle
 import logging
-from typing import List, Dict, Optional, Tuple, Any
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple, Any, Union
 from datetime import datetime
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -30,6 +35,10 @@ from pathlib import Path
 import numpy as np
 from difflib import SequenceMatcher
 
+from .embedding_cache import EmbeddingCache
+from .model_registry import get_model, get_model_registry
+from .recommendation_cache import stable_digest
+
 logger = logging.getLogger(__name__)
 
 # Import language helper
@@ -43,6 +52,161 @@ except ImportError:
     STATE_BILINGUAL = {}
 
 
+_SALARY_NUMBER_RE = re.compile(r'\d+')
+
+
+def _parse_salary_floor(salary_text: str) -> Optional[int]:
+    """Parse the minimum salary from lowercased salary text ("25" means 25,000)"""
+    numbers = _SALARY_NUMBER_RE.findall(salary_text)
+    if not numbers:
+        return None
+    first = int(numbers[0])
+    return first * 1000 if first < 1000 else first
+
+
+@dataclass
+class EncodedJobCatalog:
+    """
+    Columnar encoding of a job catalogue for JobRecommender
+    
+    Categorical columns are dictionary-encoded: an int32 code per job plus one
+    representative raw value per code, so each distinct value is scored once
+    per request. Numeric columns are float64 with NaN meaning "not set".
+    Jobs with values the columns cannot represent exactly are listed in
+    scalar_rows and scored with the per-job path.
+    """
+    jobs: List[Dict]
+    education_codes: np.ndarray
+    education_values: List[Any]
+    location_codes: np.ndarray
+    location_values: List[Any]
+    category_codes: np.ndarray
+    category_values: List[Any]
+    history_codes: np.ndarray       # (category, company) keys for the learning multiplier
+    history_values: List[Dict]
+    min_age: np.ndarray
+    max_age: np.ndarray
+    salary_floor: np.ndarray
+    scalar_rows: List[int] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.jobs)
+    
+    @staticmethod
+    def _salary_floor(job_salary: Any) -> float:
+        if not job_salary:
+            return np.nan
+        salary_text = str(job_salary).lower()
+        if "not specified" in salary_text or "as per" in salary_text:
+            return np.nan
+        job_min = _parse_salary_floor(salary_text)
+        return np.nan if job_min is None else float(job_min)
+    
+    @classmethod
+    def from_jobs(cls, jobs: List[Dict]) -> "EncodedJobCatalog":
+        jobs = list(jobs)
+        n = len(jobs)
+        
+        dictionaries: Dict[str, Dict[Any, int]] = {
+            "education": {}, "location": {}, "category": {}, "history": {}
+        }
+        values: Dict[str, List[Any]] = {key: [] for key in dictionaries}
+        codes = {key: np.zeros(n, dtype=np.int32) for key in dictionaries}
+        min_age = np.full(n, np.nan)
+        max_age = np.full(n, np.nan)
+        salary_floor = np.full(n, np.nan)
+        scalar_rows: List[int] = []
+        
+        def encode(column: str, key: Any, representative: Any, row: int):
+            mapping = dictionaries[column]
+            if key not in mapping:
+                mapping[key] = len(values[column])
+                values[column].append(representative)
+            codes[column][row] = mapping[key]
+        
+        for row, job in enumerate(jobs):
+            location = job.get("location")
+            category = job.get("category", "General")
+            # Only the fields _get_learning_multiplier reads, with the same defaults
+            history_job = {k: job[k] for k in ("category", "company") if k in job}
+            history_key = (
+                ("category" in job, job.get("category")),
+                ("company" in job, job.get("company")),
+            )
+            try:
+                encode("education", job.get("education_required"), job.get("education_required"), row)
+                # _score_location only depends on truthiness and the normalized string
+                location_key = ("set", str(location).lower().strip()) if location else None
+                encode("location", location_key, location, row)
+                encode("category", category, category, row)
+                encode("history", history_key, history_job, row)
+            except TypeError:
+                # Unhashable field values
+                scalar_rows.append(row)
+                for column in codes:
+                    codes[column][row] = 0
+                continue
+            
+            # _score_age is neutral unless both limits are set
+            lo, hi = job.get("min_age"), job.get("max_age")
+            if lo and hi:
+                if all(isinstance(v, (int, float)) and math.isfinite(v) for v in (lo, hi)):
+                    min_age[row], max_age[row] = lo, hi
+                else:
+                    scalar_rows.append(row)     # Strings, NaN/inf limits
+                    continue
+            
+            floor = cls._salary_floor(job.get("salary"))
+            if floor >= 2 ** 53:
+                scalar_rows.append(row)         # Not exactly representable as float
+            else:
+                salary_floor[row] = floor
+        
+        # Codes for scalar rows must still index valid table entries
+        for column in codes:
+            if not values[column] and n:
+                values[column].append(None)
+        
+        return cls(
+            jobs=jobs,
+            education_codes=codes["education"], education_values=values["education"],
+            location_codes=codes["location"], location_values=values["location"],
+            category_codes=codes["category"], category_values=values["category"],
+            history_codes=codes["history"], history_values=values["history"],
+            min_age=min_age, max_age=max_age,
+            salary_floor=salary_floor, scalar_rows=scalar_rows,
+        )
+
+
+def _rank_rounded(rows: np.ndarray, scores: np.ndarray, top_k: int) -> List[int]:
+    """
+    Rows in the order a stable sort on round(score, 3), descending, gives, cut to top_k
+    
+    argpartition pre-selects on raw scores. Rounding is monotone, so anything
+    that can tie the k-th rounded score lies within 1e-3 of the k-th raw score.
+    """
+    if 0 < top_k < len(rows):
+        kth = scores[np.argpartition(-scores, top_k - 1)[:top_k]].min()
+        keep = scores >= kth - 1e-3
+        rows, scores = rows[keep], scores[keep]
+    ranked = sorted(
+        zip(rows.tolist(), scores.tolist()),
+        key=lambda item: (-round(item[1], 3), item[0])
+    )
+    return [row for row, _ in ranked[:top_k]]
+
+
+@dataclass
+class CatalogScores:
+    """Rule-based scores of one user against every row of an EncodedJobCatalog"""
+    total: np.ndarray                       # Weighted score x learning multiplier
+    valid: np.ndarray                       # False where the per-job path would fail
+    columns: Dict[str, np.ndarray]          # Per-rule scores
+    multiplier: np.ndarray
+    tables: Dict[str, List[Any]]            # Exact python scores per code (categorical rules)
+    scalar_results: Dict[int, Tuple[Dict, float, float]] = field(default_factory=dict)
+
+
 class JobRecommender:
     """
     Recommendation engine for jobs and government schemes
@@ -89,7 +253,7 @@ class JobRecommender:
     def get_recommendations(
         self,
         user_profile: Dict,
-        jobs: List[Dict],
+        jobs: Union[List[Dict], "EncodedJobCatalog"],
         top_k: int = 10,
         include_reasoning: bool = True
     ) -> List[Dict]:
@@ -105,13 +269,17 @@ class JobRecommender:
                 "salary_expectation": 30000,
                 "interaction_history": {...}  # Optional
             }
-            jobs: List of job documents
+            jobs: List of job documents, or an EncodedJobCatalog from
+                encode_catalog() for vectorized scoring
             top_k: Return top K recommendations
             include_reasoning: Include Hindi/English explanations
         
         Returns:
             List of recommendations with scores and reasons
         """
+        if isinstance(jobs, EncodedJobCatalog):
+            return self._get_recommendations_columnar(user_profile, jobs, top_k, include_reasoning)
+        
         if not jobs:
             return []
         
@@ -119,69 +287,11 @@ class JobRecommender:
         
         for job in jobs:
             try:
-                score_breakdown = {}
-                
-                # 1. Rule-based matching
-                score_breakdown["education"] = self._score_education(
-                    user_profile.get("education"),
-                    job.get("education_required")
-                )
-                
-                score_breakdown["age"] = self._score_age(
-                    user_profile.get("age"),
-                    job.get("min_age"),
-                    job.get("max_age")
-                )
-                
-                score_breakdown["location"] = self._score_location(
-                    user_profile.get("state"),
-                    job.get("location")
-                )
-                
-                score_breakdown["category"] = self._score_category(
-                    user_profile.get("preferred_categories", []),
-                    job.get("category", "General")
-                )
-                
-                score_breakdown["salary"] = self._score_salary(
-                    user_profile.get("salary_expectation"),
-                    job.get("salary")
-                )
-                
-                # 3. Learning-based adjustment
-                learning_multiplier = self._get_learning_multiplier(
-                    user_profile,
-                    job
-                )
-                
-                # Calculate weighted score
-                total_score = sum(
-                    score_breakdown[key] * self.rule_weights[key]
-                    for key in score_breakdown
-                ) * learning_multiplier
-                
-                # Confidence level
-                confidence = self._calculate_confidence(score_breakdown)
-                
-                # Reasoning
-                reasons = {}
-                if include_reasoning:
-                    reasons = self._generate_reasoning(
-                        score_breakdown,
-                        user_profile,
-                        job
-                    )
-                
-                recommendations.append({
-                    "job_id": job.get("id"),
-                    "job_title": job.get("title"),
-                    "company": job.get("company"),
-                    "score": round(total_score, 3),
-                    "confidence": confidence,
-                    "score_breakdown": score_breakdown,
-                    "reasons": reasons,
-                    "learning_multiplier": round(learning_multiplier, 2),
-                })
+                score_breakdown, learning_multiplier, total_score = self._score_job(user_profile, job)
+                recommendations.append(self._build_recommendation(
+                    user_profile, job, score_breakdown, learning_multiplier,
+                    total_score, include_reasoning
+                ))
             
             except Exception as e:
                 logger.error(f"Error scoring job {job.get('id')}: {str(e)}")
@@ -192,6 +302,303 @@ class JobRecommender:
         
         return recommendations[:top_k]
     
+    @staticmethod
+    def profile_fingerprint(user_profile: Dict) -> str:
+        """
+        Canonical digest of the profile fields the scorer reads
+        
+        State case/whitespace and category order/duplicates are normalized
+        and interaction_history is reduced to a digest; profiles with the
+        same fingerprint get identical recommendations.
+        """
+        state = user_profile.get("state")
+        if isinstance(state, str) and state.strip():
+            state = state.lower().strip()
+        categories = user_profile.get("preferred_categories", [])
+        if isinstance(categories, (list, tuple)) and all(isinstance(c, str) for c in categories):
+            categories = sorted(set(categories))
+        history = user_profile.get("interaction_history", {})
+        return stable_digest({
+            "education": user_profile.get("education"),
+            "age": user_profile.get("age"),
+            "state": state,
+            "categories": categories,
+            "salary_expectation": user_profile.get("salary_expectation"),
+            "history": stable_digest(history) if history else None,
+        })
+    
+    def _score_job(self, user_profile: Dict, job: Dict) -> Tuple[Dict, float, float]:
+        """Score a single job, returning (score_breakdown, learning_multiplier, total_score)"""
+        score_breakdown = {}
+        
+        # 1. Rule-based matching
+        score_breakdown["education"] = self._score_education(
+            user_profile.get("education"),
+            job.get("education_required")
+        )
+        
+        score_breakdown["age"] = self._score_age(
+            user_profile.get("age"),
+            job.get("min_age"),
+            job.get("max_age")
+        )
+        
+        score_breakdown["location"] = self._score_location(
+            user_profile.get("state"),
+            job.get("location")
+        )
+        
+        score_breakdown["category"] = self._score_category(
+            user_profile.get("preferred_categories", []),
+            job.get("category", "General")
+        )
+        
+        score_breakdown["salary"] = self._score_salary(
+            user_profile.get("salary_expectation"),
+            job.get("salary")
+        )
+        
+        # 3. Learning-based adjustment
+        learning_multiplier = self._get_learning_multiplier(
+            user_profile,
+            job
+        )
+        
+        # Calculate weighted score
+        total_score = sum(
+            score_breakdown[key] * self.rule_weights[key]
+            for key in score_breakdown
+        ) * learning_multiplier
+        
+        return score_breakdown, learning_multiplier, total_score
+    
+    def _build_recommendation(
+        self,
+        user_profile: Dict,
+        job: Dict,
+        score_breakdown: Dict,
+        learning_multiplier: float,
+        total_score: float,
+        include_reasoning: bool
+    ) -> Dict:
+        """Assemble the recommendation dict (confidence + reasoning) for a scored job"""
+        # Confidence level
+        confidence = self._calculate_confidence(score_breakdown)
+        
+        # Reasoning
+        reasons = {}
+        if include_reasoning:
+            reasons = self._generate_reasoning(
+                score_breakdown,
+                user_profile,
+                job
+            )
+        
+        return {
+            "job_id": job.get("id"),
+            "job_title": job.get("title"),
+            "company": job.get("company"),
+            "score": round(total_score, 3),
+            "confidence": confidence,
+            "score_breakdown": score_breakdown,
+            "reasons": reasons,
+            "learning_multiplier": round(learning_multiplier, 2),
+        }
+    
+    # ------------------------------------------------------------------
+    # Columnar scoring mode
+    # ------------------------------------------------------------------
+    
+    def encode_catalog(self, jobs: List[Dict]) -> "EncodedJobCatalog":
+        """
+        Pre-encode a job catalogue into columns for vectorized scoring
+        
+        Encode once (e.g. whenever the catalogue changes) and pass the result
+        to get_recommendations() in place of the job list.
+        """
+        return EncodedJobCatalog.from_jobs(jobs)
+    
+    @staticmethod
+    def _is_finite_number(value: Any) -> bool:
+        return isinstance(value, (int, float)) and math.isfinite(value)
+    
+    def _code_table(self, values: List[Any], scorer) -> Tuple[List[Any], np.ndarray, np.ndarray]:
+        """
+        Evaluate a scalar scorer once per distinct encoded value
+        
+        Returns (python_scores, float_scores, ok_mask) indexed by code.
+        Codes whose scorer raises are marked not ok, matching the scalar
+        path which skips jobs that fail to score.
+        """
+        py_scores: List[Any] = []
+        ok = np.ones(len(values), dtype=bool)
+        for code, value in enumerate(values):
+            try:
+                py_scores.append(scorer(value))
+            except Exception:
+                py_scores.append(0.0)
+                ok[code] = False
+        return py_scores, np.array(py_scores, dtype=np.float64), ok
+    
+    def score_catalog(self, user_profile: Dict, catalog: "EncodedJobCatalog") -> "CatalogScores":
+        """
+        Rule-based scores for every job in an EncodedJobCatalog (no confidence/reasons)
+        
+        Same arithmetic as the per-job path, element-wise; use
+        catalog_recommendation() to build the full result for chosen rows.
+        """
+        n = len(catalog)
+        valid = np.ones(n, dtype=bool)
+        scalar_rows = catalog.scalar_rows
+        
+        user_age = user_profile.get("age")
+        salary_expectation = user_profile.get("salary_expectation")
+        if (user_age and not self._is_finite_number(user_age)) or \
+                (salary_expectation and not self._is_finite_number(salary_expectation)):
+            # Exotic profile values: keep exact scalar semantics for every row
+            valid[:] = False
+            scalar_rows = range(n)
+            user_age = salary_expectation = None
+        
+        # Categorical columns: score each distinct value once, then gather
+        user_edu = user_profile.get("education")
+        edu_py, edu_tab, edu_ok = self._code_table(
+            catalog.education_values, lambda v: self._score_education(user_edu, v)
+        )
+        user_state = user_profile.get("state")
+        loc_py, loc_tab, loc_ok = self._code_table(
+            catalog.location_values, lambda v: self._score_location(user_state, v)
+        )
+        user_cats = user_profile.get("preferred_categories", [])
+        cat_py, cat_tab, cat_ok = self._code_table(
+            catalog.category_values, lambda v: self._score_category(user_cats, v)
+        )
+        _, mult_tab, mult_ok = self._code_table(
+            catalog.history_values, lambda v: self._get_learning_multiplier(user_profile, v)
+        )
+        valid &= edu_ok[catalog.education_codes] & loc_ok[catalog.location_codes]
+        valid &= cat_ok[catalog.category_codes] & mult_ok[catalog.history_codes]
+        
+        # Age: same arithmetic as _score_age, element-wise
+        age = np.full(n, 0.5)
+        if user_age:
+            lo, hi = catalog.min_age, catalog.max_age
+            has_range = ~(np.isnan(lo) | np.isnan(hi))
+            in_range = has_range & (lo <= user_age) & (user_age <= hi)
+            width = hi - lo
+            with np.errstate(divide="ignore", invalid="ignore"):
+                inside = np.maximum(0.5, 1.0 - (np.abs(user_age - (lo + hi) / 2) / width))
+            gap = np.where(user_age < lo, lo - user_age, user_age - hi)
+            outside = np.maximum(0.0, 0.5 - (gap * 0.05))
+            age = np.where(has_range, np.where(in_range, inside, outside), 0.5)
+            # The scalar path raises ZeroDivisionError on zero-width ranges
+            valid &= ~(in_range & (width == 0))
+        
+        # Salary: same arithmetic as _score_salary, element-wise
+        salary = np.full(n, 0.5)
+        if salary_expectation:
+            floor = catalog.salary_floor
+            with np.errstate(divide="ignore", invalid="ignore"):
+                above = np.minimum(1.0, 1.0 + (floor - salary_expectation) / salary_expectation)
+                below = np.maximum(0.2, 1.0 - ((salary_expectation - floor) / salary_expectation))
+            salary = np.where(
+                np.isnan(floor), 0.5,
+                np.where(floor >= salary_expectation * 0.8, above, below)
+            )
+        
+        columns = {
+            "education": edu_tab[catalog.education_codes],
+            "age": age,
+            "location": loc_tab[catalog.location_codes],
+            "category": cat_tab[catalog.category_codes],
+            "salary": salary,
+        }
+        multiplier = mult_tab[catalog.history_codes]
+        total = np.zeros(n)
+        for key, column in columns.items():
+            total = total + column * self.rule_weights[key]
+        total = total * multiplier
+        
+        # Rows the encoder could not represent exactly go through the scalar path
+        scalar_results: Dict[int, Tuple[Dict, float, float]] = {}
+        for row in scalar_rows:
+            try:
+                scalar_results[row] = self._score_job(user_profile, catalog.jobs[row])
+                total[row] = scalar_results[row][2]
+                valid[row] = True
+            except Exception as e:
+                logger.error(f"Error scoring job {catalog.jobs[row].get('id')}: {str(e)}")
+                valid[row] = False
+        
+        return CatalogScores(
+            total=total, valid=valid, columns=columns, multiplier=multiplier,
+            tables={"education": edu_py, "location": loc_py, "category": cat_py},
+            scalar_results=scalar_results,
+        )
+    
+    def catalog_recommendation(
+        self,
+        user_profile: Dict,
+        catalog: "EncodedJobCatalog",
+        scores: "CatalogScores",
+        row: int,
+        include_reasoning: bool = True
+    ) -> Dict:
+        """Build the recommendation dict for one row of score_catalog() output"""
+        if row in scores.scalar_results:
+            score_breakdown, learning_multiplier, total_score = scores.scalar_results[row]
+        else:
+            score_breakdown = {
+                "education": scores.tables["education"][catalog.education_codes[row]],
+                "age": self._as_scalar_score(scores.columns["age"][row]),
+                "location": scores.tables["location"][catalog.location_codes[row]],
+                "category": scores.tables["category"][catalog.category_codes[row]],
+                "salary": float(scores.columns["salary"][row]),
+            }
+            learning_multiplier = float(scores.multiplier[row])
+            total_score = float(scores.total[row])
+        return self._build_recommendation(
+            user_profile, catalog.jobs[row], score_breakdown, learning_multiplier,
+            total_score, include_reasoning
+        )
+    
+    def _get_recommendations_columnar(
+        self,
+        user_profile: Dict,
+        catalog: "EncodedJobCatalog",
+        top_k: int,
+        include_reasoning: bool
+    ) -> List[Dict]:
+        """
+        Score a user against an EncodedJobCatalog with array arithmetic
+        
+        Produces the same scores, ordering and reasons as the per-job path;
+        confidence and reasoning are only computed for the top-k survivors.
+        """
+        if len(catalog) == 0:
+            return []
+        scores = self.score_catalog(user_profile, catalog)
+        
+        rows = np.flatnonzero(scores.valid)
+        
+        recommendations = []
+        for row in _rank_rounded(rows, scores.total[rows], top_k):
+            try:
+                recommendations.append(self.catalog_recommendation(
+                    user_profile, catalog, scores, row, include_reasoning
+                ))
+            except Exception as e:
+                logger.error(f"Error scoring job {catalog.jobs[row].get('id')}: {str(e)}")
+                continue
+        
+        return recommendations
+    
+    @staticmethod
+    def _as_scalar_score(value: float) -> Any:
+        # _score_age returns max(0, ...) which yields int 0 at the floor
+        value = float(value)
+        return 0 if value == 0 else value
+    
     def _score_education(self, user_edu: str, job_edu: str) -> float:
         """Score education match (0-1)"""
         if not user_edu or not job_edu:
@@ -289,11 +696,8 @@ class JobRecommender:
         
         try:
             # Extract numbers from salary range
-            import re
-            numbers = re.findall(r'\d+', salary_text)
-            if numbers:
-                job_min = int(numbers[0]) * 1000 if int(numbers[0]) < 1000 else int(numbers[0])
-                
+            job_min = _parse_salary_floor(salary_text)
+            if job_min is not None:
                 if job_min >= user_expectation * 0.8:
                     return min(1.0, 1.0 + (job_min - user_expectation) / user_expectation)
                 else:
@@ -502,25 +906,29 @@ class FeatureExtractor:
     
     CATEGORIES = ["General", "OBC", "SC", "ST", "EWS"]
     
-    def __init__(self, embedding_model: Optional[Any] = None):
+    def __init__(
+        self,
+        embedding_model: Optional[Any] = None,
+        model_name: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        max_cached_embeddings: int = 10000,
+        encode_batch_size: int = 64
+    ):
         self.embedding_model = embedding_model
-        self._embedding_cache: Dict[str, np.ndarray] = {}
-        
-    def _get_text_embedding(self, text: str, dim: int = 384) -> np.ndarray:
-        """Get text embedding with caching"""
-        if not text:
-            return np.zeros(dim)
-        cache_key = hash(text)
-        if cache_key in self._embedding_cache:
-            return self._embedding_cache[cache_key]
-        if self.embedding_model:
-            try:
-                embedding = self.embedding_model.encode(text)
-                self._embedding_cache[cache_key] = embedding
-                return embedding
-            except Exception as e:
-                logger.warning(f"Embedding failed: {e}")
-        # Fallback: character n-gram hashing
+        self.encode_batch_size = encode_batch_size
+        # Stable content-hash keys; persisted (memory-mapped) when cache_dir is set
+        self.embedding_cache = EmbeddingCache(
+            model_name or type(embedding_model).__name__,
+            cache_dir=cache_dir,
+            max_memory_items=max_cached_embeddings
+        )
+    
+    def _encode_texts(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        return np.asarray(self.embedding_model.encode(texts, batch_size=batch_size or self.encode_batch_size))
+    
+    @staticmethod
+    def _hash_embedding(text: str, dim: int = 384) -> np.ndarray:
+        """Fallback: character n-gram hashing"""
         features = np.zeros(dim)
         text_lower = text.lower()
         for i in range(len(text_lower) - 2):
@@ -530,6 +938,54 @@ class FeatureExtractor:
         norm = np.linalg.norm(features)
         return features / norm if norm > 0 else features
     
+    def _get_text_embedding(self, text: str, dim: int = 384) -> np.ndarray:
+        """Get text embedding with caching"""
+        if not text:
+            return np.zeros(dim)
+        if self.embedding_model:
+            try:
+                return self.embedding_cache.get(text, self._encode_texts)
+            except Exception as e:
+                logger.warning(f"Embedding failed: {e}")
+        return self._hash_embedding(text, dim)
+    
+    def get_text_embeddings(
+        self,
+        texts: List[str],
+        dim: int = 384,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> List[np.ndarray]:
+        """
+        _get_text_embedding for many texts
+        
+        Cache misses are encoded in one call (chunked by batch_size, default
+        encode_batch_size).
+        Texts that fall back to n-gram hashing are spread over a thread pool
+        of `workers` threads when given.
+        """
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+        pending = [i for i, text in enumerate(texts) if text]
+        if self.embedding_model and pending:
+            try:
+                cached = self.embedding_cache.get_many(
+                    [texts[i] for i in pending], lambda misses: self._encode_texts(misses, batch_size)
+                )
+                for i, embedding in zip(pending, cached):
+                    embeddings[i] = embedding
+                pending = []
+            except Exception as e:
+                logger.warning(f"Embedding failed: {e}")
+        if workers and workers > 1 and len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                hashed = list(pool.map(lambda i: self._hash_embedding(texts[i], dim), pending))
+            for i, embedding in zip(pending, hashed):
+                embeddings[i] = embedding
+        else:
+            for i in pending:
+                embeddings[i] = self._hash_embedding(texts[i], dim)
+        return [np.zeros(dim) if embedding is None else embedding for embedding in embeddings]
+    
     def _encode_education(self, education: Optional[str]) -> float:
         if not education:
             return 0.0
@@ -562,8 +1018,8 @@ class FeatureExtractor:
         features.extend(skills_embedding[:64])  # Truncate for size
         return np.array(features, dtype=np.float32)
     
-    def extract_job_features(self, job: Dict) -> np.ndarray:
-        """Extract feature vector from job/scheme posting"""
+    def _job_base_features(self, job: Dict) -> List[float]:
+        """Non-text part of extract_job_features"""
         features = []
         features.append(1.0 if job.get("type") == "job" else 0.0)
         features.append((job.get("min_age") or 18) / 100.0)
@@ -579,11 +1035,65 @@ class FeatureExtractor:
         features.append(min(days_left / 365.0, 1.0))
         features.extend(self._encode_state(job.get("location")))
         features.extend(self._encode_category(job.get("category")))
-        text = f"{job.get('title', '')} {job.get('description', '')} {' '.join(job.get('tags', []))}"
-        text_embedding = self._get_text_embedding(text)
+        return features
+    
+    @staticmethod
+    def job_feature_text(job: Dict) -> str:
+        """Job text embedded into the job feature vector"""
+        return f"{job.get('title', '')} {job.get('description', '')} {' '.join(job.get('tags', []))}"
+    
+    def extract_job_features(self, job: Dict) -> np.ndarray:
+        """Extract feature vector from job/scheme posting"""
+        features = self._job_base_features(job)
+        text_embedding = self._get_text_embedding(self.job_feature_text(job))
         features.extend(text_embedding[:64])
         return np.array(features, dtype=np.float32)
     
+    def extract_job_features_batch(
+        self,
+        jobs: List[Dict],
+        workers: Optional[int] = None,
+        timings: Optional[Dict[str, float]] = None,
+        batch_size: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bulk extract_job_features plus similarity-text embeddings
+        
+        All feature and similarity texts are gathered first and their cache
+        misses encoded in batches, then the feature matrix is assembled.
+        
+        Args:
+            jobs: Job/scheme postings
+            workers: Thread pool size for the n-gram hashing fallback
+            timings: Optional dict that receives per-stage seconds
+                (text_prep, encode, assemble)
+            batch_size: Encoder batch size (default: encode_batch_size)
+            
+        Returns:
+            (n_jobs, d) float32 job features and (n_jobs, emb_dim) similarity-text embeddings
+        """
+        timings = timings if timings is not None else {}
+        
+        start = time.perf_counter()
+        n = len(jobs)
+        texts = [self.job_feature_text(job) for job in jobs]
+        texts += [self.job_similarity_text(job) for job in jobs]
+        timings["text_prep"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        embeddings = self.get_text_embeddings(texts, workers=workers, batch_size=batch_size)
+        timings["encode"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        rows = [
+            self._job_base_features(job) + list(embedding[:64])
+            for job, embedding in zip(jobs, embeddings[:n])
+        ]
+        job_features = np.array(rows, dtype=np.float32)
+        text_embeddings = np.stack(embeddings[n:]) if n else np.zeros((0, 384))
+        timings["assemble"] = time.perf_counter() - start
+        return job_features, text_embeddings
+    
     def extract_pair_features(self, user: Dict, job: Dict) -> np.ndarray:
         """Extract features for a user-job pair including interaction features"""
         user_features = self.extract_user_features(user)
@@ -616,54 +1126,403 @@ class FeatureExtractor:
         interaction.append(float(similarity))
         
         return np.concatenate([user_features, job_features, np.array(interaction, dtype=np.float32)])
+    
+    def job_similarity_text(self, job: Dict) -> str:
+        """Job text compared against user skills/interests in pair features"""
+        return f"{job.get('title', '')} {job.get('description', '')}"
+    
+    def extract_pair_features_batch(
+        self,
+        user: Dict,
+        jobs: List[Dict],
+        job_features: Optional[np.ndarray] = None,
+        job_text_embeddings: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        extract_pair_features for one user against many jobs, as a (n_jobs, d) matrix
+        
+        The user vector is built once and the interaction columns are computed
+        with array arithmetic. Precomputed job feature rows and similarity-text
+        embeddings (e.g. from an index) can be passed in to skip re-extraction.
+        """
+        n = len(jobs)
+        user_features = self.extract_user_features(user)
+        if job_features is None:
+            job_features = np.stack([self.extract_job_features(job) for job in jobs]) if n else None
+        if job_text_embeddings is None:
+            job_text_embeddings = np.stack([
+                self._get_text_embedding(self.job_similarity_text(job)) for job in jobs
+            ]) if n else None
+        if not n:
+            return np.zeros((0, len(user_features) + 4), dtype=np.float32)
+        
+        user_age = user.get("age", 30)
+        min_age = np.array([job.get("min_age") or np.nan for job in jobs], dtype=np.float64)
+        max_age = np.array([job.get("max_age") or np.nan for job in jobs], dtype=np.float64)
+        age_match = np.where((user_age < min_age) | (user_age > max_age), 0.0, 1.0)
+        
+        user_state = user.get("state")
+        state_match = np.array([
+            1.0 if not job.get("location") or job.get("location") == user_state else 0.5
+            for job in jobs
+        ])
+        
+        user_edu = self._encode_education(user.get("education"))
+        job_edu = np.array([self._encode_education(job.get("education_required")) for job in jobs])
+        edu_match = np.where(user_edu >= job_edu, 1.0, np.maximum(0, 1 - (job_edu - user_edu) / 3))
+        
+        user_text = " ".join(user.get("skills", []) + user.get("interests", []))
+        user_emb = self._get_text_embedding(user_text)
+        similarity = (job_text_embeddings @ user_emb) / (
+            np.linalg.norm(user_emb) * np.linalg.norm(job_text_embeddings, axis=1) + 1e-8
+        )
+        
+        interaction = np.column_stack([age_match, state_match, edu_match, similarity]).astype(np.float32)
+        user_block = np.broadcast_to(user_features, (n, len(user_features)))
+        return np.hstack([user_block, job_features.astype(np.float32), interaction])
+
+
+class FlatIndex:
+    """
+    Exact cosine-similarity index over a contiguous, pre-normalized float32 matrix
+    
+    Search is one matrix-vector product plus argpartition. Vectors are
+    added/replaced/removed by id in place (removal swaps in the last row),
+    so incremental updates never rebuild the matrix.
+    """
+    
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._matrix = np.zeros((0, dim), dtype=np.float32)  # Grows geometrically
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+    
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+    
+    @property
+    def vectors(self) -> np.ndarray:
+        """Normalized vectors, row-aligned with ids (a view, do not mutate)"""
+        return self._matrix[:len(self._ids)]
+    
+    @staticmethod
+    def normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-8)
+    
+    def _reserve(self, size: int):
+        if size > len(self._matrix):
+            grown = np.zeros((max(size, 2 * len(self._matrix), 64), self.dim), dtype=np.float32)
+            grown[:len(self._ids)] = self.vectors
+            self._matrix = grown
+    
+    def add(self, ids: List[str], vectors: np.ndarray, normalized: bool = False):
+        """Insert or replace vectors by id"""
+        if not len(ids):
+            return
+        vectors = vectors if normalized else self.normalize(vectors)
+        self._reserve(len(self._ids) + len(ids))
+        for item_id, vector in zip(ids, vectors):
+            row = self._rows.get(item_id)
+            if row is None:
+                row = self._rows[item_id] = len(self._ids)
+                self._ids.append(item_id)
+            self._matrix[row] = vector
+    
+    def remove(self, ids: List[str]) -> List[str]:
+        """Remove vectors by id, returning the ids that were present"""
+        removed = []
+        for item_id in ids:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                continue
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._ids.pop()
+            removed.append(item_id)
+        return removed
+    
+    def search(self, query: np.ndarray, top_k: int) -> List[Tuple[str, float]]:
+        """Top-k (id, cosine similarity) for a query vector"""
+        if not self._ids or top_k <= 0:
+            return []
+        scores = self.vectors @ self.normalize(query)[0]
+        return _top_k(self._ids, scores, top_k)
+
+
+def _top_k(ids: List[str], scores: np.ndarray, top_k: int) -> List[Tuple[str, float]]:
+    """Select the top_k scores with argpartition and return them sorted"""
+    if top_k < len(scores):
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    else:
+        candidates = np.arange(len(scores))
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [(ids[i], float(scores[i])) for i in order]
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index (pure NumPy)
+    
+    A spherical k-means coarse quantizer partitions the normalized vectors
+    into n_lists cells; queries scan only the n_probe closest cells.
+    Each cell keeps its vectors contiguous, and add/remove by id update a
+    single cell in place.
+    """
+    
+    def __init__(self, dim: int, n_lists: Optional[int] = None, n_probe: int = 16,
+                 n_iter: int = 10, seed: int = 42):
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._list_ids: List[List[str]] = []
+        self._where: Dict[str, Tuple[int, int]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._where)
+    
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+    
+    def _assign(self, vectors: np.ndarray, chunk: int = 16384) -> np.ndarray:
+        """Nearest centroid per vector, chunked to bound the score matrix size"""
+        out = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk):
+            out[start:start + chunk] = np.argmax(vectors[start:start + chunk] @ self.centroids.T, axis=1)
+        return out
+    
+    def train(self, vectors: np.ndarray, max_training_points: int = 65536):
+        """Fit the coarse quantizer on normalized vectors"""
+        rng = np.random.default_rng(self.seed)
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(vectors))))
+        n_lists = min(n_lists, len(vectors))
+        sample = vectors
+        if len(vectors) > max_training_points:
+            sample = vectors[rng.choice(len(vectors), max_training_points, replace=False)]
+        
+        self.centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            assignment = self._assign(sample)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=n_lists)
+            empty = counts == 0
+            if empty.any():
+                # Re-seed empty cells from random points
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            self.centroids = FlatIndex.normalize(sums)
+        
+        self._lists = [np.zeros((0, self.dim), dtype=np.float32) for _ in range(n_lists)]
+        self._list_ids = [[] for _ in range(n_lists)]
+        self._where = {}
+    
+    def add(self, ids: List[str], vectors: np.ndarray):
+        """Insert or replace normalized vectors by id (index must be trained)"""
+        if not len(ids):
+            return
+        self.remove([item_id for item_id in ids if item_id in self._where])
+        assignment = self._assign(vectors)
+        for cell in np.unique(assignment):
+            members = np.flatnonzero(assignment == cell)
+            size = len(self._list_ids[cell])
+            block = self._lists[cell]
+            if size + len(members) > len(block):
+                grown = np.zeros((max(size + len(members), 2 * len(block), 16), self.dim), dtype=np.float32)
+                grown[:size] = block[:size]
+                block = self._lists[cell] = grown
+            block[size:size + len(members)] = vectors[members]
+            for offset, member in enumerate(members):
+                self._where[ids[member]] = (int(cell), size + offset)
+                self._list_ids[cell].append(ids[member])
+    
+    def remove(self, ids: List[str]):
+        for item_id in ids:
+            location = self._where.pop(item_id, None)
+            if location is None:
+                continue
+            cell, pos = location
+            cell_ids = self._list_ids[cell]
+            last = len(cell_ids) - 1
+            if pos != last:
+                moved_id = cell_ids[last]
+                self._lists[cell][pos] = self._lists[cell][last]
+                cell_ids[pos] = moved_id
+                self._where[moved_id] = (cell, pos)
+            cell_ids.pop()
+    
+    def search(self, query: np.ndarray, top_k: int, n_probe: Optional[int] = None) -> List[Tuple[str, float]]:
+        if not self._where or top_k <= 0:
+            return []
+        query = FlatIndex.normalize(query)[0]
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        centroid_scores = self.centroids @ query
+        probes = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        
+        ids: List[str] = []
+        scores = []
+        for cell in probes:
+            size = len(self._list_ids[cell])
+            if size:
+                scores.append(self._lists[cell][:size] @ query)
+                ids.extend(self._list_ids[cell])
+        if not ids:
+            return []
+        return _top_k(ids, np.concatenate(scores), top_k)
 
 
 class TwoTowerRetriever:
     """
     Two-Tower Neural Retrieval Model
     Embeds users and jobs separately for fast candidate generation
+    
+    The tower projection is a model parameter saved in two_tower.pkl; it
+    is generated deterministically (seed 42) the first time it is needed.
+    Job embeddings live in a FlatIndex (exact search). Past ANN_THRESHOLD
+    postings an IVFIndex is built lazily and kept in sync incrementally;
+    it is retrained once the catalogue doubles in size.
     """
     
-    def __init__(self, embedding_dim: int = 64, model_path: Optional[str] = None):
+    ANN_THRESHOLD = 50_000
+    PROJECTION_SEED = 42
+    
+    def __init__(
+        self,
+        embedding_dim: int = 64,
+        model_path: Optional[str] = None,
+        use_ann: Optional[bool] = None,
+        n_probe: int = 16
+    ):
         self.embedding_dim = embedding_dim
         self.model_path = model_path
-        self.job_embeddings: Dict[str, np.ndarray] = {}
+        self.use_ann = use_ann  # None = automatic above ANN_THRESHOLD
+        self.n_probe = n_probe
+        self.projection: Optional[np.ndarray] = None  # (input_dim, embedding_dim)
+        self.index = FlatIndex(embedding_dim)
+        self.ann_index: Optional[IVFIndex] = None
+        self._ann_trained_size = 0
         self._load_model()
     
+    @property
+    def job_embeddings(self) -> Dict[str, np.ndarray]:
+        """Normalized job embeddings by job_id"""
+        return dict(zip(self.index.ids, self.index.vectors))
+    
     def _load_model(self):
         if self.model_path and os.path.exists(self.model_path):
             try:
                 with open(self.model_path, "rb") as f:
                     data = pickle.load(f)
-                    self.job_embeddings = data.get("job_embeddings", {})
+                if data.get("projection") is not None:
+                    self.projection = np.asarray(data["projection"], dtype=np.float64)
+                if "job_matrix" in data:
+                    self.index.add(data["job_ids"], data["job_matrix"], normalized=True)
+                else:
+                    # Legacy format: {"job_embeddings": {job_id: vector}}
+                    embeddings = data.get("job_embeddings", {})
+                    if embeddings:
+                        self.index.add(list(embeddings), np.stack(list(embeddings.values())))
                 logger.info("Loaded two-tower model")
             except Exception as e:
                 logger.warning(f"Could not load two-tower model: {e}")
     
+    def get_state(self) -> Dict[str, Any]:
+        """Picklable model state (see AdvancedJobRecommender.save)"""
+        return {
+            "job_ids": self.index.ids,
+            "job_matrix": self.index.vectors.copy(),
+            "projection": self.projection,
+        }
+    
+    def _get_projection(self, input_dim: int) -> np.ndarray:
+        """
+        Projection rows for an input_dim-sized feature vector
+        
+        Rows are drawn from a private RandomState(PROJECTION_SEED), so row i is
+        the same whatever input_dim is requested (user and job feature vectors
+        differ in length and share the leading rows). The global NumPy RNG is
+        left untouched.
+        """
+        if self.projection is None or len(self.projection) < input_dim:
+            rng = np.random.RandomState(self.PROJECTION_SEED)
+            projection = rng.randn(input_dim, self.embedding_dim) * 0.1
+            if self.projection is not None:
+                projection[:len(self.projection)] = self.projection  # Keep persisted rows
+            self.projection = projection
+        return self.projection[:input_dim]
+    
     def embed(self, features: np.ndarray) -> np.ndarray:
         """Project features to embedding space"""
-        np.random.seed(42)
-        proj = np.random.randn(len(features), self.embedding_dim) * 0.1
-        return np.tanh(features @ proj)
+        return np.tanh(features @ self._get_projection(len(features)))
+    
+    def embed_many(self, features_matrix: np.ndarray) -> np.ndarray:
+        """Project a (n, input_dim) feature matrix to embeddings in one GEMM"""
+        features_matrix = np.atleast_2d(features_matrix)
+        return np.tanh(features_matrix @ self._get_projection(features_matrix.shape[1]))
     
     def index_jobs(self, jobs: List[Tuple[str, np.ndarray]]):
-        """Index job embeddings for fast retrieval"""
-        for job_id, features in jobs:
-            self.job_embeddings[job_id] = self.embed(features)
+        """Index (or re-index) job embeddings; existing job_ids are replaced in place"""
+        if not jobs:
+            return
+        job_ids = [job_id for job_id, _ in jobs]
+        vectors = FlatIndex.normalize(self.embed_many(np.stack([features for _, features in jobs])))
+        self.index.add(job_ids, vectors, normalized=True)
+        if self.ann_index is not None and not self._ann_needs_rebuild():
+            self.ann_index.add(job_ids, vectors)
         logger.info(f"Indexed {len(jobs)} jobs for retrieval")
     
+    def remove_jobs(self, job_ids: List[str]) -> int:
+        """Drop jobs from the index (e.g. expired or deleted postings)"""
+        removed = self.index.remove(job_ids)
+        if self.ann_index is not None:
+            self.ann_index.remove(removed)
+        return len(removed)
+    
+    def _ann_enabled(self) -> bool:
+        if self.use_ann is None:
+            return len(self.index) >= self.ANN_THRESHOLD
+        return self.use_ann
+    
+    def _ann_needs_rebuild(self) -> bool:
+        return self.ann_index is None or len(self.index) >= 2 * self._ann_trained_size
+    
+    def _ensure_ann(self) -> Optional[IVFIndex]:
+        if not self._ann_enabled() or not len(self.index):
+            self.ann_index = None
+            return None
+        if self._ann_needs_rebuild():
+            ann = IVFIndex(self.embedding_dim, n_probe=self.n_probe)
+            ann.train(self.index.vectors)
+            ann.add(self.index.ids, self.index.vectors)
+            self.ann_index = ann
+            self._ann_trained_size = len(self.index)
+            logger.info(f"Built IVF index over {len(self.index)} jobs ({len(ann.centroids)} lists)")
+        return self.ann_index
+    
     def retrieve_candidates(self, user_embedding: np.ndarray, top_k: int = 100) -> List[Tuple[str, float]]:
-        """Retrieve top-k candidate jobs by similarity"""
-        if not self.job_embeddings:
+        """Retrieve top-k candidate jobs by cosine similarity"""
+        if not len(self.index):
             return []
-        similarities = []
-        for job_id, job_emb in self.job_embeddings.items():
-            sim = np.dot(user_embedding, job_emb) / (
-                np.linalg.norm(user_embedding) * np.linalg.norm(job_emb) + 1e-8
-            )
-            similarities.append((job_id, float(sim)))
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:top_k]
+        ann = self._ensure_ann()
+        if ann is not None:
+            return ann.search(user_embedding, top_k)
+        return self.index.search(user_embedding, top_k)
 
 
 class LambdaMARTRanker:
@@ -732,11 +1591,20 @@ class AdvancedJobRecommender:
     def __init__(
         self,
         models_dir: Optional[str] = None,
-        embedding_model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+        embedding_model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+        n_candidates: Optional[int] = None,
+        embedding_cache_dir: Optional[str] = None,
+        max_cached_jobs: int = 50000
     ):
         self.models_dir = Path(models_dir) if models_dir else None
+        # Retrieval depth for two-stage serving
+        self.n_candidates = n_candidates or int(os.environ.get("AI_RECOMMENDER_CANDIDATES", "200"))
         self.embedding_model = self._load_embedding_model(embedding_model_name)
-        self.feature_extractor = FeatureExtractor(self.embedding_model)
+        self.feature_extractor = FeatureExtractor(
+            self.embedding_model,
+            model_name=embedding_model_name,
+            cache_dir=embedding_cache_dir or os.environ.get("AI_EMBEDDING_CACHE_DIR") or None
+        )
         
         retriever_path = str(self.models_dir / "two_tower.pkl") if self.models_dir else None
         self.retriever = TwoTowerRetriever(model_path=retriever_path)
@@ -745,8 +1613,14 @@ class AdvancedJobRecommender:
         self.ranker = LambdaMARTRanker(model_path=ranker_path)
         
         self.jobs_cache: Dict[str, Dict] = {}
-        self.job_features_cache: Dict[str, np.ndarray] = {}
+        # (job features, similarity-text embedding) rows keyed by job content
+        # and date (days-left feature), LRU-bounded by max_cached_jobs
+        self.job_rows_cache: "OrderedDict[str, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self.max_cached_jobs = max_cached_jobs
         self.rule_based = JobRecommender()  # Fallback
+        self._indexed_catalog: Optional[EncodedJobCatalog] = None  # Rule-based view of jobs_cache
+        self.last_index_timings: Dict[str, float] = {}
+        self.catalogue_version = 0  # Bumped whenever the indexed catalogue changes
     
     def _load_embedding_model(self, model_name: str):
         try:
@@ -759,72 +1633,245 @@ class AdvancedJobRecommender:
             logger.warning(f"Could not load embedding model: {e}")
             return None
     
-    def index_jobs(self, jobs: List[Dict]):
-        """Index jobs for fast retrieval"""
+    @staticmethod
+    def _job_id(job: Dict) -> str:
+        return job.get("id", job.get("_id", str(hash(job.get("title", "")))))
+    
+    @staticmethod
+    def _job_row_key(job: Dict) -> str:
+        """Cache key of a job's feature rows: an edited posting or a new day misses"""
+        return f"{stable_digest(job)}:{datetime.now().date().isoformat()}"
+    
+    def _remember_job_row(self, key: str, features: np.ndarray, text_embedding: np.ndarray):
+        self.job_rows_cache[key] = (features, text_embedding)
+        self.job_rows_cache.move_to_end(key)
+        while len(self.job_rows_cache) > self.max_cached_jobs:
+            self.job_rows_cache.popitem(last=False)
+    
+    def index_jobs(
+        self,
+        jobs: List[Dict],
+        batch_size: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, float]:
+        """
+        Index jobs for fast retrieval (bulk path)
+        
+        Job texts are gathered up front and uncached ones encoded in batches
+        before the feature matrix is assembled and added to the retriever.
+        
+        Args:
+            jobs: Job/scheme postings (existing ids are re-indexed)
+            batch_size: Encoder batch size (default: feature_extractor.encode_batch_size)
+            workers: Thread pool size for the n-gram hashing fallback
+            
+        Returns:
+            Per-stage timings in seconds (text_prep, encode, assemble, index, total)
+        """
+        start = time.perf_counter()
+        timings: Dict[str, float] = {}
+        
+        job_features, text_embeddings = self.feature_extractor.extract_job_features_batch(
+            jobs, workers=workers, timings=timings, batch_size=batch_size
+        )
+        
+        index_start = time.perf_counter()
         job_features_list = []
-        for job in jobs:
-            job_id = job.get("id", job.get("_id", str(hash(job.get("title", "")))))
-            features = self.feature_extractor.extract_job_features(job)
+        for job, features, text_embedding in zip(jobs, job_features, text_embeddings):
+            job_id = self._job_id(job)
             self.jobs_cache[job_id] = job
-            self.job_features_cache[job_id] = features
+            self._remember_job_row(self._job_row_key(job), features, text_embedding)
             job_features_list.append((job_id, features))
         self.retriever.index_jobs(job_features_list)
+        self._indexed_catalog = None
+        self.catalogue_version += 1
+        timings["index"] = time.perf_counter() - index_start
+        timings["total"] = time.perf_counter() - start
+        
+        self.last_index_timings = {"n_jobs": len(jobs), **timings}
+        logger.info(
+            f"Indexed {len(jobs)} jobs in {timings['total']:.2f}s ("
+            + ", ".join(f"{stage} {timings[stage]:.2f}s" for stage in ("text_prep", "encode", "assemble", "index"))
+            + ")"
+        )
+        return timings
+    
+    def remove_jobs(self, job_ids: List[str]) -> int:
+        """Drop jobs from the indexed catalogue (expired or deleted postings)"""
+        for job_id in job_ids:
+            job = self.jobs_cache.pop(job_id, None)
+            if job is not None:
+                self.job_rows_cache.pop(self._job_row_key(job), None)
+        self._indexed_catalog = None
+        self.catalogue_version += 1
+        return self.retriever.remove_jobs(job_ids)
+    
+    def sync_jobs(self, jobs: List[Dict]) -> Dict[str, int]:
+        """
+        Make the indexed catalogue equal to jobs (e.g. the active jobs collection)
+        
+        Only new or edited jobs are (re-)indexed; indexed jobs missing from
+        jobs are removed.
+        
+        Returns:
+            {"indexed", "removed", "catalogue_size"}
+        """
+        current = {self._job_id(job): job for job in jobs}
+        removed = [job_id for job_id in self.jobs_cache if job_id not in current]
+        changed = [job for job_id, job in current.items() if self.jobs_cache.get(job_id) != job]
+        if removed:
+            self.remove_jobs(removed)
+        if changed:
+            self.index_jobs(changed)
+        return {"indexed": len(changed), "removed": len(removed), "catalogue_size": len(self.jobs_cache)}
+    
+    def indexed_catalog(self) -> EncodedJobCatalog:
+        """Columnar rule-based view of the indexed catalogue, rebuilt after index changes"""
+        if self._indexed_catalog is None:
+            self._indexed_catalog = EncodedJobCatalog.from_jobs(list(self.jobs_cache.values()))
+        return self._indexed_catalog
+    
+    def _cached_job_rows(self, jobs: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Stack cached (job features, similarity-text embedding) rows, bulk-extracting misses"""
+        keys = [self._job_row_key(job) for job in jobs]
+        rows: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        missing = {}
+        for key, job in zip(keys, jobs):
+            row = self.job_rows_cache.get(key)
+            if row is not None:
+                self.job_rows_cache.move_to_end(key)
+                rows[key] = row
+            else:
+                missing.setdefault(key, job)
+        if missing:
+            job_features, text_embeddings = self.feature_extractor.extract_job_features_batch(
+                list(missing.values())
+            )
+            for key, features, text_embedding in zip(missing, job_features, text_embeddings):
+                rows[key] = (features, text_embedding)
+                self._remember_job_row(key, features, text_embedding)
+        
+        feature_rows = [rows[key][0] for key in keys]
+        text_rows = [rows[key][1] for key in keys]
+        return np.stack(feature_rows), np.stack(text_rows)
     
     def get_recommendations(
         self,
         user_profile: Dict,
-        jobs: List[Dict],
+        jobs: Optional[List[Dict]] = None,
         top_k: int = 10,
         use_ml: bool = True
     ) -> List[Dict]:
         """
         Get ranked recommendations combining ML and rule-based approaches
         
+        Scoring is batched: one pair-feature matrix, one LambdaMART predict()
+        call and one vectorized rule-based pass over all jobs; reasons are
+        only built for the returned top_k.
+        
         Args:
             user_profile: User profile dictionary
-            jobs: List of job/scheme postings
+            jobs: List of job/scheme postings; None serves from the indexed
+                catalogue in two-stage mode (see recommend())
             top_k: Number of recommendations to return
             use_ml: Whether to use ML ranking (falls back to rules if unavailable)
         """
+        if jobs is None:
+            return self.recommend(user_profile, top_k=top_k, use_ml=use_ml)
+        
         if not use_ml or self.ranker.model is None:
             # Fall back to rule-based recommendations
             return self.rule_based.get_recommendations(user_profile, jobs, top_k)
         
+        if not jobs:
+            return []
+        
         # Index jobs if not already cached
         if not self.jobs_cache:
             self.index_jobs(jobs)
         
+        return self._rank_jobs(user_profile, jobs, top_k)
+    
+    def recommend(
+        self,
+        user_profile: Dict,
+        top_k: int = 10,
+        n_candidates: Optional[int] = None,
+        use_ml: bool = True
+    ) -> List[Dict]:
+        """
+        Two-stage serving against the indexed catalogue
+        
+        Stage 1 retrieves the n_candidates nearest jobs from the Two-Tower
+        index; stage 2 runs pair features + LambdaMART on those candidates
+        only. Without a trained ranker the whole indexed catalogue is scored
+        by the (columnar) rule-based recommender instead.
+        
+        Args:
+            user_profile: User profile dictionary
+            top_k: Number of recommendations to return
+            n_candidates: Retrieval depth (defaults to self.n_candidates)
+            use_ml: Whether to use ML ranking (falls back to rules if unavailable)
+        """
+        if not self.jobs_cache:
+            return []
+        
+        if not use_ml or self.ranker.model is None:
+            return self.rule_based.get_recommendations(user_profile, self.indexed_catalog(), top_k)
+        
+        user_embedding = self.retriever.embed(self.feature_extractor.extract_user_features(user_profile))
+        candidates = self.retriever.retrieve_candidates(
+            user_embedding, max(n_candidates or self.n_candidates, top_k)
+        )
+        retrieval_scores = dict(candidates)
+        jobs = [self.jobs_cache[job_id] for job_id, _ in candidates if job_id in self.jobs_cache]
+        if not jobs:
+            return []
+        
+        recommendations = self._rank_jobs(user_profile, jobs, top_k)
+        for rec in recommendations:
+            rec["retrieval_score"] = round(float(retrieval_scores.get(rec["job_id"], 0.0)), 3)
+        return recommendations
+    
+    def _rank_jobs(self, user_profile: Dict, jobs: List[Dict], top_k: int) -> List[Dict]:
+        """Batched ML + rule-based re-ranking of a job list"""
+        # ML scores: one booster call over the whole pair-feature matrix
+        job_features, job_text_embeddings = self._cached_job_rows(jobs)
+        pair_features = self.feature_extractor.extract_pair_features_batch(
+            user_profile, jobs, job_features, job_text_embeddings
+        )
+        ml_scores = np.asarray(self.ranker.predict(pair_features), dtype=np.float64).reshape(-1)
+        
+        # Rule-based scores: one vectorized pass (unscorable jobs count as 0.5)
+        catalog = EncodedJobCatalog.from_jobs(jobs)
+        rule_scores = self.rule_based.score_catalog(user_profile, catalog)
+        rule_rounded = np.array([round(t, 3) for t in rule_scores.total.tolist()])
+        rule_rounded = np.where(rule_scores.valid, rule_rounded, 0.5)
+        
+        # Combine scores (70% ML, 30% rule-based for interpretability)
+        combined = 0.7 * ml_scores + 0.3 * rule_rounded
+        
         recommendations = []
-        for job in jobs:
-            job_id = job.get("id", job.get("_id", str(hash(job.get("title", "")))))
-            
-            # Get pair features
-            pair_features = self.feature_extractor.extract_pair_features(user_profile, job)
-            
-            # Get ML score
-            ml_score = float(self.ranker.predict(pair_features.reshape(1, -1))[0])
-            
-            # Get rule-based score for reasoning
-            rule_rec = self.rule_based.get_recommendations(user_profile, [job], 1)
-            rule_score = rule_rec[0]["score"] if rule_rec else 0.5
-            reasons = rule_rec[0]["reasons"] if rule_rec else {"en": [], "hi": []}
-            
-            # Combine scores (70% ML, 30% rule-based for interpretability)
-            combined_score = 0.7 * ml_score + 0.3 * rule_score
-            
+        for row in _rank_rounded(np.arange(len(jobs)), combined, top_k):
+            job = jobs[row]
+            reasons = {"en": [], "hi": []}
+            if rule_scores.valid[row]:
+                reasons = self.rule_based.catalog_recommendation(
+                    user_profile, catalog, rule_scores, row
+                )["reasons"]
+            combined_score = float(combined[row])
             recommendations.append({
-                "job_id": job_id,
+                "job_id": self._job_id(job),
                 "job_title": job.get("title"),
                 "company": job.get("company"),
                 "score": round(combined_score, 3),
-                "ml_score": round(ml_score, 3),
-                "rule_score": round(rule_score, 3),
+                "ml_score": round(float(ml_scores[row]), 3),
+                "rule_score": round(float(rule_rounded[row]), 3),
                 "confidence": "high" if combined_score > 0.7 else "medium" if combined_score > 0.4 else "low",
                 "reasons": reasons,
             })
         
-        recommendations.sort(key=lambda x: x["score"], reverse=True)
-        return recommendations[:top_k]
+        return recommendations
     
     def train(self, users: List[Dict], jobs: List[Dict], interactions: List[Dict]):
         """Train the ML models from interaction data"""
@@ -877,7 +1924,21 @@ class AdvancedJobRecommender:
         output_path.mkdir(parents=True, exist_ok=True)
         self.ranker.save(str(output_path / "lambdamart.txt"))
         with open(output_path / "two_tower.pkl", "wb") as f:
-            pickle.dump({"job_embeddings": self.retriever.job_embeddings}, f)
+            pickle.dump(self.retriever.get_state(), f)
+
+
+def get_advanced_recommender(models_dir: Optional[str] = None) -> AdvancedJobRecommender:
+    """
+    The process-wide AdvancedJobRecommender (models_dir defaults to AI_MODELS_DIR)
+    
+    Always uses the same registry key as preload_models, and pins the entry:
+    the indexed catalogue lives on this instance, so unloading it under the
+    memory budget would silently empty the catalogue.
+    """
+    models_dir = models_dir or os.environ.get("AI_MODELS_DIR") or None
+    recommender = get_model("job_recommender", models_dir)
+    get_model_registry().pin("job_recommender", models_dir)
+    return recommender
 
 
 # Convenience function for API integration
@@ -896,13 +1957,13 @@ def get_recommendations(
         job_list: List of job posting dictionaries
         top_k: Number of recommendations
         use_advanced: Use ML-based recommendations (requires trained models)
-        models_dir: Directory with trained models
+        models_dir: Directory with trained models (default: AI_MODELS_DIR)
         
     Returns:
         List of recommendation dictionaries with scores and explanations
     """
     if use_advanced:
-        recommender = AdvancedJobRecommender(models_dir=models_dir)
+        recommender = get_advanced_recommender(models_dir)
         return recommender.get_recommendations(user_profile, job_list, top_k)
     else:
         recommender = JobRecommender()
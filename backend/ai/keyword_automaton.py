@@ -0,0 +1,94 @@
+"""
+Keyword Automaton (Aho-Corasick)
+Finds every occurrence of many keywords/phrases in one pass over a text
+
+Used by the rule-based classifiers instead of one substring scan per
+keyword. Matching is exact and case-sensitive: normalize the text and the
+patterns the same way before building/searching. Works for any script
+(Devanagari, Latin, mixed Hinglish) since transitions are per character.
+
+Usage:
+    automaton = KeywordAutomaton(["job", "jobs", "naukri"])
+    automaton.find_all("new jobs")  # {0, 1}
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed list of patterns
+
+    Pattern ids are positions in the input list; duplicate patterns share
+    one trie node and both ids are reported.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._build()
+
+    def _build(self):
+        # Trie
+        node_patterns: Dict[int, List[int]] = {}
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            node_patterns.setdefault(node, []).append(pattern_id)
+        for node, ids in node_patterns.items():
+            self._out[node] = tuple(ids)
+
+        # Failure links (BFS); outputs are merged along the failure chain
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                if self._out[self._fail[child]]:
+                    self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end_index, pattern_id) for every occurrence (end exclusive)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                for pattern_id in out[node]:
+                    yield i + 1, pattern_id
+
+    def find_all(self, text: str) -> Set[int]:
+        """Ids of all patterns that occur in text (at least once)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
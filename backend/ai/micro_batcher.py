@@ -0,0 +1,231 @@
+"""
+Dynamic Micro-Batching
+Coalesces concurrent single-item inference requests into batched calls
+
+Callers submit one item at a time (from asyncio handlers or threads); a
+dedicated worker thread collects requests for up to ``max_wait_ms`` after
+the first one arrives or until ``max_batch_size`` items are queued, runs
+one batched call and resolves every caller's future with its own result.
+The event loop never blocks on inference, and a CPU model pays its
+per-call overhead once per batch instead of once per request.
+
+Usage:
+    batcher = MicroBatcher(model.predict_batch, max_batch_size=32, max_wait_ms=5)
+    result = await batcher.submit(text)
+    batcher.get_stats()  # batch size / queue wait / inference / latency histograms
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+_STOP = object()
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (thread-safe)
+
+    Each bucket counts observations <= its upper bound; larger values go to
+    the overflow bucket reported as "+Inf".
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = q * self.count
+            seen = 0
+            for bound, n in zip(self.buckets, self.counts):
+                seen += n
+                if seen >= rank:
+                    return float(bound)
+            return self.max
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            counts = dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts))
+            count, total, maximum = self.count, self.total, self.max
+        return {
+            "count": count,
+            "mean": round(total / count, 3) if count else 0.0,
+            "max": round(maximum, 3),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": counts,
+        }
+
+
+class MicroBatcher:
+    """
+    Queue + worker thread that runs ``batch_fn`` on coalesced requests
+
+    Args:
+        batch_fn: Callable taking a list of items and returning a list of
+            results in the same order (e.g. a model's predict_batch)
+        max_batch_size: Flush as soon as this many items are queued
+        max_wait_ms: Longest time the first item of a batch waits for company
+        name: Worker thread name (for logs/stack dumps)
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batcher"
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.inference_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.stats = {"requests": 0, "batches": 0, "errors": 0}
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit_future(self, item: Any) -> Future:
+        """Queue one item; the returned Future resolves to its result"""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            self.stats["requests"] += 1
+            self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    async def submit(self, item: Any) -> Any:
+        """Await the result for one item (does not block the event loop)"""
+        return await asyncio.wrap_future(self.submit_future(item))
+
+    def predict(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Blocking submit for thread-pool callers"""
+        return self.submit_future(item).result(timeout)
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _collect(self, first: Tuple) -> Tuple[List[Tuple], bool]:
+        """Gather requests following ``first`` until the batch is full or the wait expires"""
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stopping = self._collect(first)
+            # Skip requests whose callers already gave up
+            batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+            if batch:
+                self._run_batch(batch)
+
+    def _run_batch(self, batch: List[Tuple]):
+        started = time.perf_counter()
+        for _, _, enqueued_at in batch:
+            self.queue_wait_ms.observe((started - enqueued_at) * 1000)
+        try:
+            results = list(self.batch_fn([item for item, _, _ in batch]))
+            if len(results) != len(batch):
+                raise ValueError(f"batch_fn returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            logger.warning(f"{self.name}: batch of {len(batch)} failed: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        finished = time.perf_counter()
+        self.inference_ms.observe((finished - started) * 1000)
+        self.batch_sizes.observe(len(batch))
+        with self._lock:
+            self.stats["batches"] += 1
+        for (_, future, enqueued_at), result in zip(batch, results):
+            self.latency_ms.observe((finished - enqueued_at) * 1000)
+            future.set_result(result)
+
+    # ------------------------------------------------------------------
+    # Lifecycle / stats
+    # ------------------------------------------------------------------
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop accepting requests, finish queued ones and stop the worker"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+        return {
+            **stats,
+            "pending": self.pending,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batch_size": self.batch_sizes.to_dict(),
+            "queue_wait_ms": self.queue_wait_ms.to_dict(),
+            "inference_ms": self.inference_ms.to_dict(),
+            "latency_ms": self.latency_ms.to_dict(),
+        }
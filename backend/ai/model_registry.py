@@ -0,0 +1,410 @@
+"""
+AI Model Registry
+Process-wide cache of loaded ML pipelines so each model is built once per process
+
+Features:
+1. Lazy Loading: Models are constructed (and warmed up) on first use
+2. Preload: Explicit warm-up at startup (AI_PRELOAD_MODELS)
+3. Memory Accounting: Estimated size per loaded model
+4. LRU Unloading: Least recently used models are dropped when the
+   RAM budget (AI_MODEL_MEMORY_BUDGET_MB) is exceeded
+
+Models are keyed by (name, models_dir, constructor kwargs). Built-in names:
+job_recommender, intent_classifier, field_classifier, summarizer,
+document_validator. Other models can be added with register().
+
+Usage:
+    from backend.ai.model_registry import get_model
+
+    classifier = get_model("intent_classifier", models_dir="models/")
+"""
+
+import gc
+import importlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# name -> (module in this package, class); imported lazily to avoid import cycles
+BUILTIN_MODELS: Dict[str, Tuple[str, str]] = {
+    "job_recommender": ("job_recommender", "AdvancedJobRecommender"),
+    "intent_classifier": ("intent_classifier", "AdvancedIntentClassifier"),
+    "field_classifier": ("field_classifier", "AdvancedFieldClassifier"),
+    "summarizer": ("summarizer", "AdvancedSummarizer"),
+    "document_validator": ("validator", "AdvancedDocumentValidator"),
+}
+
+# Cheap inferences that initialise tokenizers / kernels right after loading
+BUILTIN_WARMUPS: Dict[str, Callable[[Any], Any]] = {
+    "intent_classifier": lambda model: model.predict_intent("hello"),
+    "field_classifier": lambda model: model.classify_field("Full Name"),
+}
+
+ModelKey = Tuple[str, Optional[str], Tuple[Tuple[str, Hashable], ...]]
+
+
+def _current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (None if unavailable)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+def estimate_model_bytes(obj: Any, max_depth: int = 4) -> int:
+    """
+    Estimate memory held by a model object
+
+    Sums torch module parameters/buffers and numpy arrays reachable from
+    the object's attributes (bounded depth, shared objects counted once).
+    """
+    seen = set()
+
+    def walk(value: Any, depth: int) -> int:
+        if value is None or id(value) in seen or depth > max_depth:
+            return 0
+        seen.add(id(value))
+
+        # torch.nn.Module
+        if callable(getattr(value, "parameters", None)) and callable(getattr(value, "buffers", None)):
+            try:
+                tensors = list(value.parameters()) + list(value.buffers())
+                return sum(t.numel() * t.element_size() for t in tensors)
+            except Exception:
+                return 0
+        # numpy arrays (and memmaps)
+        nbytes = getattr(value, "nbytes", None)
+        if isinstance(nbytes, int) and hasattr(value, "dtype"):
+            return nbytes
+        if isinstance(value, (str, bytes, int, float, bool)):
+            return 0
+        if isinstance(value, dict):
+            return sum(walk(v, depth + 1) for v in value.values())
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return sum(walk(v, depth + 1) for v in value)
+        attrs = getattr(value, "__dict__", None)
+        if attrs is not None and not isinstance(value, type):
+            return sum(walk(v, depth + 1) for v in attrs.values())
+        return 0
+
+    return walk(obj, 0)
+
+
+@dataclass
+class LoadedModel:
+    """A model instance held by the registry"""
+    key: ModelKey
+    model: Any
+    size_bytes: int
+    estimated_bytes: int
+    rss_delta_bytes: Optional[int]
+    load_seconds: float
+    loaded_at: float
+    last_used: float
+    hits: int = 0
+    pinned: bool = False
+
+    def to_dict(self) -> Dict:
+        name, models_dir, kwargs = self.key
+        return {
+            "name": name,
+            "models_dir": models_dir,
+            "kwargs": dict(kwargs),
+            "size_mb": round(self.size_bytes / 2**20, 1),
+            "load_seconds": round(self.load_seconds, 3),
+            "hits": self.hits,
+            "pinned": self.pinned,
+            "idle_seconds": round(time.time() - self.last_used, 1),
+        }
+
+
+class ModelRegistry:
+    """
+    Thread-safe, process-wide registry of loaded models
+
+    Each (name, models_dir, kwargs) combination is loaded once; concurrent
+    first requests for the same key wait for a single load. When the total
+    accounted size exceeds memory_budget_mb, least recently used unpinned
+    models are unloaded.
+    """
+
+    def __init__(self, memory_budget_mb: Optional[float] = None):
+        self.memory_budget_bytes = int(memory_budget_mb * 2**20) if memory_budget_mb else None
+        self._factories: Dict[str, Callable[..., Any]] = {}
+        self._warmups: Dict[str, Callable[[Any], Any]] = {}
+        self._models: "OrderedDict[ModelKey, LoadedModel]" = OrderedDict()
+        self._key_locks: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.RLock()
+        self.stats_counters = {"hits": 0, "loads": 0, "evictions": 0, "load_errors": 0}
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[..., Any],
+        warmup: Optional[Callable[[Any], Any]] = None
+    ):
+        """
+        Register a model factory
+
+        Args:
+            name: Registry name
+            factory: Callable(models_dir=..., **kwargs) returning the model
+            warmup: Optional callable run once on the freshly loaded model
+        """
+        with self._lock:
+            self._factories[name] = factory
+            if warmup is not None:
+                self._warmups[name] = warmup
+
+    def _resolve_factory(self, name: str) -> Callable[..., Any]:
+        with self._lock:
+            factory = self._factories.get(name)
+        if factory is not None:
+            return factory
+        if name not in BUILTIN_MODELS:
+            raise KeyError(f"Unknown model: {name}")
+        module_name, class_name = BUILTIN_MODELS[name]
+        module = importlib.import_module(f".{module_name}", __package__)
+        factory = getattr(module, class_name)
+        self.register(name, factory, BUILTIN_WARMUPS.get(name))
+        return factory
+
+    @staticmethod
+    def make_key(name: str, models_dir: Optional[str] = None, **kwargs) -> ModelKey:
+        resolved_dir = str(Path(models_dir).resolve()) if models_dir else None
+        return (name, resolved_dir, tuple(sorted(kwargs.items())))
+
+    def get(self, name: str, models_dir: Optional[str] = None, **kwargs) -> Any:
+        """
+        Get a loaded model, loading it on first use
+
+        Args:
+            name: Registered or built-in model name
+            models_dir: Directory with trained models (part of the cache key)
+            **kwargs: Extra constructor arguments (part of the cache key)
+        """
+        key = self.make_key(name, models_dir, **kwargs)
+
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                return self._touch(entry)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    return self._touch(entry)
+            entry = self._load(key, models_dir, kwargs)
+            with self._lock:
+                self._models[key] = entry
+                self._key_locks.pop(key, None)
+                self._enforce_budget(keep=key)
+        return entry.model
+
+    def _touch(self, entry: LoadedModel) -> Any:
+        entry.hits += 1
+        entry.last_used = time.time()
+        self._models.move_to_end(entry.key)
+        self.stats_counters["hits"] += 1
+        return entry.model
+
+    def _load(self, key: ModelKey, models_dir: Optional[str], kwargs: Dict) -> LoadedModel:
+        name = key[0]
+        factory = self._resolve_factory(name)
+
+        rss_before = _current_rss()
+        start = time.perf_counter()
+        try:
+            model = factory(models_dir=models_dir, **kwargs)
+            warmup = self._warmups.get(name)
+            if warmup is not None:
+                try:
+                    warmup(model)
+                except Exception as e:
+                    logger.warning(f"Warm-up failed for model {name}: {e}")
+        except Exception:
+            self.stats_counters["load_errors"] += 1
+            raise
+        load_seconds = time.perf_counter() - start
+        rss_after = _current_rss()
+
+        # RSS delta also catches native allocations (LightGBM, OCR engines) but
+        # includes other threads' growth, so the larger of the two is accounted
+        rss_delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+        estimated = estimate_model_bytes(model)
+        size_bytes = max(estimated, rss_delta or 0)
+
+        self.stats_counters["loads"] += 1
+        logger.info(
+            f"Loaded model {name} (models_dir={key[1]}) in {load_seconds:.2f}s, "
+            f"~{size_bytes / 2**20:.1f} MB"
+        )
+        now = time.time()
+        return LoadedModel(
+            key=key,
+            model=model,
+            size_bytes=size_bytes,
+            estimated_bytes=estimated,
+            rss_delta_bytes=rss_delta,
+            load_seconds=load_seconds,
+            loaded_at=now,
+            last_used=now,
+        )
+
+    def _enforce_budget(self, keep: Optional[ModelKey] = None):
+        """Unload LRU models until the accounted total fits the budget"""
+        if self.memory_budget_bytes is None:
+            return
+        evicted = False
+        for key in list(self._models.keys()):
+            if self.total_bytes() <= self.memory_budget_bytes:
+                break
+            entry = self._models[key]
+            if key == keep or entry.pinned:
+                continue
+            del self._models[key]
+            self.stats_counters["evictions"] += 1
+            evicted = True
+            logger.info(f"Unloaded model {key[0]} (models_dir={key[1]}) to stay within memory budget")
+        if self.total_bytes() > self.memory_budget_bytes:
+            logger.warning(
+                f"Loaded models use {self.total_bytes() / 2**20:.1f} MB, "
+                f"over the {self.memory_budget_bytes / 2**20:.1f} MB budget"
+            )
+        if evicted:
+            gc.collect()
+
+    def preload(
+        self,
+        names: Optional[List[str]] = None,
+        models_dir: Optional[str] = None,
+        pin: bool = False
+    ) -> Dict[str, bool]:
+        """
+        Load models ahead of the first request
+
+        Args:
+            names: Models to load (default: all built-in models)
+            models_dir: Directory with trained models
+            pin: Exempt the preloaded models from LRU unloading
+
+        Returns:
+            Mapping of model name to whether it loaded
+        """
+        results = {}
+        for name in names or list(BUILTIN_MODELS):
+            try:
+                self.get(name, models_dir)
+                if pin:
+                    with self._lock:
+                        self._models[self.make_key(name, models_dir)].pinned = True
+                results[name] = True
+            except Exception as e:
+                logger.error(f"Could not preload model {name}: {e}")
+                results[name] = False
+        return results
+
+    def pin(self, name: str, models_dir: Optional[str] = None, pinned: bool = True, **kwargs) -> bool:
+        """Exempt a loaded model from (or return it to) LRU unloading; False if not loaded"""
+        with self._lock:
+            entry = self._models.get(self.make_key(name, models_dir, **kwargs))
+            if entry is None:
+                return False
+            entry.pinned = pinned
+            return True
+
+    def unload(self, name: str, models_dir: Optional[str] = None, **kwargs) -> bool:
+        """Drop a loaded model; returns False if it was not loaded"""
+        with self._lock:
+            entry = self._models.pop(self.make_key(name, models_dir, **kwargs), None)
+        if entry is None:
+            return False
+        del entry
+        gc.collect()
+        return True
+
+    def clear(self):
+        """Unload every model"""
+        with self._lock:
+            self._models.clear()
+        gc.collect()
+
+    def is_loaded(self, name: str, models_dir: Optional[str] = None, **kwargs) -> bool:
+        with self._lock:
+            return self.make_key(name, models_dir, **kwargs) in self._models
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._models.values())
+
+    def memory_usage(self) -> List[Dict]:
+        """Per-model memory accounting, least recently used first"""
+        with self._lock:
+            return [entry.to_dict() for entry in self._models.values()]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self.stats_counters,
+                "loaded": len(self._models),
+                "total_mb": round(self.total_bytes() / 2**20, 1),
+                "budget_mb": (
+                    round(self.memory_budget_bytes / 2**20, 1)
+                    if self.memory_budget_bytes is not None else None
+                ),
+            }
+
+
+# Global registry instance
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry (budget from AI_MODEL_MEMORY_BUDGET_MB)"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                budget = os.environ.get("AI_MODEL_MEMORY_BUDGET_MB")
+                _registry = ModelRegistry(memory_budget_mb=float(budget) if budget else None)
+    return _registry
+
+
+def get_model(name: str, models_dir: Optional[str] = None, **kwargs) -> Any:
+    """Get a model from the process-wide registry"""
+    return get_model_registry().get(name, models_dir, **kwargs)
+
+
+def preload_models(
+    names: Optional[List[str]] = None,
+    models_dir: Optional[str] = None,
+    pin: bool = False
+) -> Dict[str, bool]:
+    """
+    Preload models into the process-wide registry
+
+    Defaults come from AI_PRELOAD_MODELS (comma separated names) and
+    AI_MODELS_DIR; nothing is loaded when neither names nor the env var is set.
+    """
+    if names is None:
+        names = [n.strip() for n in os.environ.get("AI_PRELOAD_MODELS", "").split(",") if n.strip()]
+        if not names:
+            return {}
+    models_dir = models_dir or os.environ.get("AI_MODELS_DIR") or None
+    return get_model_registry().preload(names, models_dir, pin=pin)
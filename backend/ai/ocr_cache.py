@@ -0,0 +1,266 @@
+"""
+Content-Addressed OCR Cache
+Reuses OCR output for images that have been read before
+
+Keys are SHA-256 digests of the image bytes plus the OCR engine, its
+language setting, the engine version and the kind of output (plain text or
+structured blocks), so a renamed or re-uploaded file hits and an engine
+upgrade or language change misses. Only non-empty results are stored: an
+empty result may come from a transient engine failure.
+
+Layout (when a cache directory is configured):
+    <cache_dir>/<key[:2]>/<key>.json   {"identity", "result", "created_at"}
+
+Lookups go through a bounded in-memory LRU first, then the disk store.
+Both tiers are bounded by size (bytes of serialized results); the disk
+store drops its least recently used files (by mtime, refreshed on every
+hit) once it grows past max_disk_bytes. Files are written atomically, so
+several workers can share one directory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(image_path: Any) -> Optional[str]:
+    """SHA-256 of a file's bytes (None if it cannot be read)"""
+    digest = hashlib.sha256()
+    try:
+        with open(image_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except (OSError, TypeError, ValueError):
+        return None
+    return digest.hexdigest()
+
+
+def ocr_cache_key(image_hash: str, identity: Sequence[str]) -> str:
+    """Cache key of an image's OCR output under an engine identity"""
+    digest = hashlib.sha256(image_hash.encode("ascii"))
+    for part in identity:
+        digest.update(b"\0")
+        digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """
+    Two-level (LRU + disk) cache of OCR results
+
+    Args:
+        cache_dir: Directory for the persistent store; None keeps the
+            cache in memory only
+        max_memory_bytes: Bound on the in-memory LRU
+        max_disk_bytes: Bound on the disk store
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_memory_bytes: int = 64 * 2**20,
+        max_disk_bytes: int = 1024 * 2**20
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._lru: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+        self.stats = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0,
+            "memory_evictions": 0, "disk_evictions": 0,
+        }
+
+        self.store_dir: Optional[Path] = None
+        self._disk_bytes = 0
+        if cache_dir:
+            try:
+                self.store_dir = Path(cache_dir)
+                self.store_dir.mkdir(parents=True, exist_ok=True)
+                self._disk_bytes = sum(size for _, _, size in self._scan_store())
+            except OSError as e:
+                logger.warning(f"OCR cache at {cache_dir} unavailable, using memory only: {e}")
+                self.store_dir = None
+
+    # ------------------------------------------------------------------
+    # Disk store
+    # ------------------------------------------------------------------
+
+    def _entry_path(self, key: str) -> Path:
+        return self.store_dir / key[:2] / f"{key}.json"
+
+    def _scan_store(self):
+        """(path, mtime, size) of every stored entry"""
+        entries = []
+        for shard in os.scandir(self.store_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue  # Evicted by another worker
+                    entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _disk_get(self, key: str) -> Optional[Any]:
+        path = self._entry_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                result = json.load(f)["result"]
+            os.utime(path)  # Recency for eviction
+            return result
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable OCR cache entry {path}: {e}")
+            return None
+
+    def _disk_put(self, key: str, identity: Sequence[str], payload: str):
+        path = self._entry_path(key)
+        if path.exists():
+            return  # Written by another worker (same key, same content)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(f'{{"identity": {json.dumps(list(identity))}, '
+                        f'"created_at": {time.time()}, "result": {payload}}}')
+            os.replace(tmp_path, path)
+            self._disk_bytes += path.stat().st_size
+        except OSError as e:
+            logger.warning(f"Could not write OCR cache entry {path}: {e}")
+            return
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Drop least recently used files down to 90% of max_disk_bytes"""
+        entries = sorted(self._scan_store(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        target = int(self.max_disk_bytes * 0.9)
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.stats["disk_evictions"] += 1
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: str, result: Any, size: int):
+        if key in self._lru:
+            self._memory_bytes -= self._lru.pop(key)[1]
+        if size > self.max_memory_bytes:
+            return
+        self._lru[key] = (result, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted_size) = self._lru.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self.stats["memory_evictions"] += 1
+
+    def get(self, key: Optional[str]) -> Optional[Any]:
+        """Cached OCR result for key, or None"""
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                self._lru.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return entry[0]
+            if self.store_dir is not None:
+                result = self._disk_get(key)
+                if result is not None:
+                    self._remember(key, result, len(json.dumps(result, ensure_ascii=False)))
+                    self.stats["disk_hits"] += 1
+                    return result
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: Optional[str], result: Any, identity: Sequence[str] = ()):
+        """Store an OCR result (plain text or {"text", "blocks"}); empty results are skipped"""
+        text = result if isinstance(result, str) else (result or {}).get("text")
+        if key is None or not text:
+            return
+        payload = json.dumps(result, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, result, len(payload))
+            self.stats["stores"] += 1
+            if self.store_dir is not None:
+                self._disk_put(key, identity, payload)
+
+    def lookup(self, image_path: Any, identity: Sequence[str]) -> Tuple[Optional[str], Optional[Any]]:
+        """
+        Key and cached result for an image file under an engine identity
+
+        Returns:
+            (key, result); key is None if the file cannot be read, result
+            is None on a miss
+        """
+        image_hash = content_hash(image_path)
+        if image_hash is None:
+            return None, None
+        key = ocr_cache_key(image_hash, identity)
+        return key, self.get(key)
+
+    def clear(self):
+        """Drop all cached results (memory and disk)"""
+        with self._lock:
+            self._lru.clear()
+            self._memory_bytes = 0
+            if self.store_dir is not None:
+                for path, _, _ in self._scan_store():
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                self._disk_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            lookups = hits + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._lru),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes if self.store_dir is not None else None,
+                "persistent": self.store_dir is not None,
+            }
+
+
+# Global cache instance
+_ocr_cache: Optional[OCRCache] = None
+
+
+def get_ocr_cache() -> OCRCache:
+    """Get the process-wide OCR cache (AI_OCR_CACHE_DIR / _MEMORY_MB / _DISK_MB)"""
+    global _ocr_cache
+    if _ocr_cache is None:
+        _ocr_cache = OCRCache(
+            cache_dir=os.environ.get("AI_OCR_CACHE_DIR") or None,
+            max_memory_bytes=int(float(os.environ.get("AI_OCR_CACHE_MEMORY_MB", "64")) * 2**20),
+            max_disk_bytes=int(float(os.environ.get("AI_OCR_CACHE_DISK_MB", "1024")) * 2**20),
+        )
+    return _ocr_cache
@@ -0,0 +1,243 @@
+"""
+Quantized CPU Inference
+Int8 export/load for the transformer models served on CPU-only nodes
+
+Dynamic int8 quantization replaces every nn.Linear with an int8 kernel
+(weights quantized once, activations per batch). For BERT/DistilBERT/T5
+that is nearly all of the compute and parameters, so CPU latency and
+resident memory drop substantially with small output drift.
+
+Layout (next to the full-precision model directory):
+    <models_dir>/<model>_int8/config.json         transformers config
+    <models_dir>/<model>_int8/tokenizer files     copied from the source model
+    <models_dir>/<model>_int8/model_int8.pt       quantized state_dict
+    <models_dir>/<model>_int8/quantization.json   format, source, torch version
+
+Loading builds the architecture from config.json without weights, applies
+the same quantization and loads the int8 state_dict, so no fp32 weights are
+ever read. Models look for the artifact at start-up and fall back to the
+PyTorch model when it is missing, unreadable, or AI_USE_QUANTIZED=0.
+
+Usage:
+    from backend.ai.quantization import export_quantized_models
+    export_quantized_models("models/")  # then restart: models pick up *_int8/
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_FORMAT = "dynamic-int8"
+QUANTIZED_SUFFIX = "_int8"
+WEIGHTS_FILE = "model_int8.pt"
+META_FILE = "quantization.json"
+
+
+def quantized_dir(model_path: Optional[str]) -> Optional[Path]:
+    """Artifact directory for a full-precision model directory (None without one)"""
+    if not model_path:
+        return None
+    path = Path(model_path)
+    return path.with_name(path.name + QUANTIZED_SUFFIX)
+
+
+def use_quantized_default() -> bool:
+    """Whether models load int8 artifacts when present (AI_USE_QUANTIZED, default on)"""
+    return os.environ.get("AI_USE_QUANTIZED", "1").lower() not in ("0", "false", "no")
+
+
+def quantize_dynamic_int8(model: Any) -> Any:
+    """Int8 dynamic quantization of all nn.Linear layers (CPU inference only)"""
+    import torch
+
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def export_quantized(model: Any, tokenizer: Any, output_dir: str, source: str = "") -> Path:
+    """
+    Quantize a loaded transformers model and write the int8 artifact
+
+    Args:
+        model: Full-precision transformers model (left unchanged)
+        tokenizer: Matching tokenizer (saved alongside)
+        output_dir: Artifact directory (see quantized_dir)
+        source: Name/path of the source model, recorded in the metadata
+
+    Returns:
+        Path of the artifact directory
+    """
+    import copy
+    import torch
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    quantized = quantize_dynamic_int8(copy.deepcopy(model).eval())
+    model.config.save_pretrained(output_path)
+    tokenizer.save_pretrained(output_path)
+    torch.save(quantized.state_dict(), output_path / WEIGHTS_FILE)
+
+    meta = {
+        "format": QUANTIZATION_FORMAT,
+        "model_class": type(model).__name__,
+        "source": source,
+        "torch_version": torch.__version__,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(output_path / META_FILE, "w") as f:
+        json.dump(meta, f, indent=2)
+    logger.info(f"Exported int8 model ({meta['model_class']}) to {output_path}")
+    return output_path
+
+
+def export_loaded(
+    model: Any,
+    tokenizer: Any,
+    backend: str,
+    model_path: Optional[str],
+    model_name: str,
+    output_dir: Optional[str] = None
+) -> Optional[str]:
+    """
+    Write an int8 copy of a model wrapper's loaded PyTorch model
+
+    Args:
+        model: The wrapper's model (None when it failed to load)
+        tokenizer: The wrapper's tokenizer
+        backend: Backend the wrapper runs on; only "pytorch" models are exported
+        model_path: Fine-tuned model directory, if any
+        model_name: Base model name (recorded as the source without model_path)
+        output_dir: Artifact directory (default: <model_path>_int8, which
+            is picked up automatically on the next load)
+
+    Returns:
+        Artifact path, or None if there is no PyTorch model to export
+    """
+    output_dir = output_dir or quantized_dir(model_path)
+    if model is None or backend != "pytorch" or output_dir is None:
+        return None
+    return str(export_quantized(model, tokenizer, output_dir, model_path or model_name))
+
+
+def load_quantized(artifact_dir: Path, model_cls: Any, tokenizer_cls: Any = None) -> Tuple[Any, Any]:
+    """
+    Load an int8 artifact written by export_quantized
+
+    Args:
+        artifact_dir: Artifact directory
+        model_cls: transformers model class (Auto* classes are supported)
+        tokenizer_cls: Tokenizer class (default AutoTokenizer)
+
+    Returns:
+        (quantized model in eval mode, tokenizer)
+    """
+    import torch
+    from transformers import AutoConfig, AutoTokenizer
+
+    with open(artifact_dir / META_FILE) as f:
+        meta = json.load(f)
+    if meta.get("format") != QUANTIZATION_FORMAT:
+        raise ValueError(f"Unsupported quantization format: {meta.get('format')}")
+
+    config = AutoConfig.from_pretrained(artifact_dir)
+    if hasattr(model_cls, "from_config"):
+        model = model_cls.from_config(config)
+    else:
+        model = model_cls(config)
+    model = quantize_dynamic_int8(model.eval())
+    model.load_state_dict(torch.load(artifact_dir / WEIGHTS_FILE, map_location="cpu"))
+    model.eval()
+
+    tokenizer = (tokenizer_cls or AutoTokenizer).from_pretrained(artifact_dir)
+    return model, tokenizer
+
+
+def try_load_quantized(
+    model_path: Optional[str],
+    model_cls: Any,
+    tokenizer_cls: Any = None,
+    use_quantized: Optional[bool] = None
+) -> Optional[Tuple[Any, Any]]:
+    """
+    Load the int8 artifact for model_path if it exists and is enabled
+
+    Returns:
+        (model, tokenizer), or None to fall back to the PyTorch model
+    """
+    if use_quantized is None:
+        use_quantized = use_quantized_default()
+    artifact_dir = quantized_dir(model_path)
+    if not use_quantized or artifact_dir is None or not (artifact_dir / META_FILE).exists():
+        return None
+    try:
+        loaded = load_quantized(artifact_dir, model_cls, tokenizer_cls)
+        logger.info(f"Loaded int8 model from {artifact_dir}")
+        return loaded
+    except Exception as e:
+        logger.warning(f"Could not load int8 model from {artifact_dir}, using PyTorch model: {e}")
+        return None
+
+
+def compare_outputs(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """
+    Parity of a quantized model against the full-precision one
+
+    Args:
+        reference: (n, k) outputs of the full-precision model (logits or embeddings)
+        candidate: (n, k) outputs of the quantized model on the same inputs
+
+    Returns:
+        max/mean absolute delta, argmax label agreement and mean cosine similarity
+    """
+    reference = np.asarray(reference, dtype=np.float64).reshape(len(reference), -1)
+    candidate = np.asarray(candidate, dtype=np.float64).reshape(len(candidate), -1)
+    delta = np.abs(reference - candidate)
+    norms = np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1) + 1e-12
+    return {
+        "n": int(len(reference)),
+        "max_abs_delta": float(delta.max()) if delta.size else 0.0,
+        "mean_abs_delta": float(delta.mean()) if delta.size else 0.0,
+        "label_agreement": float(np.mean(reference.argmax(axis=1) == candidate.argmax(axis=1))) if delta.size else 1.0,
+        "mean_cosine": float(np.mean(np.sum(reference * candidate, axis=1) / norms)) if delta.size else 1.0,
+    }
+
+
+def export_quantized_models(
+    models_dir: str,
+    models: Optional[List[str]] = None
+) -> Dict[str, Optional[str]]:
+    """
+    Export int8 artifacts for the transformer models under models_dir
+
+    Args:
+        models_dir: Directory with trained models (intent_model/,
+            field_transformer/, summarizer/); base models are used for the
+            ones that have not been fine-tuned
+        models: Subset of "intent", "field", "summarizer" (default: all)
+
+    Returns:
+        Mapping of model to artifact path (None if the model is unavailable)
+    """
+    from .field_classifier import TransformerLabelUnderstanding
+    from .intent_classifier import DistilBERTIntentClassifier
+    from .summarizer import T5Summarizer
+
+    factories = {
+        "intent": lambda path: DistilBERTIntentClassifier(model_path=path, use_quantized=False),
+        "field": lambda path: TransformerLabelUnderstanding(model_path=path, use_quantized=False),
+        "summarizer": lambda path: T5Summarizer(model_path=path, use_quantized=False),
+    }
+    subdirs = {"intent": "intent_model", "field": "field_transformer", "summarizer": "summarizer"}
+
+    exported = {}
+    for name in models or list(factories):
+        wrapper = factories[name](str(Path(models_dir) / subdirs[name]))
+        exported[name] = wrapper.export_quantized()
+    return exported
@@ -0,0 +1,140 @@
+"""
+Recommendation Result Cache
+Reuses ranked results for users whose profiles score identically
+
+Entries are keyed by (namespace, profile fingerprint, request params) and
+tagged with a catalogue version. Each namespace (e.g. one endpoint) tracks
+its current catalogue version; seeing a newer version drops that namespace's
+entries, so publishing/updating jobs invalidates results automatically.
+Entries also expire after a TTL and the cache is bounded (LRU eviction).
+
+The fingerprint must capture everything the scorer reads from the profile,
+canonicalized so that equivalent profiles share an entry; see
+JobRecommender.profile_fingerprint and AIJobMatcher.profile_fingerprint.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def stable_digest(value: Any) -> str:
+    """Stable short digest of a JSON-like value (key order independent)"""
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+class RecommendationCache:
+    """
+    TTL + LRU cache of recommendation results, invalidated by catalogue version
+
+    Args:
+        max_entries: Maximum cached results across all namespaces
+        ttl: Seconds a result stays valid
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._versions: Dict[str, Hashable] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    def _drop_namespace(self, namespace: str):
+        for entry_key in [k for k in self._entries if k[0] == namespace]:
+            del self._entries[entry_key]
+
+    def _sync_version(self, namespace: str, version: Hashable) -> bool:
+        """Switch the namespace to version; False if version is older than the current one"""
+        current = self._versions.get(namespace)
+        if current == version:
+            return True
+        if isinstance(current, int) and isinstance(version, int) and version < current:
+            return False  # Result computed from an outdated snapshot
+        if namespace in self._versions:
+            self._drop_namespace(namespace)
+            self.stats["invalidations"] += 1
+        self._versions[namespace] = version
+        return True
+
+    def get(self, namespace: str, version: Hashable, key: Hashable) -> Optional[Any]:
+        """Cached result for key under the given catalogue version, or None"""
+        if key is None:
+            return None
+        with self._lock:
+            if not self._sync_version(namespace, version):
+                self.stats["misses"] += 1
+                return None
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[(namespace, key)]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end((namespace, key))
+            self.stats["hits"] += 1
+            return value
+
+    def put(self, namespace: str, version: Hashable, key: Hashable, value: Any):
+        """Store a result computed against the given catalogue version"""
+        if key is None:
+            return
+        with self._lock:
+            if not self._sync_version(namespace, version):
+                return
+            self._entries[(namespace, key)] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, namespace: Optional[str] = None):
+        """Drop cached results (all namespaces by default)"""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._versions.clear()
+            else:
+                self._drop_namespace(namespace)
+                self._versions.pop(namespace, None)
+            self.stats["invalidations"] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "versions": {ns: str(v) for ns, v in self._versions.items()},
+            }
+
+
+# Global cache instance
+_recommendation_cache: Optional[RecommendationCache] = None
+
+
+def get_recommendation_cache() -> RecommendationCache:
+    """Get the process-wide recommendation cache (AI_RECOMMENDATION_CACHE_SIZE / _TTL)"""
+    global _recommendation_cache
+    if _recommendation_cache is None:
+        _recommendation_cache = RecommendationCache(
+            max_entries=int(os.environ.get("AI_RECOMMENDATION_CACHE_SIZE", "10000")),
+            ttl=float(os.environ.get("AI_RECOMMENDATION_CACHE_TTL", "300")),
+        )
+    return _recommendation_cache
@@ -0,0 +1,50 @@
+"""
+Persistent Store Helpers
+Shared by the on-disk caches and stores of this package
+
+- file_lock: exclusive inter-process lock for writers sharing a directory
+- model_file_stats: identity of a model's files on disk, for version keys
+  that must change when a model is retrained or re-exported
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .quantization import quantized_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer deployments only
+    fcntl = None
+
+
+@contextmanager
+def file_lock(lock_path: Union[str, Path]):
+    """Hold an exclusive flock on lock_path (created if missing)"""
+    with open(lock_path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def model_file_stats(model_path: Optional[str], backend: str = "pytorch") -> List[list]:
+    """
+    [name, size, mtime] of every file of a model directory
+
+    With the int8 backend the files of its quantized artifact directory are
+    included too. Missing directories contribute nothing.
+    """
+    stats = []
+    for directory in (model_path, quantized_dir(model_path) if backend == "int8" else None):
+        if directory and os.path.isdir(directory):
+            stats += [
+                [entry.name, entry.stat().st_size, entry.stat().st_mtime]
+                for entry in sorted(os.scandir(directory), key=lambda e: e.name) if entry.is_file()
+            ]
+    return stats
@@ -21,10 +21,15 @@ Dependencies (optional for ML mode):
 import logging
 import re
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
 
 from .language_helper import get_language_helper
+from .model_registry import get_model
+from .quantization import export_loaded, try_load_quantized
+from .recommendation_cache import stable_digest
+from .store_utils import model_file_stats
+from .summary_store import SummaryStore, get_summary_store
 
 logger = logging.getLogger(__name__)
 
@@ -391,21 +396,42 @@ class T5Summarizer:
     """
     T5/mT5 based abstractive summarization
     Generates new sentences for copyright-safe rewrites
+    
+    summarize_many/rewrite_many sort inputs by token length and run
+    generate on padded batches of similar length (AI_SUMMARIZER_BATCH_SIZE).
+    Generated texts go through a persistent store keyed by (content hash,
+    language, style, model version) (see summary_store.py), so unchanged
+    postings are never generated twice; pass store=False to disable.
     """
     
+    # Style-specific prompts for rewrite
+    STYLE_PROMPTS = {
+        "professional": "rewrite professionally: ",
+        "casual": "rewrite casually: ",
+        "concise": "summarize concisely: "
+    }
+    
     def __init__(
         self,
         model_name: str = "google/mt5-small",  # Multilingual T5 for Hindi/English
         model_path: Optional[str] = None,
         max_length: int = 150,
-        min_length: int = 30
+        min_length: int = 30,
+        use_quantized: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        store: Union[SummaryStore, bool, None] = None
     ):
         self.model_name = model_name
         self.model_path = model_path
         self.max_length = max_length
         self.min_length = min_length
+        self.use_quantized = use_quantized
+        self.batch_size = batch_size or int(os.environ.get("AI_SUMMARIZER_BATCH_SIZE", "8"))
+        self.store = None if store is False else (store if store is not None else get_summary_store())
         self.model = None
         self.tokenizer = None
+        self.backend = "pytorch"
+        self._model_version: Optional[str] = None
         self._load_model()
     
     def _load_model(self):
@@ -413,6 +439,13 @@ class T5Summarizer:
         try:
             from transformers import T5ForConditionalGeneration, T5Tokenizer, AutoModelForSeq2SeqLM, AutoTokenizer
             
+            # Int8 artifact (see quantization.py) when one has been exported
+            quantized = try_load_quantized(self.model_path, AutoModelForSeq2SeqLM, AutoTokenizer, self.use_quantized)
+            if quantized is not None:
+                self.model, self.tokenizer = quantized
+                self.backend = "int8"
+                return
+            
             if self.model_path and os.path.exists(self.model_path):
                 self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_path)
                 self.tokenizer = AutoTokenizer.from_pretrained(self.model_path)
@@ -433,6 +466,78 @@ class T5Summarizer:
         except Exception as e:
             logger.warning(f"Could not load T5 model: {e}")
     
+    @property
+    def model_version(self) -> str:
+        """Identity of the loaded model and generation settings (summary store keys)"""
+        if self._model_version is None:
+            self._model_version = stable_digest([
+                self.model_path or self.model_name, self.backend,
+                model_file_stats(self.model_path, self.backend),
+                self.max_length, self.min_length, self.STYLE_PROMPTS,
+            ])
+        return self._model_version
+    
+    def _summary_prefix(self, language: str) -> str:
+        if "mt5" in self.model_name.lower():
+            # mT5 task prefix
+            return "summarize: " if language == "en" else "सारांश: "
+        return "summarize: "
+    
+    def _generate_batch(self, input_texts: List[str], **generate_kwargs) -> List[Optional[str]]:
+        """
+        Run generate over padded batches of similar token length
+        
+        Inputs are sorted by token count and cut into batches of batch_size,
+        so each batch pads to a length close to its own texts. When a batch
+        fails its texts are retried one by one; a text that still fails
+        yields None.
+        
+        Returns:
+            One decoded output (or None) per input, in input order
+        """
+        import torch
+        
+        try:
+            input_ids = self.tokenizer(input_texts, max_length=512, truncation=True)["input_ids"]
+        except Exception as e:
+            logger.warning(f"T5 tokenization failed: {e}")
+            return [None] * len(input_texts)
+        order = sorted(range(len(input_texts)), key=lambda i: len(input_ids[i]))
+        outputs: List[Optional[str]] = [None] * len(input_texts)
+        
+        def run(bucket: List[int]):
+            batch = self.tokenizer.pad({"input_ids": [input_ids[i] for i in bucket]}, return_tensors="pt")
+            with torch.no_grad():
+                generated = self.model.generate(
+                    batch["input_ids"],
+                    attention_mask=batch["attention_mask"],
+                    **generate_kwargs
+                )
+            for i, text in zip(bucket, self.tokenizer.batch_decode(generated, skip_special_tokens=True)):
+                outputs[i] = text
+        
+        for start in range(0, len(order), self.batch_size):
+            bucket = order[start:start + self.batch_size]
+            try:
+                run(bucket)
+            except Exception as e:
+                logger.warning(f"T5 generation failed for a batch of {len(bucket)}: {e}")
+                if len(bucket) == 1:
+                    continue
+                # Retry one by one so a single bad input does not fail its neighbours
+                for i in bucket:
+                    try:
+                        run([i])
+                    except Exception as e:
+                        logger.warning(f"T5 generation failed: {e}")
+        return outputs
+    
+    def _generate_stored(self, texts: List[str], language: str, style: str, generate_fn) -> List[Optional[str]]:
+        """generate_fn over texts, through the summary store when there is one"""
+        if self.store is None:
+            return generate_fn(texts)
+        return self.store.get_many(texts, language, style, self.model_version, generate_fn)
+    
     def summarize(self, text: str, language: str = "en") -> str:
         """
         Generate abstractive summary using T5
@@ -444,44 +549,41 @@ class T5Summarizer:
         Returns:
             Generated summary
         """
-        if self.model is None or self.tokenizer is None:
-            return self._template_summarize(text, language)
+        return self.summarize_many([text], language)[0]
+    
+    def summarize_many(self, texts: List[str], language: str = "en") -> List[str]:
+        """
+        Summaries for many texts (batched, stored); see summarize
         
-        try:
-            import torch
-            
-            # Prepare input with task prefix
-            if "mt5" in self.model_name.lower():
-                # mT5 task prefix
-                prefix = "summarize: " if language == "en" else "सारांश: "
-            else:
-                prefix = "summarize: "
-            
-            input_text = prefix + text[:1024]  # Truncate long texts
-            
-            inputs = self.tokenizer(
-                input_text,
-                return_tensors="pt",
-                max_length=512,
-                truncation=True
+        Returns:
+            One summary per input text, in input order
+        """
+        if self.model is None or self.tokenizer is None:
+            return [self._template_summarize(text, language) for text in texts]
+        
+        prefix = self._summary_prefix(language)
+        
+        def generate(batch: List[str]) -> List[Optional[str]]:
+            return self._generate_batch(
+                [prefix + text[:1024] for text in batch],  # Truncate long texts
+                max_length=self.max_length,
+                min_length=self.min_length,
+                length_penalty=2.0,
+                num_beams=4,
+                early_stopping=True
             )
-            
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs.input_ids,
-                    max_length=self.max_length,
-                    min_length=self.min_length,
-                    length_penalty=2.0,
-                    num_beams=4,
-                    early_stopping=True
-                )
-            
-            summary = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            return summary
-            
-        except Exception as e:
-            logger.warning(f"T5 summarization failed: {e}")
-            return self._template_summarize(text, language)
+        
+        summaries = self._generate_stored(texts, language, "summary", generate)
+        return [
+            summary if summary is not None else self._template_summarize(text, language)
+            for text, summary in zip(texts, summaries)
+        ]
+    
+    def export_quantized(self, output_dir: Optional[str] = None) -> Optional[str]:
+        """Write an int8 copy of the loaded PyTorch model (see quantization.export_loaded)"""
+        return export_loaded(
+            self.model, self.tokenizer, self.backend, self.model_path, self.model_name, output_dir
+        )
     
     def _template_summarize(self, text: str, language: str) -> str:
         """Fallback template-based summarization"""
@@ -512,45 +614,35 @@ class T5Summarizer:
         Returns:
             Rewritten text
         """
-        if self.model is None or self.tokenizer is None:
-            return self._template_rewrite(text, style, language)
+        return self.rewrite_many([text], style, language)[0]
+    
+    def rewrite_many(self, texts: List[str], style: str = "professional", language: str = "en") -> List[str]:
+        """
+        Rewrites of many texts (batched, stored); see rewrite
         
-        try:
-            import torch
-            
-            # Style-specific prompts
-            style_prompts = {
-                "professional": "rewrite professionally: ",
-                "casual": "rewrite casually: ",
-                "concise": "summarize concisely: "
-            }
-            
-            prefix = style_prompts.get(style, "rewrite: ")
-            input_text = prefix + text[:1024]
-            
-            inputs = self.tokenizer(
-                input_text,
-                return_tensors="pt",
-                max_length=512,
-                truncation=True
+        Returns:
+            One rewrite per input text, in input order
+        """
+        if self.model is None or self.tokenizer is None:
+            return [self._template_rewrite(text, style, language) for text in texts]
+        
+        prefix = self.STYLE_PROMPTS.get(style, "rewrite: ")
+        
+        def generate(batch: List[str]) -> List[Optional[str]]:
+            return self._generate_batch(
+                [prefix + text[:1024] for text in batch],
+                max_length=256,
+                num_beams=4,
+                early_stopping=True,
+                do_sample=True,
+                temperature=0.7
             )
-            
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs.input_ids,
-                    max_length=256,
-                    num_beams=4,
-                    early_stopping=True,
-                    do_sample=True,
-                    temperature=0.7
-                )
-            
-            rewritten = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            return rewritten
-            
-        except Exception as e:
-            logger.warning(f"T5 rewriting failed: {e}")
-            return self._template_rewrite(text, style, language)
+        
+        rewrites = self._generate_stored(texts, language, style, generate)
+        return [
+            rewritten if rewritten is not None else self._template_rewrite(text, style, language)
+            for text, rewritten in zip(texts, rewrites)
+        ]
     
     def _template_rewrite(self, text: str, style: str, language: str) -> str:
         """Fallback template-based rewriting"""
@@ -655,13 +747,26 @@ class AdvancedSummarizer:
         Returns:
             Generated summary
         """
+        return self.summarize_many([text], language, max_length)[0]
+    
+    def summarize_many(self, texts: List[str], language: str = "en", max_length: int = 150) -> List[str]:
+        """Summaries for many texts (T5 runs batched and stored); see summarize"""
+        summaries: List[Optional[str]] = [None] * len(texts)
+        
         # Try T5 first
         if self.t5_model and self.t5_model.model is not None:
-            summary = self.t5_model.summarize(text, language)
-            if summary and len(summary) > 20:
-                return summary
+            summaries = [
+                summary if summary and len(summary) > 20 else None
+                for summary in self.t5_model.summarize_many(texts, language)
+            ]
         
         # Fallback to template
+        return [
+            summary if summary is not None else self._template_summary(text, language)
+            for text, summary in zip(texts, summaries)
+        ]
+    
+    def _template_summary(self, text: str, language: str) -> str:
         template_result = self.template_summarizer.generate_summary({"description": text})
         
         if language == "hi":
@@ -680,14 +785,24 @@ class AdvancedSummarizer:
         Returns:
             Rewritten text
         """
+        return self.rewrite_many([text], language, style)[0]
+    
+    def rewrite_many(self, texts: List[str], language: str = "en", style: str = "professional") -> List[str]:
+        """Rewrites of many texts (T5 runs batched and stored); see rewrite"""
+        rewrites: List[Optional[str]] = [None] * len(texts)
+        
         # Try T5 rewriting
         if self.t5_model and self.t5_model.model is not None:
-            rewritten = self.t5_model.rewrite(text, style, language)
-            if rewritten and len(rewritten) > 20:
-                return rewritten
+            rewrites = [
+                rewritten if rewritten and len(rewritten) > 20 else None
+                for rewritten in self.t5_model.rewrite_many(texts, style, language)
+            ]
         
         # Fallback to template
-        return self.template_summarizer.rewrite_description(text, style)
+        return [
+            rewritten if rewritten is not None else self.template_summarizer.rewrite_description(text, style)
+            for text, rewritten in zip(texts, rewrites)
+        ]
     
     def generate_bilingual_summary(self, text: str) -> Dict[str, str]:
         """
@@ -699,24 +814,34 @@ class AdvancedSummarizer:
         Returns:
             Dictionary with English and Hindi summaries
         """
-        # Generate English summary
-        english_summary = self.summarize(text, "en")
+        return self.generate_bilingual_summaries([text])[0]
+    
+    def generate_bilingual_summaries(self, texts: List[str]) -> List[Dict[str, str]]:
+        """English and Hindi summaries for many texts; see generate_bilingual_summary"""
+        # Generate English summaries
+        english_summaries = self.summarize_many(texts, "en")
         
-        # Generate Hindi summary
+        # Generate Hindi summaries
         if self.t5_model and self.t5_model.model is not None:
-            hindi_summary = self.summarize(text, "hi")
+            hindi_summaries = self.summarize_many(texts, "hi")
         elif self.translator:
-            hindi_summary = self.translator.translate(english_summary, "en", "hi")
+            hindi_summaries = [self.translator.translate(summary, "en", "hi") for summary in english_summaries]
         else:
-            hindi_summary = self.template_summarizer.generate_summary({"description": text}).get("summary_hi", "")
-        
-        return {
-            "en": english_summary,
-            "hi": hindi_summary,
-            "english": english_summary,
-            "hindi": hindi_summary,
-            "bilingual": f"**English:**\n{english_summary}\n\n**हिंदी:**\n{hindi_summary}"
-        }
+            hindi_summaries = [
+                self.template_summarizer.generate_summary({"description": text}).get("summary_hi", "")
+                for text in texts
+            ]
+        
+        return [
+            {
+                "en": english_summary,
+                "hi": hindi_summary,
+                "english": english_summary,
+                "hindi": hindi_summary,
+                "bilingual": f"**English:**\n{english_summary}\n\n**हिंदी:**\n{hindi_summary}"
+            }
+            for english_summary, hindi_summary in zip(english_summaries, hindi_summaries)
+        ]
     
     def process_job_posting(self, job: Dict) -> Dict:
         """
@@ -728,32 +853,44 @@ class AdvancedSummarizer:
         Returns:
             Processed result with summaries and rewrites
         """
-        title = job.get("title", "")
-        description = job.get("description", "")
+        return self.process_job_postings([job])[0]
+    
+    def process_job_postings(self, jobs: List[Dict]) -> List[Dict]:
+        """
+        Process many job postings (e.g. a scraper run) with full summarization
+        
+        Each T5 task (English and Hindi summary, three rewrites) runs as one
+        batched pass over all descriptions, and only descriptions missing
+        from the summary store are generated.
+        
+        Returns:
+            One result per job, as process_job_posting
+        """
+        descriptions = [job.get("description", "") for job in jobs]
         
         # Generate summaries
-        bilingual = self.generate_bilingual_summary(description)
+        bilingual = self.generate_bilingual_summaries(descriptions)
         
         # Generate rewrites
         rewrites = {
-            "professional": self.rewrite(description, "en", "professional"),
-            "casual": self.rewrite(description, "en", "casual"),
-            "concise": self.rewrite(description, "en", "concise")
+            style: self.rewrite_many(descriptions, "en", style)
+            for style in ("professional", "casual", "concise")
         }
         
-        # Extract key info using template summarizer
-        key_info = self.template_summarizer.extract_key_info(description)
-        
-        return {
-            "title": title,
-            "original": description,
-            "summary_en": bilingual["en"],
-            "summary_hi": bilingual["hi"],
-            "summary_bilingual": bilingual["bilingual"],
-            "rewritten": rewrites,
-            "key_info": key_info,
-            "bullet_points": self.template_summarizer.extract_bullet_points(description)
-        }
+        results = []
+        for i, (job, description) in enumerate(zip(jobs, descriptions)):
+            results.append({
+                "title": job.get("title", ""),
+                "original": description,
+                "summary_en": bilingual[i]["en"],
+                "summary_hi": bilingual[i]["hi"],
+                "summary_bilingual": bilingual[i]["bilingual"],
+                "rewritten": {style: texts[i] for style, texts in rewrites.items()},
+                # Extract key info using template summarizer
+                "key_info": self.template_summarizer.extract_key_info(description),
+                "bullet_points": self.template_summarizer.extract_bullet_points(description)
+            })
+        return results
 
 
 # Convenience function for API integration
@@ -771,7 +908,7 @@ def rewrite(text: str, language: str = "en", use_ml: bool = False, models_dir: O
         Rewritten text
     """
     if use_ml:
-        summarizer = AdvancedSummarizer(models_dir=models_dir)
+        summarizer = get_model("summarizer", models_dir)
         return summarizer.rewrite(text, language)
     else:
         summarizer = ContentSummarizer()
@@ -792,7 +929,7 @@ def summarize(text: str, language: str = "en", use_ml: bool = False, models_dir:
         Generated summary
     """
     if use_ml:
-        summarizer = AdvancedSummarizer(models_dir=models_dir)
+        summarizer = get_model("summarizer", models_dir)
         return summarizer.summarize(text, language)
     else:
         summarizer = ContentSummarizer()
@@ -0,0 +1,307 @@
+"""
+Persistent Summary Store
+Keeps generated summaries and rewrites across restarts and scraper runs
+
+Layout:
+    <cache_dir>/summaries.jsonl   {"key", "text"} lines (append-only)
+
+Keys are SHA-256 digests of (model version, language, style, source text),
+so an unchanged posting re-scraped by the next run hits, while editing the
+text, switching language/style or retraining the model misses. Writers
+append under an exclusive file lock and every worker picks up lines
+appended by the others on its next miss, like embedding_cache.py.
+
+Lookups go through a bounded in-memory LRU first, then the on-disk index;
+misses are generated in one batch. Failed generations (None) are not
+stored, so they are retried next time.
+
+Once the log grows past max_disk_bytes it is compacted (rewritten and
+atomically replaced) down to 90% of the bound, keeping the entries this
+worker used most recently, then the newest ones. Other workers notice the
+replaced file and re-index it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .store_utils import file_lock
+
+logger = logging.getLogger(__name__)
+
+STORE_FILE = "summaries.jsonl"
+
+
+def summary_key(text: str, language: str, style: str, model_version: str) -> str:
+    """Stable store key for a generated text"""
+    digest = hashlib.sha256()
+    for part in (model_version, language, style):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(text.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()[:32]
+
+
+class SummaryStore:
+    """
+    Two-level (LRU + append-only disk log) store of generated summaries
+
+    Args:
+        cache_dir: Directory for the persistent store; None keeps the
+            store in memory only
+        max_memory_items: Bound on the in-memory LRU
+        max_disk_bytes: Size of summaries.jsonl that triggers a compaction
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_memory_items: int = 10000,
+        max_disk_bytes: int = 256 * 2**20
+    ):
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "generated": 0, "failed": 0,
+            "compactions": 0, "disk_evictions": 0,
+        }
+
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        # Persistent store
+        self.store_dir: Optional[Path] = None
+        self._index: Dict[str, Tuple[int, int]] = {}  # key -> (offset, length) of its line
+        self._index_offset = 0  # Bytes of summaries.jsonl already read
+        self._index_inode: Optional[int] = None  # Changes when a worker compacts the log
+        if cache_dir:
+            self.store_dir = Path(cache_dir)
+            try:
+                self.store_dir.mkdir(parents=True, exist_ok=True)
+                self._refresh_index()
+            except OSError as e:
+                logger.warning(f"Summary store disabled, cannot use {self.store_dir}: {e}")
+                self.store_dir = None
+
+    # ------------------------------------------------------------------
+    # Persistent store
+    # ------------------------------------------------------------------
+
+    @property
+    def _store_path(self) -> Path:
+        return self.store_dir / STORE_FILE
+
+    def _file_lock(self):
+        return file_lock(self.store_dir / ".lock")
+
+    def _refresh_index(self):
+        """Index lines appended (by any worker) since the last refresh"""
+        if self.store_dir is None:
+            return
+        try:
+            with open(self._store_path, "rb") as f:
+                inode = os.fstat(f.fileno()).st_ino
+                if inode != self._index_inode:  # First read, or replaced by a compaction
+                    self._index.clear()
+                    self._index_offset = 0
+                    self._index_inode = inode
+                f.seek(self._index_offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+        # Only consume complete lines; a concurrent writer may be mid-line
+        end = chunk.rfind(b"\n") + 1
+        offset = self._index_offset
+        for line in chunk[:end].splitlines(keepends=True):
+            try:
+                self._index[json.loads(line)["key"]] = (offset, len(line))
+            except (ValueError, KeyError):
+                logger.warning(f"Skipping corrupt line at byte {offset} of {self._store_path}")
+            offset += len(line)
+        self._index_offset += end
+
+    def _disk_lookup(self, keys: Sequence[str]) -> Dict[str, str]:
+        if self.store_dir is None:
+            return {}
+        if any(key not in self._index for key in keys):
+            self._refresh_index()
+        spans = sorted((self._index[key], key) for key in keys if key in self._index)
+        if not spans:
+            return {}
+        found = {}
+        stale = False
+        with open(self._store_path, "rb") as f:
+            for (offset, length), key in spans:
+                f.seek(offset)
+                try:
+                    entry = json.loads(f.read(length))
+                except ValueError:
+                    entry = {}
+                if entry.get("key") == key:
+                    found[key] = entry["text"]
+                else:  # Compacted by another worker since the last refresh
+                    stale = True
+        if stale:
+            self._index_inode = None
+        return found
+
+    def _disk_append(self, entries: Dict[str, str]):
+        if self.store_dir is None or not entries:
+            return
+        try:
+            with self._file_lock():
+                self._refresh_index()
+                lines = [
+                    (key, (json.dumps({"key": key, "text": text}, ensure_ascii=False) + "\n").encode("utf-8"))
+                    for key, text in entries.items() if key not in self._index
+                ]
+                if not lines:
+                    return
+                with open(self._store_path, "ab") as f:
+                    offset = f.tell()
+                    if offset != self._index_offset:  # Torn line from a writer that crashed mid-append
+                        f.write(b"\n")
+                        offset += 1
+                    f.write(b"".join(line for _, line in lines))
+                for key, line in lines:
+                    self._index[key] = (offset, len(line))
+                    offset += len(line)
+                self._index_offset = offset
+                if self._index_offset > self.max_disk_bytes:
+                    self._compact()
+        except OSError as e:
+            logger.warning(f"Could not persist summaries: {e}")
+
+    def _compact(self):
+        """Rewrite the log down to 90% of max_disk_bytes (caller holds the file lock)"""
+        target = int(self.max_disk_bytes * 0.9)
+        newest_first = sorted(self._index, key=lambda key: self._index[key][0], reverse=True)
+        recently_used = [key for key in reversed(self._lru) if key in self._index]
+        kept, total = [], 0
+        for key in dict.fromkeys(recently_used + newest_first):
+            length = self._index[key][1]
+            if total + length > target:
+                break
+            kept.append(self._index[key])
+            total += length
+
+        tmp_path = self._store_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(self._store_path, "rb") as src, open(tmp_path, "wb") as dst:
+            for offset, length in sorted(kept):
+                src.seek(offset)
+                dst.write(src.read(length))
+        os.replace(tmp_path, self._store_path)
+
+        self.stats["compactions"] += 1
+        self.stats["disk_evictions"] += len(self._index) - len(kept)
+        logger.info(f"Compacted {self._store_path}: kept {len(kept)} of {len(self._index)} summaries")
+        self._index_inode = None
+        self._refresh_index()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: str, text: str):
+        self._lru[key] = text
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_memory_items:
+            self._lru.popitem(last=False)
+
+    def get_many(
+        self,
+        texts: Sequence[str],
+        language: str,
+        style: str,
+        model_version: str,
+        generate_fn: Callable[[List[str]], List[Optional[str]]]
+    ) -> List[Optional[str]]:
+        """
+        Generated outputs for texts, generating only the store misses
+
+        Args:
+            texts: Source texts (duplicates are generated once)
+            language: Output language (part of every key)
+            style: Task/style, e.g. "summary" or "professional" (part of every key)
+            model_version: Identity of the model and generation settings
+            generate_fn: Batch generator, list of texts -> one output (or
+                None on failure) per text
+
+        Returns:
+            One output per input text (None where generation failed)
+        """
+        keys = [summary_key(text, language, style, model_version) for text in texts]
+        found: Dict[str, str] = {}
+
+        with self._lock:
+            for key in keys:
+                if key in found:
+                    continue
+                text = self._lru.get(key)
+                if text is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = text
+                    self.stats["memory_hits"] += 1
+
+            missing = list(dict.fromkeys(key for key in keys if key not in found))
+            for key, text in self._disk_lookup(missing).items():
+                found[key] = text
+                self._remember(key, text)
+                self.stats["disk_hits"] += 1
+
+        miss_texts: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in miss_texts:
+                miss_texts[key] = text
+        if miss_texts:
+            outputs = generate_fn(list(miss_texts.values()))
+            generated = {key: output for key, output in zip(miss_texts, outputs) if output is not None}
+            with self._lock:
+                self.stats["misses"] += len(miss_texts)
+                self.stats["generated"] += len(generated)
+                self.stats["failed"] += len(miss_texts) - len(generated)
+                for key, output in generated.items():
+                    found[key] = output
+                    self._remember(key, output)
+                self._disk_append(generated)
+
+        return [found.get(key) for key in keys]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh_index()
+            return len(self._index) if self.store_dir is not None else len(self._lru)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            return {
+                **self.stats,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_items": len(self._lru),
+                "disk_items": len(self._index),
+                "disk_bytes": self._index_offset if self.store_dir is not None else None,
+                "persistent": self.store_dir is not None,
+            }
+
+
+# Global store instance
+_summary_store: Optional[SummaryStore] = None
+
+
+def get_summary_store() -> SummaryStore:
+    """Get the process-wide summary store (AI_SUMMARY_STORE_DIR / _MEMORY_ITEMS / _DISK_MB)"""
+    global _summary_store
+    if _summary_store is None:
+        _summary_store = SummaryStore(
+            cache_dir=os.environ.get("AI_SUMMARY_STORE_DIR") or None,
+            max_memory_items=int(os.environ.get("AI_SUMMARY_STORE_MEMORY_ITEMS", "10000")),
+            max_disk_bytes=int(float(os.environ.get("AI_SUMMARY_STORE_DISK_MB", "256")) * 2**20),
+        )
+    return _summary_store
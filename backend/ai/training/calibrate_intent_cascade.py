@@ -0,0 +1,74 @@
+"""
+Intent Cascade Calibration
+Picks the early-exit thresholds of AdvancedIntentClassifier's cascade
+(keywords -> BoW -> DistilBERT) from a labelled message set
+
+The thresholds minimise how often DistilBERT runs while keeping accuracy
+within --tolerance of the full ensemble. They are written to
+<models-dir>/cascade_thresholds.json, which enables the cascade the next
+time the classifier is loaded from that directory.
+
+Usage:
+  python -m backend.ai.training.calibrate_intent_cascade --data labelled.jsonl --models-dir models/
+  python -m backend.ai.training.calibrate_intent_cascade --data labelled.json --tolerance 0.005 --dry-run
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def load_labelled(path: str) -> List[Dict]:
+    """Read {"text", "intent"} records from a JSON list or JSONL file"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = json.load(f)
+    return [r for r in records if r.get("text") and r.get("intent")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate intent cascade thresholds")
+    parser.add_argument("--data", required=True, help="Labelled messages (.json list or .jsonl)")
+    parser.add_argument("--models-dir", default=None, help="Directory with trained intent models")
+    parser.add_argument("--tolerance", type=float, default=0.01,
+                        help="Allowed absolute accuracy drop vs. the full ensemble")
+    parser.add_argument("--candidates", type=int, default=50, help="Threshold candidates per stage")
+    parser.add_argument("--dry-run", action="store_true", help="Print the result without saving it")
+    args = parser.parse_args()
+
+    from backend.ai.intent_classifier import AdvancedIntentClassifier
+
+    data = load_labelled(args.data)
+    if not data:
+        logger.error(f"No labelled messages in {args.data}")
+        return 1
+    logger.info(f"Calibrating on {len(data)} labelled messages")
+
+    classifier = AdvancedIntentClassifier(models_dir=args.models_dir)
+    calibration = classifier.calibrate_cascade(data, tolerance=args.tolerance, max_candidates=args.candidates)
+    print(json.dumps(calibration, indent=2))
+
+    if not calibration["distilbert_available"]:
+        logger.warning("DistilBERT is not available; thresholds were fitted against the BoW/keyword vote")
+    if not args.dry_run:
+        if not args.models_dir:
+            logger.error("--models-dir is required to save thresholds (or use --dry-run)")
+            return 1
+        path = classifier.save_cascade_thresholds(calibration, args.models_dir)
+        logger.info(f"Saved cascade thresholds to {Path(path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,11 +21,18 @@ Dependencies (optional for ML mode):
 import logging
 import re
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 from pathlib import Path
 
+import numpy as np
+
 from .language_helper import get_language_helper
+from .model_registry import get_model
+from .ocr_cache import OCRCache, get_ocr_cache
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +77,65 @@ VALIDATION_MESSAGES = {
 }
 
 
+# Field patterns of DocumentValidator.extract_fields_from_text as one scan.
+# Every branch sits inside a lookahead, so matches may overlap (a date
+# directly followed by an Aadhaar number yields both) and each candidate
+# position is reported once; candidates start a word with a digit or capital
+# letter. No two branches can match at the same position (digit-run lengths
+# and letter-prefix lengths differ), so the first matching branch is the
+# only one.
+_FIELD_SCAN_RE = re.compile(
+    r"(?=[\dA-Z])\b(?="
+    r"(?P<aadhar>\d{4}\s?\d{4}\s?\d{4}|\d{12})\b"
+    r"|(?P<phone>[6-9]\d{9})\b"
+    r"|(?P<dates>\d{1,2}[/-]\d{1,2}[/-]\d{4})\b"
+    r"|(?P<pan>[A-Z]{5}[0-9]{4}[A-Z])\b"
+    r"|(?P<voter_id>[A-Z]{3}\d{7})\b"
+    r"|(?P<driving_license>[A-Z]{2}\d{13})\b"
+    r")"
+)
+# Emails can start at any word character, so they are anchored on "@" instead
+_EMAIL_RE = re.compile(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b')
+_EMAIL_LOCAL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-")
+_EXTRACTED_FIELDS = ("aadhar", "pan", "email", "phone", "dates", "voter_id", "driving_license")
+
+
+def _scan_fields(text: str) -> Dict[str, Any]:
+    """
+    extract_fields_from_text in one pass over the text
+    
+    Single-value fields keep their first (leftmost) match and dates keep
+    every non-overlapping match, exactly like the per-field re.search /
+    re.findall calls.
+    """
+    found: Dict[str, Any] = {}
+    dates, dates_end = [], 0
+    for match in _FIELD_SCAN_RE.finditer(text):
+        field = match.lastgroup
+        if field == "dates":
+            if match.start() >= dates_end:
+                dates.append(match.group(field))
+                dates_end = match.end(field)
+        elif field not in found:
+            found[field] = match.group(field)
+    if dates:
+        found["dates"] = dates
+    if "aadhar" in found:
+        found["aadhar"] = re.sub(r'\s', '', found["aadhar"])
+    
+    # A match never starts before the local part that precedes the first "@"
+    at = text.find("@")
+    if at >= 0:
+        start = at
+        while start and text[start - 1] in _EMAIL_LOCAL_CHARS:
+            start -= 1
+        email_match = _EMAIL_RE.search(text, start)
+        if email_match:
+            found["email"] = email_match.group(0)
+    
+    return {field: found[field] for field in _EXTRACTED_FIELDS if field in found}
+
+
 class DocumentType(Enum):
     """Supported document types"""
     AADHAR = "aadhar"
@@ -197,6 +263,41 @@ class DocumentValidator:
     def __init__(self):
         self.confidence_threshold = 0.7
     
+    @classmethod
+    def compile_patterns(cls) -> Dict[str, Any]:
+        """
+        DOCUMENT_PATTERNS compiled into one table of distinct phrases (built once per class and reused)
+        
+        Each distinct lowercased keyword/field name is tested against the
+        text once and records, per document type, how many keyword and
+        field-name entries it stands for. The table is rebuilt when
+        DOCUMENT_PATTERNS is replaced.
+        """
+        compiled = cls.__dict__.get("_compiled_bank")
+        if compiled is not None and compiled["source"] is cls.DOCUMENT_PATTERNS:
+            return compiled
+        
+        doc_types = list(cls.DOCUMENT_PATTERNS)
+        phrase_hits: Dict[str, List[Tuple[int, int]]] = {}  # phrase -> [(doc type, 0 keyword / 1 field name)]
+        for type_idx, doc_type in enumerate(doc_types):
+            patterns = cls.DOCUMENT_PATTERNS[doc_type]
+            for kind, key in enumerate(("keywords", "field_names")):
+                for phrase in patterns.get(key, []):
+                    phrase_hits.setdefault(phrase.lower(), []).append((type_idx, kind))
+        
+        compiled = {
+            "source": cls.DOCUMENT_PATTERNS,
+            "doc_types": doc_types,
+            "phrases": list(phrase_hits.items()),
+            "sizes": [
+                (len(cls.DOCUMENT_PATTERNS[doc_type].get("keywords", [])),
+                 len(cls.DOCUMENT_PATTERNS[doc_type].get("field_names", [])))
+                for doc_type in doc_types
+            ],
+        }
+        cls._compiled_bank = compiled
+        return compiled
+    
     def identify_document_type(self, text: str, keywords: List[str] = None) -> Tuple[Optional[DocumentType], float]:
         """
         Identify document type from OCR text
@@ -207,83 +308,64 @@ class DocumentValidator:
         if not text:
             return None, 0.0
         
-        text_lower = text.lower()
-        scores = {}
+        compiled = self.compile_patterns()
+        if not compiled["doc_types"]:
+            return None, 0.0
         
-        for doc_type, patterns in self.DOCUMENT_PATTERNS.items():
+        text_lower = text.lower()
+        matches = [[0, 0] for _ in compiled["doc_types"]]  # [keyword, field name] entries found
+        for phrase, hits in compiled["phrases"]:
+            if phrase in text_lower:
+                for type_idx, kind in hits:
+                    matches[type_idx][kind] += 1
+        
+        best_doc_type, best_score = None, None
+        for doc_type, (keyword_matches, field_matches), (n_keywords, n_fields) in zip(
+            compiled["doc_types"], matches, compiled["sizes"]
+        ):
             score = 0.0
-            
-            # Check keywords
-            keywords_list = patterns.get("keywords", [])
-            keyword_matches = sum(1 for kw in keywords_list if kw.lower() in text_lower)
-            
             if keyword_matches > 0:
-                score += (keyword_matches / len(keywords_list)) * 0.6
-            
-            # Check field names
-            field_names = patterns.get("field_names", [])
-            field_matches = sum(1 for fn in field_names if fn.lower() in text_lower)
-            
+                score += (keyword_matches / n_keywords) * 0.6
             if field_matches > 0:
-                score += (field_matches / len(field_names)) * 0.4
-            
-            scores[doc_type] = score
-        
-        if not scores:
-            return None, 0.0
-        
-        best_doc_type = max(scores, key=scores.get)
-        best_score = scores[best_doc_type]
+                score += (field_matches / n_fields) * 0.4
+            if best_score is None or score > best_score:
+                best_doc_type, best_score = doc_type, score
         
         return best_doc_type, best_score
     
     def extract_fields_from_text(self, text: str, document_type: DocumentType = None) -> Dict[str, Any]:
         """
         Extract fields from document text using patterns
+        
+        Aadhaar, PAN, phone, dates, voter ID and DL come from one combined
+        scan (see _FIELD_SCAN_RE); email is searched from the first "@".
         """
         if not text:
             return {}
+        return _scan_fields(text)
+    
+    def extract_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Document type and fields for many OCR texts
         
-        extracted = {}
-        
-        # Extract Aadhar (12 digits in sequence)
-        aadhar_match = re.search(r'\b(\d{4}\s?\d{4}\s?\d{4}|\d{12})\b', text)
-        if aadhar_match:
-            aadhar = re.sub(r'\s', '', aadhar_match.group(1))
-            if len(aadhar) == 12:
-                extracted["aadhar"] = aadhar
-        
-        # Extract PAN
-        pan_match = re.search(r'\b([A-Z]{5}[0-9]{4}[A-Z]{1})\b', text)
-        if pan_match:
-            extracted["pan"] = pan_match.group(1)
-        
-        # Extract email
-        email_match = re.search(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b', text)
-        if email_match:
-            extracted["email"] = email_match.group(0)
-        
-        # Extract phone
-        phone_match = re.search(r'\b[6-9]\d{9}\b', text)
-        if phone_match:
-            extracted["phone"] = phone_match.group(0)
-        
-        # Extract dates (DD/MM/YYYY format)
-        date_matches = re.findall(r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{4})\b', text)
-        if date_matches:
-            extracted["dates"] = date_matches
-        
-        # Extract voter ID
-        voter_match = re.search(r'\b([A-Z]{3}\d{7})\b', text)
-        if voter_match:
-            extracted["voter_id"] = voter_match.group(1)
-        
-        # Extract driving license
-        dl_match = re.search(r'\b([A-Z]{2}\d{13})\b', text)
-        if dl_match:
-            extracted["driving_license"] = dl_match.group(1)
+        Identical texts (re-uploads, duplicated pages) are processed once.
         
-        return extracted
+        Returns:
+            [{"document_type", "type_confidence", "fields"}] in input order
+        """
+        seen: Dict[str, Dict[str, Any]] = {}
+        results = []
+        for text in texts:
+            result = seen.get(text)
+            if result is None:
+                doc_type, confidence = self.identify_document_type(text)
+                result = seen[text] = {
+                    "document_type": doc_type.value if doc_type else None,
+                    "type_confidence": confidence,
+                    "fields": self.extract_fields_from_text(text, doc_type),
+                }
+            results.append({**result, "fields": dict(result["fields"])})
+        return results
     
     def validate_field(self, field_type: str, value: str) -> Tuple[bool, Optional[str], Dict[str, str]]:
         """
@@ -525,21 +607,38 @@ class DocumentValidator:
 # Advanced ML Components (OCR + CNN Document Validation)
 # ==============================================================================
 
+def _cached_ocr(engine: Any, kind: str, image_path: str, read) -> Any:
+    """Run an OCR read through the engine's content-addressed cache"""
+    if engine.cache is None:
+        return read(image_path)
+    identity = engine.cache_identity(kind)
+    key, result = engine.cache.lookup(image_path, identity)
+    if result is None:
+        result = read(image_path)
+        engine.cache.put(key, result, identity)
+    return result
+
+
 class TesseractOCR:
     """
     Tesseract OCR for text extraction from documents
     Supports Hindi and English text extraction
+    
+    Results are cached by image content, language and Tesseract version
+    (see ocr_cache.py); pass cache=False to disable.
     """
     
-    def __init__(self, lang: str = "hin+eng"):
+    def __init__(self, lang: str = "hin+eng", cache: Union[OCRCache, bool, None] = None):
         self.lang = lang
+        self.version: Optional[str] = None
         self.tesseract_available = self._check_tesseract()
+        self.cache = None if cache is False else (cache if cache is not None else get_ocr_cache())
     
     def _check_tesseract(self) -> bool:
         """Check if Tesseract is installed"""
         try:
             import pytesseract
-            pytesseract.get_tesseract_version()
+            self.version = str(pytesseract.get_tesseract_version())
             return True
         except ImportError:
             logger.warning("pytesseract not installed")
@@ -548,6 +647,10 @@ class TesseractOCR:
             logger.warning(f"Tesseract not found: {e}")
             return False
     
+    def cache_identity(self, kind: str) -> Tuple[str, ...]:
+        """Engine, language, version and output kind for OCR cache keys"""
+        return ("tesseract", self.lang, self.version or "", kind)
+    
     def extract_text(self, image_path: str) -> str:
         """
         Extract text from image using Tesseract
@@ -558,6 +661,9 @@ class TesseractOCR:
         Returns:
             Extracted text
         """
+        return _cached_ocr(self, "text", image_path, self._ocr_text)
+    
+    def _ocr_text(self, image_path: str) -> str:
         if not self.tesseract_available:
             return self._fallback_extraction(image_path)
         
@@ -580,6 +686,9 @@ class TesseractOCR:
         Returns:
             Dictionary with text blocks and positions
         """
+        return _cached_ocr(self, "structured", image_path, self._ocr_structured)
+    
+    def _ocr_structured(self, image_path: str) -> Dict:
         if not self.tesseract_available:
             return {"text": self._fallback_extraction(image_path), "blocks": []}
         
@@ -623,26 +732,39 @@ class EasyOCRExtractor:
     """
     EasyOCR alternative for text extraction
     Better multilingual support than Tesseract
+    
+    Results are cached by image content, languages and EasyOCR version
+    (see ocr_cache.py); pass cache=False to disable.
     """
     
-    def __init__(self, languages: List[str] = ["en", "hi"]):
+    def __init__(self, languages: List[str] = ["en", "hi"], cache: Union[OCRCache, bool, None] = None):
         self.languages = languages
         self.reader = None
+        self.version: Optional[str] = None
         self._load_model()
+        self.cache = None if cache is False else (cache if cache is not None else get_ocr_cache())
     
     def _load_model(self):
         """Load EasyOCR reader"""
         try:
             import easyocr
             self.reader = easyocr.Reader(self.languages, gpu=False)
+            self.version = getattr(easyocr, "__version__", "unknown")
             logger.info("Loaded EasyOCR reader")
         except ImportError:
             logger.warning("easyocr not installed")
         except Exception as e:
             logger.warning(f"Could not load EasyOCR: {e}")
     
+    def cache_identity(self, kind: str) -> Tuple[str, ...]:
+        """Engine, languages, version and output kind for OCR cache keys"""
+        return ("easyocr", "+".join(self.languages), self.version or "", kind)
+    
     def extract_text(self, image_path: str) -> str:
         """Extract text from image"""
+        return _cached_ocr(self, "text", image_path, self._ocr_text)
+    
+    def _ocr_text(self, image_path: str) -> str:
         if self.reader is None:
             return ""
         
@@ -656,6 +778,9 @@ class EasyOCRExtractor:
     
     def extract_structured(self, image_path: str) -> Dict:
         """Extract text with bounding boxes"""
+        return _cached_ocr(self, "structured", image_path, self._ocr_structured)
+    
+    def _ocr_structured(self, image_path: str) -> Dict:
         if self.reader is None:
             return {"text": "", "blocks": []}
         
@@ -681,6 +806,45 @@ class EasyOCRExtractor:
             return {"text": "", "blocks": []}
 
 
+def _estimate_skew(gray: np.ndarray, max_angle: float = 15.0, step: float = 0.5) -> float:
+    """
+    Text-line skew in degrees (positive: lines descend to the right)
+    
+    Projection profiles of dark pixels over sheared rows: the angle whose
+    row histogram is most peaked aligns with the text lines. Returns 0.0
+    when no angle stands out (photos, blank pages).
+    """
+    stride = max(1, -(-max(gray.shape) // 512))
+    sample = gray[::stride, ::stride]
+    threshold = sample.mean() - sample.std()
+    ys, xs = np.nonzero(sample < threshold)
+    if len(ys) < 50 or len(ys) > sample.size // 2:
+        return 0.0
+    if len(ys) > 20_000:
+        keep = np.linspace(0, len(ys) - 1, 20_000).astype(np.intp)
+        ys, xs = ys[keep], xs[keep]
+    
+    def profile_score(angle: float) -> float:
+        rows = np.rint(ys - xs * np.tan(np.radians(angle))).astype(np.intp)
+        counts = np.bincount(rows - rows.min())
+        return float(counts @ counts)
+    
+    # Coarse search, then refine around the best coarse angle; candidates are
+    # ordered by magnitude so ties resolve towards no skew
+    coarse = 4 * step
+    candidates = [0.0] + [sign * a for a in np.arange(coarse, max_angle + coarse / 2, coarse) for sign in (1, -1)]
+    scores = {angle: profile_score(angle) for angle in candidates}
+    center = max(scores, key=scores.get)
+    for offset in np.arange(step, coarse, step):
+        for angle in (center + offset, center - offset):
+            if abs(angle) <= max_angle and angle not in scores:
+                scores[angle] = profile_score(angle)
+    best = max(sorted(scores, key=abs), key=scores.get)
+    if scores[best] < 1.1 * scores[0.0]:
+        return 0.0
+    return round(float(best), 2)
+
+
 class CNNDocumentClassifier:
     """
     CNN-based document type and quality classification
@@ -773,57 +937,72 @@ class CNNDocumentClassifier:
         
         return "other", 0.3
     
-    def check_quality(self, image_path: str) -> Dict:
+    # Image quality thresholds (metrics at analysis resolution, <= QUALITY_MAX_SIDE px)
+    QUALITY_MAX_SIDE = 1024
+    # Laplacian/gradient energy ratio: it falls roughly as 1/sigma of the blur
+    # and does not depend on how much text the page holds (calibrated on
+    # sharp pages >= 0.35 vs Gaussian blur of >= 1.5 analysis px <= 0.25)
+    SHARPNESS_THRESHOLD = 0.2
+    DARK_THRESHOLD = 50
+    BRIGHT_THRESHOLD = 200
+    CONTRAST_THRESHOLD = 30
+    GLARE_THRESHOLD = 0.02  # Share of saturated blocks on a darker document
+    SKEW_THRESHOLD = 5.0  # Degrees
+    
+    @classmethod
+    def check_quality(cls, image_path: Any) -> Dict:
         """
         Check document image quality
         
+        The image is decoded at reduced size (JPEG draft mode) and scaled to
+        at most QUALITY_MAX_SIDE pixels, so a 12 MP phone photo costs a few
+        milliseconds. Needs no model, so it can also be called on the class.
+        
+        Args:
+            image_path: Image path or file object
+        
         Returns:
-            Quality metrics (blur, brightness, etc.)
+            Quality metrics (blur, brightness, contrast, glare, skew)
         """
         try:
             from PIL import Image
-            import numpy as np
-            
-            image = Image.open(image_path).convert("L")
-            img_array = np.array(image)
             
-            # Blur detection using Laplacian variance
-            laplacian_var = np.var(np.gradient(img_array))
-            is_blurry = laplacian_var < 100
-            
-            # Brightness check
-            mean_brightness = np.mean(img_array)
-            is_too_dark = mean_brightness < 50
-            is_too_bright = mean_brightness > 200
-            
-            # Contrast check
-            contrast = np.std(img_array)
-            is_low_contrast = contrast < 30
+            with Image.open(image_path) as image:
+                scale = cls.QUALITY_MAX_SIDE / max(image.size)
+                if scale < 1:
+                    image.draft("L", (int(image.size[0] * scale), int(image.size[1] * scale)))
+                image = image.convert("L")
+            factor = -(-max(image.size) // cls.QUALITY_MAX_SIDE)
+            if factor > 1:
+                image = image.reduce(factor)  # Box filter by an integer factor
+            metrics = cls._quality_metrics(np.asarray(image, dtype=np.uint8))
             
             quality_score = 1.0
             issues = []
             
-            if is_blurry:
+            if metrics["sharpness"] < cls.SHARPNESS_THRESHOLD:
                 quality_score -= 0.3
                 issues.append({"en": "Image is blurry", "hi": "छवि धुंधली है"})
-            if is_too_dark:
+            if metrics["brightness"] < cls.DARK_THRESHOLD:
                 quality_score -= 0.2
                 issues.append({"en": "Image is too dark", "hi": "छवि बहुत गहरी है"})
-            if is_too_bright:
+            if metrics["brightness"] > cls.BRIGHT_THRESHOLD:
                 quality_score -= 0.2
                 issues.append({"en": "Image is overexposed", "hi": "छवि अधिक उज्ज्वल है"})
-            if is_low_contrast:
+            if metrics["contrast"] < cls.CONTRAST_THRESHOLD:
                 quality_score -= 0.2
                 issues.append({"en": "Low contrast", "hi": "कम कंट्रास्ट"})
+            if metrics["glare_ratio"] > cls.GLARE_THRESHOLD:
+                quality_score -= 0.2
+                issues.append({"en": "Glare on the document", "hi": "दस्तावेज़ पर चमक है"})
+            if abs(metrics["skew_angle"]) > cls.SKEW_THRESHOLD:
+                quality_score -= 0.1
+                issues.append({"en": "Document is tilted", "hi": "दस्तावेज़ तिरछा है"})
             
             return {
-                "quality_score": max(0, quality_score),
+                "quality_score": round(max(0, quality_score), 2),
                 "is_acceptable": quality_score > 0.5,
-                "metrics": {
-                    "blur_variance": float(laplacian_var),
-                    "brightness": float(mean_brightness),
-                    "contrast": float(contrast)
-                },
+                "metrics": metrics,
                 "issues": issues
             }
             
@@ -835,6 +1014,89 @@ class CNNDocumentClassifier:
                 "metrics": {},
                 "issues": []
             }
+    
+    @classmethod
+    def check_quality_many(cls, image_paths: List[Any], workers: Optional[int] = None) -> List[Dict]:
+        """
+        Check the quality of several uploads in a thread pool
+        
+        Decoding and the numpy kernels release the GIL, so threads scale
+        across cores without copying images between processes.
+        
+        Args:
+            image_paths: Image paths or file objects
+            workers: Threads (default AI_QUALITY_WORKERS or min(8, CPU count))
+        
+        Returns:
+            check_quality result per image, in input order
+        """
+        workers = workers or int(os.environ.get("AI_QUALITY_WORKERS", "0")) or min(8, os.cpu_count() or 1)
+        if workers <= 1 or len(image_paths) <= 1:
+            return [cls.check_quality(path) for path in image_paths]
+        with ThreadPoolExecutor(max_workers=min(workers, len(image_paths))) as pool:
+            return list(pool.map(cls.check_quality, image_paths))
+    
+    @staticmethod
+    def _quality_metrics(gray: np.ndarray) -> Dict[str, float]:
+        """Blur, brightness, contrast, glare and skew of a grayscale uint8 image"""
+        # Brightness and contrast from one 256-bin histogram
+        hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+        levels = np.arange(256, dtype=np.float64)
+        n = max(hist.sum(), 1.0)
+        brightness = float(hist @ levels / n)
+        contrast = float(np.sqrt(max(hist @ (levels * levels) / n - brightness * brightness, 0.0)))
+        
+        # Blur: variance of the 4-neighbour Laplacian [[0,1,0],[1,-4,1],[0,1,0]],
+        # and its energy relative to the central-difference gradient energy
+        pixels = gray.astype(np.int32)
+        laplacian = (
+            pixels[:-2, 1:-1] + pixels[2:, 1:-1] + pixels[1:-1, :-2] + pixels[1:-1, 2:]
+            - 4 * pixels[1:-1, 1:-1]
+        )
+        blur_variance = float(laplacian.var()) if laplacian.size else 0.0
+        sharpness = 0.0
+        if laplacian.size:
+            grad_x = pixels[1:-1, 2:] - pixels[1:-1, :-2]
+            grad_y = pixels[2:, 1:-1] - pixels[:-2, 1:-1]
+            gradient_energy = float(np.einsum("ij,ij->", grad_x, grad_x, dtype=np.float64)
+                                    + np.einsum("ij,ij->", grad_y, grad_y, dtype=np.float64))
+            if gradient_energy > 0:
+                sharpness = float(np.einsum("ij,ij->", laplacian, laplacian, dtype=np.float64)) / gradient_energy
+        
+        # Glare: saturated 16x16 blocks on a document that is not white overall
+        glare_ratio = 0.0
+        block = 16
+        height, width = gray.shape[0] // block * block, gray.shape[1] // block * block
+        median = int(np.searchsorted(np.cumsum(hist), n / 2))
+        if height and width and median < 200:
+            saturated = (gray[:height, :width] >= 250).reshape(height // block, block, width // block, block)
+            saturated_blocks = saturated.sum(axis=(1, 3), dtype=np.int32) > 0.9 * block * block
+            glare_ratio = float(saturated_blocks.mean())
+        
+        return {
+            "blur_variance": round(blur_variance, 2),
+            "sharpness": round(sharpness, 4),
+            "brightness": round(brightness, 2),
+            "contrast": round(contrast, 2),
+            "glare_ratio": round(glare_ratio, 4),
+            "skew_angle": _estimate_skew(gray),
+            "analysis_size": [int(gray.shape[1]), int(gray.shape[0])],
+        }
+
+
+# Per-process OCR engine for AdvancedDocumentValidator's OCR pool
+_worker_ocr: Optional[Any] = None
+
+
+def _init_ocr_worker(ocr_cls: type, kwargs: Dict):
+    global _worker_ocr
+    _worker_ocr = ocr_cls(cache=False, **kwargs)  # The parent owns the cache
+
+
+def _ocr_worker(image_path: str) -> Tuple[Dict, float]:
+    start = time.perf_counter()
+    result = _worker_ocr._ocr_structured(image_path)
+    return result, (time.perf_counter() - start) * 1000
 
 
 class AdvancedDocumentValidator:
@@ -842,6 +1104,11 @@ class AdvancedDocumentValidator:
     Advanced Document Validation Pipeline
     
     Combines OCR, CNN classification, and rule-based validation
+    
+    validate_multiple runs OCR in a bounded process pool (AI_OCR_WORKERS,
+    default min(4, CPU count)) while this process classifies the documents.
+    OCR results go through the engine's content-addressed cache
+    (ocr_cache.py), so re-uploads and re-validations skip OCR.
     """
     
     def __init__(
@@ -849,15 +1116,21 @@ class AdvancedDocumentValidator:
         models_dir: Optional[str] = None,
         use_tesseract: bool = True,
         use_easyocr: bool = False,
-        use_cnn: bool = True
+        use_cnn: bool = True,
+        ocr_workers: Optional[int] = None,
+        ocr_cache: Optional[OCRCache] = None
     ):
         self.models_dir = Path(models_dir) if models_dir else None
+        self.ocr_workers = ocr_workers if ocr_workers is not None else (
+            int(os.environ.get("AI_OCR_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+        )
+        self._ocr_pool: Optional[ProcessPoolExecutor] = None
         
         # Initialize OCR
         if use_tesseract:
-            self.ocr = TesseractOCR()
+            self.ocr = TesseractOCR(cache=ocr_cache)
         elif use_easyocr:
-            self.ocr = EasyOCRExtractor()
+            self.ocr = EasyOCRExtractor(cache=ocr_cache)
         else:
             self.ocr = None
         
@@ -881,9 +1154,54 @@ class AdvancedDocumentValidator:
         Returns:
             Extraction result with text and blocks
         """
-        if self.ocr:
-            return self.ocr.extract_structured(image_path)
-        return {"text": "", "blocks": []}
+        if not self.ocr:
+            return {"text": "", "blocks": []}
+        return self.ocr.extract_structured(image_path)
+    
+    # ------------------------------------------------------------------
+    # OCR cache and pool
+    # ------------------------------------------------------------------
+    
+    def _ocr_engine_spec(self) -> Tuple[type, Dict]:
+        """Class and constructor arguments to rebuild the OCR engine in a worker"""
+        if isinstance(self.ocr, EasyOCRExtractor):
+            return EasyOCRExtractor, {"languages": self.ocr.languages}
+        return type(self.ocr), {"lang": self.ocr.lang}
+    
+    def _ocr_cache_lookup(self, image_path: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """Cache key and cached structured OCR for an image ((None, None) without a cache)"""
+        if self.ocr is None or self.ocr.cache is None:
+            return None, None
+        return self.ocr.cache.lookup(image_path, self.ocr.cache_identity("structured"))
+    
+    def _ocr_cache_put(self, key: Optional[str], result: Dict):
+        if key is not None:
+            self.ocr.cache.put(key, result, self.ocr.cache_identity("structured"))
+    
+    def _run_ocr(self, image_path: str) -> Dict:
+        """Structured OCR in this process, bypassing the cache"""
+        return self.ocr._ocr_structured(image_path) if self.ocr else {"text": "", "blocks": []}
+    
+    def _get_ocr_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Shared OCR worker pool (None when OCR runs in this process)"""
+        if self.ocr is None or self.ocr_workers < 1:
+            return None
+        if not getattr(self.ocr, "tesseract_available", True) or getattr(self.ocr, "reader", True) is None:
+            return None  # Engine unavailable: OCR returns immediately, nothing to overlap
+        if self._ocr_pool is None:
+            ocr_cls, kwargs = self._ocr_engine_spec()
+            self._ocr_pool = ProcessPoolExecutor(
+                max_workers=self.ocr_workers,
+                initializer=_init_ocr_worker,
+                initargs=(ocr_cls, kwargs)
+            )
+        return self._ocr_pool
+    
+    def close(self):
+        """Shut down the OCR worker pool"""
+        if self._ocr_pool is not None:
+            self._ocr_pool.shutdown(cancel_futures=True)
+            self._ocr_pool = None
     
     def classify_document(self, image_path: str) -> Dict:
         """
@@ -995,8 +1313,27 @@ class AdvancedDocumentValidator:
             image_path: Path to document image
             
         Returns:
-            Comprehensive validation result
+            Comprehensive validation result (with per-stage timings_ms)
         """
+        timings = {}
+        start = time.perf_counter()
+        classification = self.classify_document(image_path)
+        timings["classify"] = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        key, ocr_result = self._ocr_cache_lookup(image_path)
+        timings["hash"] = (time.perf_counter() - start) * 1000
+        cached = ocr_result is not None
+        if not cached:
+            start = time.perf_counter()
+            ocr_result = self._run_ocr(image_path)
+            timings["ocr"] = (time.perf_counter() - start) * 1000
+            self._ocr_cache_put(key, ocr_result)
+        
+        return self._build_result(classification, ocr_result, cached, timings)
+    
+    def _build_result(self, classification: Dict, ocr_result: Dict, ocr_cached: bool, timings: Dict) -> Dict:
+        """Quality issues, field extraction and field validation for one document"""
         result = {
             "status": "unknown",
             "document_type": "unknown",
@@ -1006,11 +1343,12 @@ class AdvancedDocumentValidator:
             "extracted_fields": {},
             "field_validation": {},
             "issues": [],
-            "recommendations": []
+            "recommendations": [],
+            "ocr_cached": ocr_cached,
+            "timings_ms": timings
         }
         
         # Step 1: Classify document and check quality
-        classification = self.classify_document(image_path)
         result["document_type"] = classification["document_type"]
         result["type_confidence"] = classification["type_confidence"]
         result["quality"] = classification["quality"]
@@ -1024,7 +1362,6 @@ class AdvancedDocumentValidator:
             })
         
         # Step 2: Extract text
-        ocr_result = self.extract_text(image_path)
         result["extracted_text"] = ocr_result.get("text", "")
         
         if not result["extracted_text"]:
@@ -1033,15 +1370,19 @@ class AdvancedDocumentValidator:
                 "hi": "दस्तावेज़ से टेक्स्ट नहीं निकाल सका"
             })
             result["status"] = "failed"
+            self._finish_timings(timings)
             return result
         
         # Step 3: Extract fields based on document type
+        start = time.perf_counter()
         result["extracted_fields"] = self.extract_document_fields(
             result["extracted_text"],
             result["document_type"]
         )
+        timings["extract"] = (time.perf_counter() - start) * 1000
         
         # Step 4: Validate extracted fields
+        start = time.perf_counter()
         if result["extracted_fields"]:
             validation = self.rule_validator.validate_form_fields(result["extracted_fields"])
             result["field_validation"] = validation
@@ -1058,24 +1399,93 @@ class AdvancedDocumentValidator:
                 "en": "Could not extract all required fields",
                 "hi": "सभी आवश्यक फ़ील्ड नहीं निकाल सके"
             })
+        timings["validate"] = (time.perf_counter() - start) * 1000
         
+        self._finish_timings(timings)
         return result
     
+    @staticmethod
+    def _finish_timings(timings: Dict):
+        """Round stage timings and add their total (excluding time spent waiting)"""
+        timings["total"] = sum(ms for stage, ms in timings.items() if stage != "ocr_wait")
+        for stage in timings:
+            timings[stage] = round(timings[stage], 2)
+    
     def validate_multiple(self, documents: List[Dict]) -> Dict:
         """
         Validate multiple documents
         
+        OCR of all documents is submitted to the OCR pool first; documents
+        are classified here while it runs, then each result is assembled as
+        its OCR finishes. Documents with the same content are OCR'd once.
+        
         Args:
             documents: List of {"path": str, "expected_type": str}
             
         Returns:
-            Validation results for all documents
+            Validation results for all documents (each with timings_ms)
         """
+        batch_start = time.perf_counter()
+        timings = [{} for _ in documents]
+        
+        # Stage 1: content hashes, cache lookups and OCR submission
+        keys, ocr_results = [], [None] * len(documents)
+        for i, doc in enumerate(documents):
+            start = time.perf_counter()
+            key, ocr_results[i] = self._ocr_cache_lookup(doc["path"])
+            keys.append(key)
+            timings[i]["hash"] = (time.perf_counter() - start) * 1000
+        cached = [result is not None for result in ocr_results]
+        
+        pool = self._get_ocr_pool() if not all(cached) else None
+        futures, submitted = {}, {}
+        if pool is not None:
+            for i, doc in enumerate(documents):
+                if cached[i]:
+                    continue
+                # Identical uploads in one batch share a single OCR job
+                if keys[i] is not None and keys[i] in submitted:
+                    futures[i] = submitted[keys[i]]
+                    continue
+                futures[i] = pool.submit(_ocr_worker, doc["path"])
+                if keys[i] is not None:
+                    submitted[keys[i]] = futures[i]
+        
+        # Stage 2: classify every document while OCR runs in the pool
+        classifications = []
+        for i, doc in enumerate(documents):
+            start = time.perf_counter()
+            classifications.append(self.classify_document(doc["path"]))
+            timings[i]["classify"] = (time.perf_counter() - start) * 1000
+        
+        # Stage 3: collect OCR (in order) and assemble results
         results = []
         all_valid = True
         
-        for doc in documents:
-            result = self.validate_document(doc["path"])
+        for i, doc in enumerate(documents):
+            if ocr_results[i] is None:
+                ocr_result = None
+                if i in futures:
+                    start = time.perf_counter()
+                    try:
+                        ocr_result, ocr_ms = futures[i].result()
+                        timings[i]["ocr"] = ocr_ms
+                    except Exception as e:
+                        logger.warning(f"OCR worker failed for {doc['path']}: {e}")
+                        if isinstance(e, BrokenProcessPool):
+                            self._ocr_pool = None
+                    timings[i]["ocr_wait"] = (time.perf_counter() - start) * 1000
+                elif keys[i] is not None:
+                    ocr_result = self.ocr.cache.get(keys[i])  # Duplicate of an earlier document
+                    cached[i] = ocr_result is not None
+                if ocr_result is None:
+                    start = time.perf_counter()
+                    ocr_result = self._run_ocr(doc["path"])
+                    timings[i]["ocr"] = (time.perf_counter() - start) * 1000
+                self._ocr_cache_put(keys[i], ocr_result)
+                ocr_results[i] = ocr_result
+            
+            result = self._build_result(classifications[i], ocr_results[i], cached[i], timings[i])
             
             # Check if type matches expected
             if doc.get("expected_type"):
@@ -1098,7 +1508,8 @@ class AdvancedDocumentValidator:
             "all_valid": all_valid,
             "valid_count": sum(1 for r in results if r["result"]["status"] == "valid"),
             "total_count": len(results),
-            "documents": results
+            "documents": results,
+            "elapsed_ms": round((time.perf_counter() - batch_start) * 1000, 2)
         }
 
 
@@ -1114,7 +1525,7 @@ def extract_document_text(image_path: str, use_easyocr: bool = False) -> str:
     Returns:
         Extracted text
     """
-    validator = AdvancedDocumentValidator(use_tesseract=not use_easyocr, use_easyocr=use_easyocr)
+    validator = get_model("document_validator", use_tesseract=not use_easyocr, use_easyocr=use_easyocr)
     result = validator.extract_text(image_path)
     return result.get("text", "")
 
@@ -1131,7 +1542,7 @@ def validate_document(image_path: str, expected_type: Optional[str] = None, mode
     Returns:
         Validation result
     """
-    validator = AdvancedDocumentValidator(models_dir=models_dir)
+    validator = get_model("document_validator", models_dir)
     result = validator.validate_document(image_path)
     
     if expected_type and result["document_type"] != expected_type:
@@ -1154,5 +1565,4 @@ def check_document_quality(image_path: str) -> Dict:
     Returns:
         Quality assessment
     """
-    classifier = CNNDocumentClassifier()
-    return classifier.check_quality(image_path)
+    return CNNDocumentClassifier.check_quality(image_path)
@@ -0,0 +1,132 @@
+"""
+Bag-of-Words Intent Classifier Benchmark
+========================================
+Training time and prediction throughput of BagOfWordsClassifier: the
+original nested-dict implementation vs the sparse CSR one, on a synthetic
+message log with a chat-sized vocabulary (typos, names, numbers).
+
+Usage:
+    python benchmarks/bench_bow_classifier.py [n_messages] [vocab_size]
+"""
+
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.intent_classifier import BagOfWordsClassifier
+
+INTENTS = [
+    "job_search", "job_details", "job_apply", "job_status",
+    "scheme_search", "scheme_details", "scheme_apply", "scheme_eligibility",
+    "register", "login", "profile_update", "help",
+    "upload_document", "fill_form", "check_status",
+    "greeting", "feedback", "complaint", "unclear"
+]
+
+
+class LegacyBagOfWords:
+    """The original dict-of-dicts train/predict"""
+
+    def __init__(self):
+        self.word_weights = {}
+
+    def predict(self, text):
+        words = re.findall(r'\b\w+\b', text.lower())
+        scores = {}
+        for intent, weights in self.word_weights.items():
+            score = sum(weights.get(word, 0) for word in words)
+            if score > 0:
+                scores[intent] = score
+        if not scores:
+            return "unclear", 0.3
+        best_intent = max(scores, key=scores.get)
+        total = sum(scores.values())
+        return best_intent, scores[best_intent] / total if total > 0 else 0.5
+
+    def train(self, data):
+        word_counts, intent_counts = {}, {}
+        for item in data:
+            intent = item.get("intent", "unclear")
+            words = re.findall(r'\b\w+\b', item.get("text", "").lower())
+            if intent not in word_counts:
+                word_counts[intent] = {}
+            intent_counts[intent] = intent_counts.get(intent, 0) + 1
+            for word in words:
+                word_counts[intent][word] = word_counts[intent].get(word, 0) + 1
+        for intent, counts in word_counts.items():
+            self.word_weights[intent] = {}
+            for word, count in counts.items():
+                tf = count / intent_counts[intent]
+                idf = len(word_counts) / sum(1 for ic in word_counts.values() if word in ic)
+                self.word_weights[intent][word] = tf * idf
+
+
+def make_log(n_messages: int, vocab_size: int, seed: int = 0):
+    """
+    Labelled messages: intent-specific words, common Zipf-like words and a
+    long tail of rare tokens (typos, names, numbers) spread over all intents
+    """
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(vocab_size)]
+    data = []
+    for _ in range(n_messages):
+        intent_id = rng.randrange(len(INTENTS))
+        words = []
+        for _ in range(rng.randint(2, 12)):
+            draw = rng.random()
+            if draw < 0.4:
+                words.append(vocab[(intent_id * 997 + int(rng.paretovariate(1.2))) % vocab_size])
+            elif draw < 0.7:
+                words.append(vocab[min(int(rng.paretovariate(0.6)), vocab_size - 1)])
+            else:
+                words.append(vocab[rng.randrange(vocab_size)])
+        data.append({"text": " ".join(words), "intent": INTENTS[intent_id]})
+    return data
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(n_messages: int = 200_000, vocab_size: int = 50_000):
+    print("=" * 60)
+    print(f"BAG-OF-WORDS CLASSIFIER  ({n_messages} messages, vocab {vocab_size})")
+    print("=" * 60)
+    data = make_log(n_messages, vocab_size)
+    texts = [item["text"] for item in data[:20_000]]
+
+    legacy = LegacyBagOfWords()
+    sparse = BagOfWordsClassifier()
+    sparse.word_weights = {}  # Start empty like the legacy class
+    legacy_train = timed(lambda: legacy.train(data))[1]
+    sparse_train = timed(lambda: sparse.train(data))[1]
+    print(f"Vocabulary: {len(sparse.vocabulary)} terms, {len(sparse.data)} non-zero weights")
+    print(f"{'train (legacy)':<28}{legacy_train:>10.2f} s")
+    print(f"{'train (sparse)':<28}{sparse_train:>10.2f} s   ({legacy_train / sparse_train:.0f}x)")
+
+    expected, legacy_predict = timed(lambda: [legacy.predict(t) for t in texts])
+    single, single_predict = timed(lambda: [sparse.predict(t) for t in texts])
+    batch, batch_predict = timed(lambda: sparse.predict_batch(texts))
+    print(f"{'predict loop (legacy)':<28}{len(texts) / legacy_predict:>10,.0f} msg/s")
+    print(f"{'predict loop (sparse)':<28}{len(texts) / single_predict:>10,.0f} msg/s")
+    print(f"{'predict_batch (sparse)':<28}{len(texts) / batch_predict:>10,.0f} msg/s")
+    assert single == expected and batch == expected
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("bow_weights.json", "bow_weights.npz"):
+            path = os.path.join(tmp, name)
+            _, save_seconds = timed(lambda: sparse.save(path))
+            loaded, load_seconds = timed(lambda: BagOfWordsClassifier(model_path=path))
+            assert loaded.predict_batch(texts[:1000]) == expected[:1000]
+            print(f"{name:<28}{os.path.getsize(path) / 2**20:>10.1f} MB  save {save_seconds:.2f} s  load {load_seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
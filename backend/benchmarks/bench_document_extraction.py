@@ -0,0 +1,135 @@
+"""
+Document Text Extraction Benchmark
+==================================
+Per-document latency of DocumentValidator.identify_document_type +
+extract_fields_from_text on long multi-page OCR dumps: the original seven
+regex searches and per-type substring scans vs the combined field scan and
+the compiled phrase table, plus extract_many on a batch with re-uploads.
+Also times KeywordAutomaton for the document-type phrases for reference.
+
+Usage:
+    python benchmarks/bench_document_extraction.py [n_documents] [pages]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.keyword_automaton import KeywordAutomaton
+from ai.validator import DocumentValidator
+
+WORDS = [
+    "the", "of", "and", "name", "address", "father", "date", "birth", "district",
+    "state", "village", "post", "office", "government", "india", "income", "tax",
+    "certificate", "department", "issued", "authority", "signature", "valid",
+    "नाम", "पता", "जन्म", "तिथि", "पिता", "जिला", "राज्य", "सरकार", "प्रमाणपत्र",
+    "Sr.", "No.", "Page", "of", "—", "|", ":", "1", "25", "2019",
+]
+FIELDS = [
+    "1234 5678 9012", "ABCDE1234F", "ram.kumar@gmail.com", "9876543210",
+    "12/05/1990", "01-04-2023", "ABC1234567", "MH1420110062821",
+]
+
+
+def make_dump(rng: random.Random, pages: int) -> str:
+    """OCR text of a scanned multi-page document: mostly prose, a few field values"""
+    lines = []
+    for _ in range(pages):
+        for _ in range(45):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(6, 14))]
+            if rng.random() < 0.04:
+                words.insert(rng.randrange(len(words)), rng.choice(FIELDS))
+            lines.append(" ".join(words))
+    return "\n".join(lines)
+
+
+def legacy_extract(validator: DocumentValidator, text: str):
+    """The original identify_document_type + extract_fields_from_text"""
+    text_lower = text.lower()
+    scores = {}
+    for doc_type, patterns in validator.DOCUMENT_PATTERNS.items():
+        score = 0.0
+        keywords_list = patterns.get("keywords", [])
+        keyword_matches = sum(1 for kw in keywords_list if kw.lower() in text_lower)
+        if keyword_matches > 0:
+            score += (keyword_matches / len(keywords_list)) * 0.6
+        field_names = patterns.get("field_names", [])
+        field_matches = sum(1 for fn in field_names if fn.lower() in text_lower)
+        if field_matches > 0:
+            score += (field_matches / len(field_names)) * 0.4
+        scores[doc_type] = score
+    best_doc_type = max(scores, key=scores.get)
+
+    extracted = {}
+    aadhar_match = re.search(r'\b(\d{4}\s?\d{4}\s?\d{4}|\d{12})\b', text)
+    if aadhar_match:
+        extracted["aadhar"] = re.sub(r'\s', '', aadhar_match.group(1))
+    pan_match = re.search(r'\b([A-Z]{5}[0-9]{4}[A-Z]{1})\b', text)
+    if pan_match:
+        extracted["pan"] = pan_match.group(1)
+    email_match = re.search(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b', text)
+    if email_match:
+        extracted["email"] = email_match.group(0)
+    phone_match = re.search(r'\b[6-9]\d{9}\b', text)
+    if phone_match:
+        extracted["phone"] = phone_match.group(0)
+    date_matches = re.findall(r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{4})\b', text)
+    if date_matches:
+        extracted["dates"] = date_matches
+    voter_match = re.search(r'\b([A-Z]{3}\d{7})\b', text)
+    if voter_match:
+        extracted["voter_id"] = voter_match.group(1)
+    dl_match = re.search(r'\b([A-Z]{2}\d{13})\b', text)
+    if dl_match:
+        extracted["driving_license"] = dl_match.group(1)
+    return (best_doc_type, scores[best_doc_type]), extracted
+
+
+def main(n_documents: int = 40, pages: int = 10):
+    print("=" * 60)
+    print(f"DOCUMENT TEXT EXTRACTION  ({n_documents} OCR dumps, {pages} pages each)")
+    print("=" * 60)
+    rng = random.Random(0)
+    texts = [make_dump(rng, pages) for _ in range(n_documents)]
+    print(f"average dump: {sum(map(len, texts)) // len(texts)} chars")
+    validator = DocumentValidator()
+
+    start = time.perf_counter()
+    legacy = [legacy_extract(validator, text) for text in texts]
+    legacy_ms = (time.perf_counter() - start) / n_documents * 1000
+
+    start = time.perf_counter()
+    compiled = [
+        (validator.identify_document_type(text), validator.extract_fields_from_text(text))
+        for text in texts
+    ]
+    compiled_ms = (time.perf_counter() - start) / n_documents * 1000
+    assert compiled == legacy
+
+    # Half the batch re-uploaded
+    batch = texts + texts[: n_documents // 2]
+    start = time.perf_counter()
+    many = validator.extract_many(batch)
+    many_ms = (time.perf_counter() - start) / len(batch) * 1000
+    assert [result["fields"] for result in many] == [fields for _, fields in legacy + legacy[: n_documents // 2]]
+
+    phrases = [phrase for phrase, _ in validator.compile_patterns()["phrases"]]
+    automaton = KeywordAutomaton(phrases)
+    start = time.perf_counter()
+    for text in texts:
+        automaton.find_all(text.lower())
+    automaton_ms = (time.perf_counter() - start) / n_documents * 1000
+
+    print(f"{'method':<38}{'ms/doc':>10}")
+    print(f"{'legacy (7 searches + substring scans)':<38}{legacy_ms:>10.2f}")
+    print(f"{'combined scan + phrase table':<38}{compiled_ms:>10.2f}")
+    print(f"{'extract_many (1/3 re-uploads)':<38}{many_ms:>10.2f}")
+    print(f"{'  ref: KeywordAutomaton phrases only':<38}{automaton_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,80 @@
+"""
+Field Classifier Benchmark
+==========================
+Per-field latency of FieldClassifier.classify_field: the original
+per-pattern re.search + _calculate_confidence loop vs the compiled tier
+regexes, without and with the label memo, on portal-style form labels.
+
+Usage:
+    python benchmarks/bench_field_classifier.py [n_fields]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.field_classifier import FieldClassifier, FieldType
+
+LABELS = [
+    "Full Name", "Applicant Name", "Name", "First Name", "Surname", "Father's Name",
+    "Mother Name", "Email", "E-mail ID", "Mobile No.", "Phone", "Date of Birth",
+    "DOB", "Age", "Gender", "Address", "Current Address", "City", "State",
+    "Pincode", "Postal Code", "Aadhaar Number", "PAN", "Voter ID", "Qualification",
+    "Occupation", "Company Name", "Annual Income", "Category", "नाम", "पिता का नाम",
+    "मोबाइल", "पता", "आधार", "Remarks", "Upload Photo", "Declaration", "Signature",
+]
+IDS = ["", "txtName", "applicant_name", "email", "mobile", "dob", "addr1", "field_7"]
+
+
+def legacy_classify(text_label: str, field_id: str = ""):
+    """The original classify_field loop"""
+    combined_text = f"{text_label} {field_id}".lower().strip()
+    if not combined_text:
+        return FieldType.OTHER, 0.0
+    best_match = (FieldType.OTHER, 0.0)
+    for field_type, patterns in FieldClassifier.FIELD_PATTERNS.items():
+        for pattern in patterns:
+            if re.search(pattern, combined_text, re.IGNORECASE):
+                if re.fullmatch(pattern, combined_text, re.IGNORECASE):
+                    confidence = 1.0
+                elif re.search(rf"\b{pattern}\b", combined_text, re.IGNORECASE):
+                    confidence = 0.85
+                else:
+                    confidence = 0.6
+                if confidence > best_match[1]:
+                    best_match = (field_type, confidence)
+    return best_match
+
+
+def main(n_fields: int = 50_000):
+    print("=" * 60)
+    print(f"FIELD CLASSIFIER  ({n_fields} fields)")
+    print("=" * 60)
+    rng = random.Random(0)
+    fields = [(rng.choice(LABELS), rng.choice(IDS)) for _ in range(n_fields)]
+    distinct = [(f"{label} {i}", field_id) for i, (label, field_id) in enumerate(fields)]
+
+    rows = [
+        ("legacy loop", lambda label, field_id: legacy_classify(label, field_id), fields),
+        ("compiled tiers (no memo)", FieldClassifier(cache_size=0).classify_field, fields),
+        ("compiled tiers + memo", FieldClassifier().classify_field, fields),
+        ("legacy loop, distinct", lambda label, field_id: legacy_classify(label, field_id), distinct),
+        ("compiled tiers, distinct", FieldClassifier(cache_size=0).classify_field, distinct),
+    ]
+    print(f"{'method':<30}{'µs/field':>10}")
+    results = {}
+    for name, classify, inputs in rows:
+        start = time.perf_counter()
+        results[name] = [classify(label, field_id) for label, field_id in inputs]
+        print(f"{name:<30}{(time.perf_counter() - start) / len(inputs) * 1e6:>10.2f}")
+
+    assert results["legacy loop"] == results["compiled tiers (no memo)"] == results["compiled tiers + memo"]
+    assert results["legacy loop, distinct"] == results["compiled tiers, distinct"]
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,107 @@
+"""
+Form Field Detection Benchmark
+==============================
+Per-page latency of the rule-based CNNFieldDetector pipeline (working-
+resolution cap, coarse ink pass, overlapping tiles, NMS) on synthetic
+scanned application forms, in-process vs a process pool, with recall
+against the drawn fields.
+
+Usage:
+    python benchmarks/bench_field_detection.py [n_pages] [scan_scale] [workers]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+
+from ai.field_classifier import CNNFieldDetector
+
+A4_200DPI = (1654, 2339)
+
+
+def make_form(seed: int, scale: int = 1):
+    """A4 page with underlined fields, text boxes, checkboxes and instructions"""
+    rng = random.Random(seed)
+    width, height = A4_200DPI
+    image = Image.new("L", (width, height), 235)
+    draw = ImageDraw.Draw(image)
+    truth = []
+    y = 60
+    while y < height - 150:
+        kind = rng.choice(["underline", "box", "checkbox", "text"])
+        x = rng.randint(50, 400)
+        if kind == "underline":
+            length = rng.randint(200, 800)
+            draw.text((x, y - 25), "Name of applicant", fill=20)
+            draw.line([(x, y), (x + length, y)], fill=10, width=2)
+            truth.append(("text_field", x, y))
+            y += rng.randint(45, 90)
+        elif kind == "box":
+            length, box_height = rng.randint(150, 700), rng.randint(25, 60)
+            draw.rectangle([x, y, x + length, y + box_height], outline=10, width=2)
+            truth.append(("text_box", x, y))
+            y += box_height + rng.randint(30, 70)
+        elif kind == "checkbox":
+            size = rng.randint(14, 30)
+            draw.rectangle([x, y, x + size, y + size], outline=10, width=2)
+            draw.text((x + size + 10, y), "I agree", fill=20)
+            truth.append(("checkbox", x, y))
+            y += size + rng.randint(25, 60)
+        else:
+            draw.text((x, y), "Read the instructions carefully before filling the form " * 2, fill=20)
+            y += rng.randint(25, 50)
+    if scale != 1:
+        image = image.resize((width * scale, height * scale))
+    return image, [(kind, x * scale, y * scale) for kind, x, y in truth]
+
+
+def recall(fields, truth, scale: int) -> int:
+    tolerance = 8 * scale
+    return sum(
+        any(
+            field["field_type"] == kind and abs(field["bbox"][0] - x) <= tolerance
+            and min(abs(field["bbox"][1] - y), abs(field["bbox"][3] - y)) <= tolerance
+            for field in fields
+        )
+        for kind, x, y in truth
+    )
+
+
+def main(n_pages: int = 8, scan_scale: int = 2, workers: int = 0):
+    workers = workers or os.cpu_count() or 1
+    print("=" * 72)
+    print(f"FORM FIELD DETECTION  ({n_pages} pages, {A4_200DPI[0] * scan_scale}x{A4_200DPI[1] * scan_scale} scans)")
+    print("=" * 72)
+    forms = [make_form(seed, scan_scale) for seed in range(n_pages)]
+    pages = [page for page, _ in forms]
+
+    baseline = None
+    for label, n_workers in (("in-process", 1), (f"pool x{workers}", workers)):
+        detector = CNNFieldDetector(workers=n_workers)
+        detector.detect_pages(pages[:1])  # Start the long-lived pool outside the timing
+        start = time.perf_counter()
+        results = detector.detect_pages(pages)
+        elapsed = time.perf_counter() - start
+        detector.close()
+        found = sum(recall(r["fields"], truth, scan_scale) for r, (_, truth) in zip(results, forms))
+        expected = sum(len(truth) for _, truth in forms)
+        print(f"{label:<14}{elapsed / n_pages * 1000:>9.1f} ms/page   recall {found}/{expected}")
+        fields = [r["fields"] for r in results]
+        assert baseline is None or fields == baseline
+        baseline = fields
+
+    timing = dict(detector.last_timings[0])
+    print(f"\nPage 0: {timing.pop('tiles')} tiles refined, {timing.pop('tiles_skipped')} skipped")
+    print(f"{'stage':<14}{'ms':>10}")
+    for stage, ms in timing.items():
+        if stage != "page":
+            print(f"{stage:<14}{ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,71 @@
+"""
+Intent Batch Classification Throughput
+======================================
+Messages per second for IntentClassifier batch classification: the
+original one-classify()-per-message loop vs iter_classify() on 1, 2 and
+N processes, on a WhatsApp-style corpus with realistic duplication.
+
+Usage:
+    python benchmarks/bench_intent_batch.py [n_messages] [n_workers]
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ai.intent_classifier import IntentClassifier
+from bench_intent_matcher import make_corpus
+
+
+def throughput(fn, corpus):
+    start = time.perf_counter()
+    count = sum(1 for _ in fn(corpus))
+    elapsed = time.perf_counter() - start
+    return count / elapsed, elapsed
+
+
+def main(n_messages: int = 200_000, n_workers: int = 0):
+    n_workers = n_workers or os.cpu_count() or 1
+    print("=" * 60)
+    print(f"INTENT BATCH THROUGHPUT  ({n_messages} messages)")
+    print("=" * 60)
+    
+    classifier = IntentClassifier()
+    corpus = make_corpus(n_messages)
+    unique = len({classifier.preprocess_message(m) for m in corpus})
+    print(f"Unique normalized messages: {unique} ({unique / n_messages:.1%})")
+    
+    rows = [("classify() loop", lambda msgs: (classifier.classify(m) for m in msgs))]
+    for workers in sorted({1, 2, n_workers}):
+        rows.append((
+            f"iter_classify workers={workers}",
+            lambda msgs, w=workers: classifier.iter_classify(msgs, workers=w)
+        ))
+    
+    baseline = None
+    print(f"{'method':<30}{'msg/s':>12}{'seconds':>10}")
+    for name, fn in rows:
+        rate, elapsed = throughput(fn, corpus)
+        baseline = baseline or rate
+        print(f"{name:<30}{rate:>12,.0f}{elapsed:>10.2f}   ({rate / baseline:.1f}x)")
+    
+    # Same results as classify()
+    sample = corpus[:5000]
+    assert list(classifier.iter_classify(sample, workers=2, chunk_size=500)) == [
+        classifier.classify(m) for m in sample
+    ]
+    
+    # Worst case for dedupe: every message distinct
+    distinct = [f"{m} #{i}" for i, m in enumerate(corpus)]
+    print(f"\nAll-distinct corpus ({n_messages} unique):")
+    for workers in sorted({1, n_workers}):
+        rate, elapsed = throughput(lambda msgs, w=workers: classifier.iter_classify(msgs, workers=w), distinct)
+        print(f"{f'iter_classify workers={workers}':<30}{rate:>12,.0f}{elapsed:>10.2f}")
+    classifier.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
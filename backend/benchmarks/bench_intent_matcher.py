@@ -0,0 +1,113 @@
+"""
+Intent Keyword Matcher Benchmark
+================================
+Per-message cost of IntentClassifier keyword scoring: the original
+per-intent substring scan vs the compiled keyword automaton
+(score_intents), on a WhatsApp-style English/Hindi/Hinglish corpus.
+Also checks that both produce identical scores.
+
+Usage:
+    python benchmarks/bench_intent_matcher.py [n_messages]
+"""
+
+import sys
+import os
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.intent_classifier import IntentClassifier, IntentType
+
+
+TEMPLATES = [
+    "hi", "Hello!! koi job hai kya?", "namaste 🙏", "good morning sir",
+    "naukri chahiye Bihar me 12th pass ke liye", "railway me vacancy hai?",
+    "Latest jobs in UP for graduates", "मुझे नौकरी चाहिए", "कोई नई भर्ती आई है क्या",
+    "apply kaise kare SSC CGL ke liye", "How to apply for this post?", "फॉर्म भरना है, मदद करो",
+    "mera status kya hai", "result aaya kya?", "application status check karo pls",
+    "PM kisan yojana ke baare me batao", "koi scheme chahiye kisan ke liye", "कौन सी योजना मेरे लिए है",
+    "am i eligible for this scheme?", "मैं पात्र हूं क्या", "password bhul gaya, login nahi ho raha",
+    "profile update karna hai", "aadhar upload kaise kare", "document upload karo",
+    "app not working, payment failed!!", "complaint karna hai", "bahut accha laga, thanks",
+    "salary kitni hai is job me?", "age limit kya hai", "syllabus details batao",
+    "ok", "??", "haan", "kal baat karte hai",
+]
+
+
+def make_corpus(n_messages: int, seed: int = 0):
+    """WhatsApp-like messages: templates, some joined, random casing/punctuation"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n_messages):
+        parts = [rng.choice(TEMPLATES) for _ in range(rng.choice([1, 1, 1, 2, 3]))]
+        message = ". ".join(parts)
+        if rng.random() < 0.3:
+            message = message.upper()
+        corpus.append(message + rng.choice(["", "", "?", "!!", " ..."]))
+    return corpus
+
+
+def legacy_scores(classifier: IntentClassifier, message: str):
+    """The original classify() loop: one substring scan per intent"""
+    scores = {}
+    for intent in IntentType:
+        text = classifier.preprocess_message(message)
+        keywords = classifier.extract_keywords(text)
+        if not keywords:
+            scores[intent] = 0.0
+            continue
+        pattern = classifier.INTENT_PATTERNS.get(intent, {})
+        base_weight = pattern.get("weight", 0.5)
+        score = 0.0
+        for phrase in classifier._get_all_phrases(pattern):
+            if phrase in text:
+                score += 0.3
+        all_pattern_keywords = classifier._get_all_keywords(pattern)
+        keyword_matches = 0
+        for pattern_kw in all_pattern_keywords:
+            if pattern_kw in text:
+                keyword_matches += 1
+        for kw in keywords:
+            if kw in all_pattern_keywords:
+                keyword_matches += 1
+        if keyword_matches > 0:
+            score += min(keyword_matches * 0.15, 0.7) * base_weight
+        scores[intent] = min(score, 1.0)
+    return scores
+
+
+def timed(fn, corpus):
+    start = time.perf_counter()
+    results = [fn(message) for message in corpus]
+    return results, (time.perf_counter() - start) * 1e6 / len(corpus)
+
+
+def main(n_messages: int = 20_000):
+    print("=" * 60)
+    print(f"INTENT MATCHER BENCHMARK  ({n_messages} messages)")
+    print("=" * 60)
+    
+    classifier = IntentClassifier()
+    corpus = make_corpus(n_messages)
+    
+    start = time.perf_counter()
+    compiled = classifier.compile_patterns()
+    print(f"Compile: {(time.perf_counter() - start) * 1000:.2f} ms "
+          f"({len(compiled['automaton'])} patterns)")
+    
+    legacy, legacy_us = timed(lambda m: legacy_scores(classifier, m), corpus)
+    fast, fast_us = timed(classifier.score_intents, corpus)
+    mismatches = sum(a != b for a, b in zip(legacy, fast))
+    
+    _, classify_us = timed(classifier.classify, corpus)
+    
+    print(f"{'method':<28}{'us/message':>12}")
+    print(f"{'legacy per-intent scan':<28}{legacy_us:>12.1f}")
+    print(f"{'compiled automaton':<28}{fast_us:>12.1f}   ({legacy_us / fast_us:.1f}x)")
+    print(f"{'classify() end to end':<28}{classify_us:>12.1f}")
+    print(f"Score mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
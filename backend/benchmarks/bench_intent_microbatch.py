@@ -0,0 +1,78 @@
+"""
+DistilBERT Intent Micro-Batching
+================================
+Predictions per second for DistilBERTIntentClassifier under concurrent
+chat traffic: one predict() forward pass per request vs predict_async()
+through the micro-batcher, plus the batch size / latency histograms.
+
+Needs transformers + torch (downloads the base model on first run).
+
+Usage:
+    python benchmarks/bench_intent_microbatch.py [n_requests] [concurrency] [max_batch]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ai.intent_classifier import DistilBERTIntentClassifier
+from bench_intent_matcher import make_corpus
+
+
+async def run_concurrent(predict, corpus, concurrency: int):
+    """Fire corpus at predict() from `concurrency` simulated chat sessions"""
+    cursor = iter(corpus)
+    results = []
+
+    async def session():
+        for text in cursor:
+            results.append(await predict(text))
+
+    await asyncio.gather(*(session() for _ in range(concurrency)))
+    return results
+
+
+def main(n_requests: int = 2000, concurrency: int = 64, max_batch: int = 32):
+    os.environ.setdefault("AI_INTENT_MAX_BATCH", str(max_batch))
+    print("=" * 60)
+    print(f"DISTILBERT MICRO-BATCHING  ({n_requests} requests, {concurrency} concurrent)")
+    print("=" * 60)
+
+    classifier = DistilBERTIntentClassifier()
+    if classifier.model is None:
+        print("DistilBERT model not available (install transformers + torch)")
+        return
+    corpus = make_corpus(n_requests)
+
+    # Baseline: each request runs its own forward pass on the default executor
+    loop_predict = lambda text: asyncio.to_thread(classifier.predict, text)
+    start = time.perf_counter()
+    baseline = asyncio.run(run_concurrent(loop_predict, corpus, concurrency))
+    single_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = asyncio.run(run_concurrent(classifier.predict_async, corpus, concurrency))
+    batched_elapsed = time.perf_counter() - start
+
+    print(f"{'method':<30}{'pred/s':>12}{'seconds':>10}")
+    print(f"{'predict() per request':<30}{n_requests / single_elapsed:>12,.1f}{single_elapsed:>10.2f}")
+    print(f"{'predict_async() batched':<30}{n_requests / batched_elapsed:>12,.1f}{batched_elapsed:>10.2f}"
+          f"   ({single_elapsed / batched_elapsed:.1f}x)")
+
+    # Padding must not change predictions (order differs between runs)
+    assert sorted(intent for intent, _, _ in baseline) == sorted(intent for intent, _, _ in batched)
+
+    stats = classifier.get_batcher_stats()
+    print(f"\nBatches: {stats['batches']}  mean size: {stats['batch_size']['mean']}")
+    for name in ("batch_size", "queue_wait_ms", "inference_ms", "latency_ms"):
+        hist = stats[name]
+        print(f"{name:<16} p50={hist['p50']:<8} p95={hist['p95']:<8} p99={hist['p99']:<8} max={hist['max']}")
+    classifier.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
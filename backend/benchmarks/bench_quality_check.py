@@ -0,0 +1,88 @@
+"""
+Document Quality Check Benchmark
+================================
+Latency of CNNDocumentClassifier.check_quality on phone-sized JPEG uploads:
+the original full-resolution gradient check vs draft decoding + fused
+Laplacian/histogram/glare/skew metrics, and check_quality_many throughput.
+Asserts that the blurred uploads (and only those) are flagged as blurry.
+
+Usage:
+    python benchmarks/bench_quality_check.py [n_images] [megapixels]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from ai.validator import CNNDocumentClassifier
+
+
+def legacy_check_quality(image_path: str) -> dict:
+    """The original full-resolution check (gradient variance, separate passes)"""
+    img_array = np.array(Image.open(image_path).convert("L"))
+    return {
+        "blur_variance": float(np.var(np.gradient(img_array))),
+        "brightness": float(np.mean(img_array)),
+        "contrast": float(np.std(img_array)),
+    }
+
+
+def make_upload(path: str, megapixels: int, seed: int):
+    """Photo of a text document: lines of words, some blurred or tilted"""
+    rng = np.random.default_rng(seed)
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = width * 3 // 4
+    image = Image.new("L", (width, height), int(rng.integers(150, 245)))
+    draw = ImageDraw.Draw(image)
+    for y in range(height // 20, height - height // 20, height // 50):
+        for x in range(width // 30, width - width // 8, width // 12):
+            draw.rectangle([x, y, x + width // 16, y + height // 160], fill=int(rng.integers(10, 60)))
+    if seed % 3 == 1:
+        image = image.filter(ImageFilter.GaussianBlur(6))
+    if seed % 3 == 2:
+        image = image.rotate(float(rng.uniform(-10, 10)), fillcolor=200)
+    image.convert("RGB").save(path, quality=90)
+
+
+def main(n_images: int = 12, megapixels: int = 12):
+    print("=" * 60)
+    print(f"DOCUMENT QUALITY CHECK  ({n_images} JPEGs, {megapixels} MP)")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f"upload_{i}.jpg") for i in range(n_images)]
+        for i, path in enumerate(paths):
+            make_upload(path, megapixels, i)
+
+        rows = [
+            ("legacy (full resolution)", lambda: [legacy_check_quality(p) for p in paths]),
+            ("check_quality", lambda: [CNNDocumentClassifier.check_quality(p) for p in paths]),
+            ("check_quality_many", lambda: CNNDocumentClassifier.check_quality_many(paths)),
+        ]
+        print(f"{'method':<28}{'ms/image':>10}")
+        for name, run in rows:
+            start = time.perf_counter()
+            results = run()
+            print(f"{name:<28}{(time.perf_counter() - start) / n_images * 1000:>10.1f}")
+
+        print("\nmetrics (check_quality_many):")
+        for path, result in zip(paths, results):
+            metrics = result["metrics"]
+            print(f"  {os.path.basename(path):<14}blur {metrics['blur_variance']:>9.1f}  "
+                  f"sharpness {metrics['sharpness']:>6.3f}  "
+                  f"skew {metrics['skew_angle']:>6.2f}  score {result['quality_score']:.2f}")
+
+        # make_upload blurs every third upload (seed % 3 == 1)
+        for i, result in enumerate(results):
+            blurry = any(issue["en"] == "Image is blurry" for issue in result["issues"])
+            assert blurry == (i % 3 == 1), f"upload_{i}: blurry={blurry}, metrics={result['metrics']}"
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,170 @@
+"""
+Quantized (int8) vs PyTorch Transformer Inference
+=================================================
+Exports int8 artifacts for the intent (DistilBERT), field label (BERT) and
+summarizer (T5) models, then loads each backend in a fresh process and
+reports load RSS, per-request latency and parity with the fp32 model
+(max logit delta, label agreement; summary exact-match for T5).
+
+Artifacts go to AI_MODELS_DIR (default: a temporary directory); existing
+*_int8/ directories are reused. Needs transformers + torch.
+
+Usage:
+    python benchmarks/bench_quantized_inference.py [n_texts]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ai.quantization import compare_outputs, export_quantized_models, quantized_dir
+from bench_intent_matcher import make_corpus
+
+FIELD_LABELS = [
+    "Full Name", "Applicant's Name", "Father's Name", "Date of Birth", "DOB (DD/MM/YYYY)",
+    "Mobile No.", "Email ID", "Permanent Address", "Pin Code", "Aadhaar Number",
+    "PAN Card No", "Highest Qualification", "Annual Family Income", "Category (SC/ST/OBC)",
+    "Bank Account Number", "IFSC Code", "आवेदक का नाम", "जन्म तिथि", "मोबाइल नंबर", "पता",
+]
+
+JOB_TEXTS = [
+    "Railway Recruitment Board invites online applications for 5000 Group D posts. "
+    "Candidates with 10th pass and ITI are eligible. Age limit 18-33 years. Last date 30 March.",
+    "State Health Society Bihar is hiring staff nurses on contract. B.Sc Nursing or GNM required, "
+    "salary Rs 32,000 per month, apply online before the last date.",
+    "PM Kisan Samman Nidhi provides Rs 6000 per year to small and marginal farmers in three "
+    "instalments. Register with Aadhaar and bank account at the nearest CSC.",
+]
+
+SUBDIRS = {"intent": "intent_model", "field": "field_transformer", "summarizer": "summarizer"}
+
+
+def _rss() -> int:
+    from ai.model_registry import _current_rss
+    return _current_rss() or 0
+
+
+def run_backend(name: str, models_dir: str, use_quantized: bool, texts: list):
+    """Load one model/backend in this (fresh) process; outputs, latency and RSS"""
+    import torch
+
+    torch.set_num_threads(1)
+    path = os.path.join(models_dir, SUBDIRS[name])
+    rss_before = _rss()
+    start = time.perf_counter()
+    if name == "intent":
+        from ai.intent_classifier import DistilBERTIntentClassifier
+        model = DistilBERTIntentClassifier(model_path=path, use_quantized=use_quantized)
+        infer = lambda text: model.predict_logits([text])[0]
+    elif name == "field":
+        from ai.field_classifier import TransformerLabelUnderstanding
+        model = TransformerLabelUnderstanding(model_path=path, use_quantized=use_quantized)
+        infer = lambda text: model.get_embedding(text).flatten()
+    else:
+        from ai.summarizer import T5Summarizer
+        # No summary store: repeated texts must reach the model
+        model = T5Summarizer(model_path=path, use_quantized=use_quantized, store=False)
+        infer = model.summarize
+    load_seconds = time.perf_counter() - start
+    rss_loaded = _rss()
+
+    infer(texts[0])  # Warm-up
+    outputs, latencies = [], []
+    for text in texts:
+        start = time.perf_counter()
+        outputs.append(infer(text))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {
+        "backend": model.backend,
+        "load_s": load_seconds,
+        "rss_mb": (rss_loaded - rss_before) / 2**20,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "outputs": outputs,
+    }
+
+
+def save_base_models(models_dir: str):
+    """
+    Snapshot base models into models_dir where no fine-tuned model exists
+
+    The fp32 and int8 runs must share weights; DistilBERT's classification
+    head is randomly initialised on every base-model load.
+    """
+    from ai.field_classifier import TransformerLabelUnderstanding
+    from ai.intent_classifier import DistilBERTIntentClassifier
+    from ai.summarizer import T5Summarizer
+
+    factories = {
+        "intent": DistilBERTIntentClassifier,
+        "field": TransformerLabelUnderstanding,
+        "summarizer": T5Summarizer,
+    }
+    for name, sub in SUBDIRS.items():
+        path = os.path.join(models_dir, sub)
+        if os.path.exists(path):
+            continue
+        wrapper = factories[name](use_quantized=False)
+        if wrapper.model is not None:
+            wrapper.model.save_pretrained(path)
+            wrapper.tokenizer.save_pretrained(path)
+
+
+def main(n_texts: int = 200):
+    models_dir = os.environ.get("AI_MODELS_DIR") or tempfile.mkdtemp(prefix="quantized-models-")
+    print("=" * 72)
+    print(f"INT8 vs PYTORCH INFERENCE  (models_dir={models_dir})")
+    print("=" * 72)
+
+    missing = [name for name, sub in SUBDIRS.items()
+               if not quantized_dir(os.path.join(models_dir, sub)).exists()]
+    if missing:
+        save_base_models(models_dir)
+        print(f"Exporting int8 artifacts: {', '.join(missing)}")
+        exported = export_quantized_models(models_dir, missing)
+        if not any(exported.values()):
+            print("No transformer models available (install transformers + torch)")
+            return
+
+    inputs = {
+        "intent": make_corpus(n_texts),
+        # Distinct strings so the embedding cache does not hide model latency
+        "field": [f"{FIELD_LABELS[i % len(FIELD_LABELS)].lower()} {i}" for i in range(n_texts)],
+        "summarizer": [JOB_TEXTS[i % len(JOB_TEXTS)] for i in range(max(3, n_texts // 20))],
+    }
+
+    print(f"{'model':<12}{'backend':<10}{'load s':>8}{'RSS MB':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    for name, texts in inputs.items():
+        results = {}
+        for use_quantized in (False, True):
+            # Fresh process per backend so RSS is not shared between them
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                results[use_quantized] = pool.submit(run_backend, name, models_dir, use_quantized, texts).result()
+        for result in results.values():
+            print(f"{name:<12}{result['backend']:<10}{result['load_s']:>8.2f}{result['rss_mb']:>9.1f}"
+                  f"{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}")
+
+        reference, candidate = results[False]["outputs"], results[True]["outputs"]
+        if name == "summarizer":
+            same = sum(a == b for a, b in zip(reference, candidate))
+            print(f"{'':<12}parity: summary exact match {same}/{len(reference)}")
+        else:
+            parity = compare_outputs(np.stack(reference), np.stack(candidate))
+            agreement = f"label agreement {parity['label_agreement']:.1%}  " if name == "intent" else ""
+            print(f"{'':<12}parity: max |delta| {parity['max_abs_delta']:.4f}  "
+                  f"mean |delta| {parity['mean_abs_delta']:.4f}  "
+                  f"{agreement}cosine {parity['mean_cosine']:.4f}")
+        speedup = results[False]["p50_ms"] / max(results[True]["p50_ms"], 1e-9)
+        print(f"{'':<12}int8 p50 speedup {speedup:.2f}x\n")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,91 @@
+"""
+Two-Tower Retrieval Benchmark
+=============================
+Recall@k vs latency for TwoTowerRetriever candidate generation:
+legacy per-job dict scan, exact FlatIndex and IVFIndex at several n_probe.
+
+Usage:
+    python benchmarks/bench_two_tower_retrieval.py [n_jobs] [n_queries]
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.job_recommender import FlatIndex, IVFIndex
+
+
+def make_catalogue(n_jobs: int, dim: int = 64, n_clusters: int = 200, seed: int = 0):
+    """Clustered synthetic embeddings (postings cluster by category/state)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, dim))
+    labels = rng.integers(0, n_clusters, n_jobs)
+    vectors = centers[labels] + 0.6 * rng.normal(size=(n_jobs, dim))
+    return [f"job-{i}" for i in range(n_jobs)], np.tanh(vectors).astype(np.float32)
+
+
+def legacy_scan(embeddings: dict, query: np.ndarray, top_k: int):
+    """The original retrieve_candidates loop"""
+    similarities = []
+    for job_id, job_emb in embeddings.items():
+        sim = np.dot(query, job_emb) / (np.linalg.norm(query) * np.linalg.norm(job_emb) + 1e-8)
+        similarities.append((job_id, float(sim)))
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return similarities[:top_k]
+
+
+def timed(fn, queries):
+    results = []
+    start = time.perf_counter()
+    for q in queries:
+        results.append(fn(q))
+    return results, (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def recall(results, truth):
+    hits = sum(len({i for i, _ in r} & {i for i, _ in t}) for r, t in zip(results, truth))
+    return hits / sum(len(t) for t in truth)
+
+
+def main(n_jobs: int = 100_000, n_queries: int = 200, top_k: int = 100):
+    print("=" * 60)
+    print(f"TWO-TOWER RETRIEVAL BENCHMARK  ({n_jobs} jobs, k={top_k})")
+    print("=" * 60)
+    
+    ids, vectors = make_catalogue(n_jobs)
+    queries = make_catalogue(n_queries, seed=1)[1]
+    
+    start = time.perf_counter()
+    flat = FlatIndex(vectors.shape[1])
+    flat.add(ids, vectors)
+    print(f"\nFlatIndex build: {(time.perf_counter() - start) * 1000:.0f} ms")
+    truth, flat_ms = timed(lambda q: flat.search(q, top_k), queries)
+    
+    legacy_n = min(n_jobs, 20_000)
+    legacy = dict(zip(ids[:legacy_n], vectors[:legacy_n]))
+    _, legacy_ms = timed(lambda q: legacy_scan(legacy, q, top_k), queries[:10])
+    legacy_ms *= n_jobs / legacy_n  # Linear in catalogue size
+    
+    print(f"\n{'method':<22}{'ms/query':>10}{'recall@k':>10}")
+    print(f"{'legacy dict scan*':<22}{legacy_ms:>10.2f}{1.0:>10.3f}")
+    print(f"{'flat (exact)':<22}{flat_ms:>10.2f}{1.0:>10.3f}")
+    
+    start = time.perf_counter()
+    ivf = IVFIndex(vectors.shape[1])
+    ivf.train(flat.vectors)
+    ivf.add(flat.ids, flat.vectors)
+    print(f"\nIVF build ({len(ivf.centroids)} lists): {(time.perf_counter() - start) * 1000:.0f} ms")
+    for n_probe in (1, 2, 4, 8, 16, 32):
+        results, ms = timed(lambda q: ivf.search(q, top_k, n_probe=n_probe), queries)
+        print(f"{'ivf n_probe=' + str(n_probe):<22}{ms:>10.2f}{recall(results, truth):>10.3f}")
+    
+    print(f"\n* extrapolated from {legacy_n} jobs")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
@@ -3,13 +3,25 @@ AI Routes - FastAPI endpoints for AI modules
 Exposes all AI functionality through REST API
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Body, HTTPException, UploadFile, File, Form
 from typing import List, Dict, Optional, Any
 import logging
 import json
+import os
+import asyncio
 
 from backend.ai import (
     JobRecommender,
+    AdvancedJobRecommender,
+    AdvancedIntentClassifier,
+    get_advanced_recommender,
+    get_model,
+    get_model_registry,
+    get_recommendation_cache,
+    get_form_schema_cache,
+    get_ocr_cache,
+    get_summary_store,
+    stable_digest,
     FieldClassifier,
     ContentSummarizer,
     IntentClassifier,
@@ -23,10 +35,90 @@ router = APIRouter(prefix="/api/v2/ai", tags=["AI"])
 
 # Initialize AI modules (singleton pattern)
 job_recommender = JobRecommender()
-field_classifier = FieldClassifier()
+field_classifier = FieldClassifier(schema_cache=get_form_schema_cache())
 content_summarizer = ContentSummarizer()
 intent_classifier = IntentClassifier()
 document_validator = DocumentValidator()
+recommendation_cache = get_recommendation_cache()
+
+# Batches at least this large use a process pool for intent classification
+INTENT_BATCH_PARALLEL_MIN = 20_000
+# Size of that pool, shared by all batch requests (AI_INTENT_BATCH_WORKERS overrides)
+INTENT_BATCH_WORKERS = int(os.environ.get("AI_INTENT_BATCH_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+
+
+@router.on_event("shutdown")
+def close_ai_pools():
+    """Shut down the intent classifier's batch scoring pool"""
+    intent_classifier.close()
+
+
+def get_advanced_job_recommender() -> AdvancedJobRecommender:
+    """Two-stage recommender over an indexed catalogue (pinned in the model registry)"""
+    return get_advanced_recommender()
+
+
+# Source of the catalogue served by /recommendations/jobs/serve (see setup_catalogue_sync)
+_catalogue_source: Optional[Any] = None  # (db, JobFeatureStore)
+_catalogue_version: Optional[int] = None  # Store version the served catalogue reflects
+_catalogue_lock = asyncio.Lock()
+
+
+def setup_catalogue_sync(db, job_feature_store):
+    """
+    Serve the jobs collection from /recommendations/jobs/serve
+    
+    Call once at startup with the app's database and JobFeatureStore. The
+    catalogue is indexed from the store's snapshot on first use and synced
+    (new, edited and removed jobs only) whenever the store's version moves:
+    job writes, scraper publishes, change-stream events. Jobs added through
+    /recommendations/jobs/index that are not in the collection are dropped
+    on the next sync.
+    """
+    global _catalogue_source, _catalogue_version
+    _catalogue_source = (db, job_feature_store)
+    _catalogue_version = None
+
+
+async def sync_served_catalogue(recommender: AdvancedJobRecommender):
+    """Bring the served catalogue up to date with the job feature store (no-op if not set up)"""
+    global _catalogue_version
+    if _catalogue_source is None:
+        return
+    db, job_feature_store = _catalogue_source
+    if job_feature_store.version == _catalogue_version:
+        return
+    async with _catalogue_lock:
+        snapshot = await job_feature_store.get(db)
+        if snapshot.version == _catalogue_version:
+            return
+        result = await asyncio.to_thread(recommender.sync_jobs, snapshot.jobs)
+        _catalogue_version = snapshot.version
+        logger.info(f"Served job catalogue synced to v{snapshot.version}: {result}")
+
+
+def get_intent_model() -> AdvancedIntentClassifier:
+    """DistilBERT/BoW/keyword ensemble, loaded once via the model registry"""
+    return get_model("intent_classifier", os.environ.get("AI_MODELS_DIR") or None)
+
+
+def to_form_fields(fields: Any) -> List[Dict[str, Any]]:
+    """
+    Normalize a form description to [{"label", "id", "value"}, ...]
+    
+    Accepts {"fields": ...} wrappers, {label: value} dicts, label lists and
+    lists of field dicts. Bare labels get an empty id: the classifier
+    matches "label id", so repeating the label would defeat its anchored
+    patterns. map_user_to_fields keys such fields by label.
+    """
+    if isinstance(fields, dict) and "fields" in fields:
+        fields = fields["fields"]
+    if isinstance(fields, dict):
+        return [{"label": label, "id": "", "value": value} for label, value in fields.items()]
+    return [
+        dict(field) if isinstance(field, dict) else {"label": str(field), "id": "", "value": ""}
+        for field in fields
+    ]
 
 
 # ============================================================================
@@ -38,11 +130,16 @@ async def get_job_recommendations(
     user_profile: Dict[str, Any],
     jobs: List[Dict[str, Any]],
     top_k: Optional[int] = 10,
-    language: Optional[str] = "en"
+    language: Optional[str] = "en",
+    catalogue_version: Optional[str] = None
 ):
     """
     Get personalized job recommendations for a user
     
+    Callers that send the same jobs list repeatedly can pass a
+    catalogue_version to reuse results for users with equivalent profiles;
+    results are only reused for an identical jobs list.
+    
     Request body:
     {
         "user_profile": {
@@ -57,15 +154,23 @@ async def get_job_recommendations(
             ...
         ],
         "top_k": 10,
-        "language": "en"
+        "language": "en",
+        "catalogue_version": "2025-06-01T10:00"
     }
     """
     try:
-        recommendations = job_recommender.get_recommendations(
-            user_profile=user_profile,
-            jobs=jobs,
-            top_k=top_k
-        )
+        cache_key = None
+        if catalogue_version is not None:
+            # The posted list is part of the key: the version string is client-supplied
+            cache_key = (job_recommender.profile_fingerprint(user_profile), top_k, stable_digest(jobs))
+        recommendations = recommendation_cache.get("v2_jobs", catalogue_version, cache_key)
+        if recommendations is None:
+            recommendations = job_recommender.get_recommendations(
+                user_profile=user_profile,
+                jobs=jobs,
+                top_k=top_k
+            )
+            recommendation_cache.put("v2_jobs", catalogue_version, cache_key, recommendations)
         
         # Format response
         response = {
@@ -85,6 +190,100 @@ async def get_job_recommendations(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/recommendations/jobs/index")
+async def index_recommendation_jobs(jobs: List[Dict[str, Any]]):
+    """
+    Add or update jobs in the catalogue served by /recommendations/jobs/serve
+    
+    Request body: [{"id": "...", "title": "...", ...}, ...]
+    """
+    try:
+        recommender = get_advanced_job_recommender()
+        recommender.index_jobs(jobs)
+        return {
+            "success": True,
+            "indexed": len(jobs),
+            "catalogue_size": len(recommender.jobs_cache),
+        }
+    
+    except Exception as e:
+        logger.error(f"Error indexing jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/recommendations/jobs/index/remove")
+async def remove_recommendation_jobs(job_ids: List[str]):
+    """
+    Remove expired or deleted jobs from the served catalogue
+    """
+    try:
+        recommender = get_advanced_job_recommender()
+        removed = recommender.remove_jobs(job_ids)
+        return {
+            "success": True,
+            "removed": removed,
+            "catalogue_size": len(recommender.jobs_cache),
+        }
+    
+    except Exception as e:
+        logger.error(f"Error removing jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/recommendations/jobs/serve")
+async def serve_job_recommendations(
+    user_profile: Dict[str, Any] = Body(...),
+    top_k: int = Body(10),
+    n_candidates: Optional[int] = Body(None),
+    language: str = Body("en")
+):
+    """
+    Two-stage recommendations from the indexed catalogue
+    
+    Only the user profile is sent: the Two-Tower retriever picks the
+    n_candidates nearest jobs and LambdaMART re-ranks those. With
+    setup_catalogue_sync the catalogue is the jobs collection, synced
+    before serving whenever it changed.
+    
+    Request body:
+    {
+        "user_profile": {"education": "B.Tech", "age": 25, ...},
+        "top_k": 10,
+        "n_candidates": 200,
+        "language": "en"
+    }
+    """
+    try:
+        recommender = get_advanced_job_recommender()
+        await sync_served_catalogue(recommender)
+        # ML features read most profile fields, so the whole profile is the key
+        cache_key = (stable_digest(user_profile), top_k, n_candidates)
+        recommendations = recommendation_cache.get("v2_jobs_serve", recommender.catalogue_version, cache_key)
+        if recommendations is None:
+            recommendations = recommender.recommend(
+                user_profile,
+                top_k=top_k,
+                n_candidates=n_candidates,
+            )
+            recommendation_cache.put("v2_jobs_serve", recommender.catalogue_version, cache_key, recommendations)
+        
+        return {
+            "success": True,
+            "count": len(recommendations),
+            "recommendations": recommendations,
+            "metadata": {
+                "language": language,
+                "top_k_requested": top_k,
+                "n_candidates": n_candidates or recommender.n_candidates,
+                "catalogue_size": len(recommender.jobs_cache),
+            }
+        }
+    
+    except Exception as e:
+        logger.error(f"Error serving job recommendations: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/recommendations/schemes")
 async def get_scheme_recommendations(
     user_profile: Dict[str, Any],
@@ -211,15 +410,18 @@ async def classify_form_fields(
             "phone": "9876543210"
         }
     }
+    
+    Forms seen before (same labels, in order) are served from the form
+    schema cache.
     """
     try:
-        classified = field_classifier.classify_form_fields(fields)
+        classified = field_classifier.classify_form_fields(to_form_fields(fields))
         
         return {
             "success": True,
             "original_fields": fields,
             "classified_fields": classified,
-            "total_fields": len(fields),
+            "total_fields": len(classified),
         }
     
     except Exception as e:
@@ -245,9 +447,13 @@ async def map_user_profile_to_form(
         },
         "form_fields": ["नाम", "email", "phone", "आधार संख्या"]
     }
+    
+    Fields are classified through the form schema cache, so repeat forms go
+    straight to mapping. The mapping is keyed by field label.
     """
     try:
-        mapping = field_classifier.map_user_to_fields(user_profile, form_fields)
+        classified = field_classifier.classify_form_fields(to_form_fields(form_fields))
+        mapping = field_classifier.map_user_to_fields(user_profile, classified)
         
         return {
             "success": True,
@@ -383,23 +589,78 @@ async def classify_intent(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/intent/predict")
+async def predict_intent_ml(
+    message: str,
+):
+    """
+    Classify message intent with DistilBERT
+    
+    Concurrent requests are coalesced by the model's micro-batcher
+    (AI_INTENT_MAX_BATCH items / AI_INTENT_MAX_WAIT_MS) into one forward
+    pass on a worker thread. Falls back to keyword matching when no
+    DistilBERT model is available. With calibrated cascade thresholds in
+    AI_MODELS_DIR, the keyword/BoW/DistilBERT cascade answers instead and
+    DistilBERT only runs for messages the cheap stages are unsure about.
+    """
+    try:
+        classifier = await asyncio.to_thread(get_intent_model)
+        if classifier.cascade_thresholds is not None:
+            result = await classifier.predict_intent_async(message)
+            return {"success": True, "message": message, **result}
+        
+        distilbert = classifier.distilbert
+        if distilbert is None or distilbert.model is None:
+            intent, confidence, details = intent_classifier.classify(message)
+            return {
+                "success": True,
+                "message": message,
+                "intent": intent.value,
+                "confidence": round(confidence, 3),
+                "model_used": "keywords",
+            }
+        
+        intent, confidence, probabilities = await distilbert.predict_async(message)
+        return {
+            "success": True,
+            "message": message,
+            "intent": intent,
+            "confidence": round(confidence, 3),
+            "probabilities": {label: round(p, 4) for label, p in probabilities.items()},
+            "model_used": "distilbert",
+        }
+    
+    except Exception as e:
+        logger.error(f"Error predicting intent: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/intent/classify-batch")
 async def classify_intents_batch(
     messages: List[str],
 ):
     """
     Classify multiple messages
+    
+    Large backfills are scored off the event loop in the classifier's
+    long-lived process pool (AI_INTENT_BATCH_WORKERS, default: up to 4).
     """
     try:
-        results = intent_classifier.classify_batch(messages)
+        workers = 1
+        if len(messages) >= INTENT_BATCH_PARALLEL_MIN:
+            workers = INTENT_BATCH_WORKERS
         
-        classifications = []
-        for intent, confidence, details in results:
-            classifications.append({
-                "message": details.get("original_message", ""),
-                "intent": intent.value,
-                "confidence": round(confidence, 3),
-            })
+        def classify_all() -> List[Dict[str, Any]]:
+            return [
+                {
+                    "message": details.get("original_message", ""),
+                    "intent": intent.value,
+                    "confidence": round(confidence, 3),
+                }
+                for intent, confidence, details in intent_classifier.iter_classify(messages, workers=workers)
+            ]
+        
+        classifications = await asyncio.to_thread(classify_all)
         
         return {
             "success": True,
@@ -518,6 +779,32 @@ async def validate_document(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/validate/extract-batch")
+async def extract_documents_batch(
+    ocr_texts: List[str],
+):
+    """
+    Identify document type and extract fields for multiple OCR texts
+
+    Runs off the event loop; identical texts are processed once.
+    """
+    try:
+        extractions = await asyncio.to_thread(document_validator.extract_many, ocr_texts)
+
+        return {
+            "success": True,
+            "total_documents": len(ocr_texts),
+            "extractions": [
+                {**extraction, "type_confidence": round(extraction["type_confidence"], 3)}
+                for extraction in extractions
+            ],
+        }
+
+    except Exception as e:
+        logger.error(f"Error extracting document batch: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ============================================================================
 # HEALTH CHECK
 # ============================================================================
@@ -525,6 +812,14 @@ async def validate_document(
 @router.get("/health")
 async def ai_health_check():
     """Check AI module health"""
+    intent_batcher = None
+    intent_cascade = None
+    if get_model_registry().is_loaded("intent_classifier", os.environ.get("AI_MODELS_DIR") or None):
+        intent_model = get_intent_model()
+        intent_cascade = intent_model.get_cascade_stats()
+        if intent_model.distilbert is not None:
+            intent_batcher = intent_model.distilbert.get_batcher_stats()
+    
     return {
         "status": "healthy",
         "modules": {
@@ -534,6 +829,13 @@ async def ai_health_check():
             "intent_classifier": "ready",
             "document_validator": "ready",
         },
+        "loaded_models": get_model_registry().memory_usage(),
+        "model_registry": get_model_registry().get_stats(),
+        "intent_batcher": intent_batcher,
+        "intent_cascade": intent_cascade,
+        "form_schema_cache": field_classifier.schema_cache.get_stats(),
+        "ocr_cache": get_ocr_cache().get_stats(),
+        "summary_store": get_summary_store().get_stats(),
         "version": "1.0.0",
     }
 
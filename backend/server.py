@@ -38,10 +38,12 @@ from openai import OpenAI
 
 # Services imported lazily
 from server_services import (
-    get_job_scraper, get_ai_job_matcher, 
+    get_job_scraper, get_ai_job_matcher, get_job_feature_store,
     rewrite_content_with_ai, generate_slug
 )
 from ai.learning_system import SelfLearningAI
+from ai.model_registry import preload_models
+from ai.recommendation_cache import get_recommendation_cache
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -281,12 +283,15 @@ async def get_admin_user(user: dict = Depends(get_current_user)):
     return user
 
 # ===================== SERVICES (Lazy Loaded from server_services.py) =====================
-# JobScraper, AIJobMatcher, rewrite_content_with_ai, generate_slug
+# JobScraper, AIJobMatcher, JobFeatureStore, rewrite_content_with_ai, generate_slug
 # imported at top from server_services module
 
 # Get lazy-loaded instances
 job_scraper = get_job_scraper()
 ai_job_matcher = get_ai_job_matcher(openai_client)
+job_feature_store = get_job_feature_store()
+recommendation_cache = get_recommendation_cache()  # Keyed by job_feature_store version
+job_watch_task: Optional[asyncio.Task] = None  # job_feature_store.watch, cancelled on shutdown
 
 # ===================== AUTH ENDPOINTS =====================
 
@@ -366,6 +371,7 @@ async def create_job(job: JobAlertCreate, admin: dict = Depends(get_admin_user))
         "applications": 0
     }
     await db.jobs.insert_one(job_doc)
+    job_feature_store.invalidate()
     job_doc.pop("_id", None)
     return job_doc
 
@@ -403,30 +409,28 @@ async def get_matching_jobs(
 ):
     """Get jobs matching user's profile with scores"""
     
-    # Build query
-    query = {"is_active": True}
-    if category:
-        query["category"] = category
-    if state and state != "all":
-        query["state"] = {"$in": [state, "all"]}
-    
-    # Fetch jobs
-    jobs = await db.jobs.find(query, {"_id": 0}).to_list(100)
-    
-    # Calculate match scores
-    scored_jobs = []
-    for job in jobs:
-        score = ai_job_matcher.calculate_match_score(user, job)
-        job["match_score"] = score
-        job["match_reason"] = ai_job_matcher._generate_reason(user, job, score)
-        scored_jobs.append(job)
-    
-    # Sort by match score
-    scored_jobs.sort(key=lambda x: x["match_score"], reverse=True)
+    # Pre-parsed active jobs (refreshed when jobs change)
+    features = await job_feature_store.get(db)
     
-    # Paginate
-    total = len(scored_jobs)
-    paginated = scored_jobs[skip:skip + limit]
+    # Users with equivalent profiles share results until the catalogue changes
+    fingerprint = ai_job_matcher.profile_fingerprint(user, features)
+    cache_key = (fingerprint, category, state, skip, limit) if fingerprint is not None else None
+    cached = recommendation_cache.get("jobs_matching", features.version, cache_key)
+    if cached is None:
+        rows = features.filter(category=category, state=state)
+        
+        # Calculate match scores, sorted by match score
+        ranked = ai_job_matcher.rank_features(user, features, rows)
+        
+        # Paginate (reasons only for the returned page)
+        total = len(rows)
+        paginated = [
+            ai_job_matcher.describe_match(features, ranked, i, "match_reason")
+            for i in range(total)[skip:skip + limit]
+        ]
+        cached = (total, paginated)
+        recommendation_cache.put("jobs_matching", features.version, cache_key, cached)
+    total, paginated = cached
     
     return {
         "total": total,
@@ -465,6 +469,7 @@ async def update_job(job_id: str, job: JobAlertCreate, admin: dict = Depends(get
     result = await db.jobs.update_one({"id": job_id}, {"$set": update_data})
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Job not found")
+    job_feature_store.invalidate()
     return {"message": "Job updated"}
 
 @api_router.delete("/jobs/{job_id}")
@@ -472,6 +477,7 @@ async def delete_job(job_id: str, admin: dict = Depends(get_admin_user)):
     result = await db.jobs.delete_one({"id": job_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Job not found")
+    job_feature_store.invalidate()
     return {"message": "Job deleted"}
 
 # ===================== YOJANA ENDPOINTS =====================
@@ -844,14 +850,23 @@ from server_admin import setup_admin_routes
 async def get_job_recommendations(user: dict = Depends(get_current_user), limit: int = 10):
     """Get AI-powered job recommendations based on user profile"""
     
-    # Fetch all active jobs
-    jobs = await db.jobs.find({"is_active": True}, {"_id": 0}).to_list(100)
+    # Pre-parsed active jobs (refreshed when jobs change)
+    features = await job_feature_store.get(db)
     
-    if not jobs:
+    if not len(features):
         return {"recommendations": [], "message": "No jobs available"}
     
-    # Get AI recommendations
-    recommendations = await ai_job_matcher.get_ai_recommendations(user, jobs, limit)
+    # Get AI recommendations (shared by users with equivalent profiles). With
+    # OpenAI enabled the result holds per-user LLM text (the prompt includes
+    # the user's name and raw age), so it is never shared.
+    cache_key = None
+    if ai_job_matcher.openai_client is None:
+        fingerprint = ai_job_matcher.profile_fingerprint(user, features)
+        cache_key = (fingerprint, limit) if fingerprint is not None else None
+    recommendations = recommendation_cache.get("recommendations", features.version, cache_key)
+    if recommendations is None:
+        recommendations = await ai_job_matcher.get_ai_recommendations(user, features, limit)
+        recommendation_cache.put("recommendations", features.version, cache_key, recommendations)
     
     return {
         "recommendations": recommendations,
@@ -1100,9 +1115,15 @@ app.add_middleware(
 
 # ===================== STARTUP & SHUTDOWN =====================
 
+def log_task_failure(task: asyncio.Task):
+    """Done-callback for background tasks: log exceptions instead of dropping them"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background task {task.get_name()} failed", exc_info=task.exception())
+
+
 @app.on_event("startup")
 async def startup():
-    global chat_ai
+    global chat_ai, job_watch_task
     
     # Setup admin routes (Admin stats, Content drafts, Scraper)
     setup_admin_routes(
@@ -1115,6 +1136,13 @@ async def startup():
         app, api_router, db, openai_client, get_current_user, SelfLearningAI
     )
     
+    # Keep the job feature store in sync with the jobs collection
+    job_watch_task = asyncio.create_task(job_feature_store.watch(db), name="job_feature_store.watch")
+    job_watch_task.add_done_callback(log_task_failure)
+    
+    # Preload ML models listed in AI_PRELOAD_MODELS (others load lazily on first use)
+    await asyncio.to_thread(preload_models)
+    
     # Initialize Chat AI
     chat_ai = await get_ai_instance(db)
     logger.info("Digital Sahayak Chat AI initialized")
@@ -1159,5 +1187,11 @@ async def startup():
 
 @app.on_event("shutdown")
 async def shutdown():
+    if job_watch_task is not None and not job_watch_task.done():
+        job_watch_task.cancel()
+        try:
+            await job_watch_task
+        except asyncio.CancelledError:
+            pass
     client.close()
 
@@ -13,13 +13,18 @@ Memory Optimization:
 """
 
 import gc
+import os
 import uuid
+import asyncio
 import logging
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, Depends, Body, Query, BackgroundTasks
 from logging.handlers import RotatingFileHandler
 
+from server_services import get_job_feature_store
+from ai.model_registry import get_model
+
 # Setup logging
 logger = logging.getLogger(__name__)
 if not logger.handlers:
@@ -35,6 +40,39 @@ if not logger.handlers:
     logger.setLevel(logging.INFO)
 
 
+async def summarize_drafts(db, drafts: list) -> int:
+    """
+    Attach T5 summaries and rewrites to freshly scraped drafts
+    
+    Runs AdvancedSummarizer.process_job_postings once over the whole batch
+    (off the event loop); descriptions already in the summary store are not
+    regenerated. Enabled with AI_SUMMARIZE_SCRAPED=1.
+    
+    Returns:
+        Number of drafts updated
+    """
+    if not drafts or os.environ.get("AI_SUMMARIZE_SCRAPED", "0") != "1":
+        return 0
+    try:
+        summarizer = get_model("summarizer", os.environ.get("AI_MODELS_DIR") or None)
+        results = await asyncio.to_thread(summarizer.process_job_postings, drafts)
+    except Exception as e:
+        logger.warning(f"Draft summarization skipped: {e}")
+        return 0
+    
+    for draft, result in zip(drafts, results):
+        await db.content_drafts.update_one(
+            {"id": draft["id"]},
+            {"$set": {
+                "summary_en": result["summary_en"],
+                "summary_hi": result["summary_hi"],
+                "ai_rewrites": result["rewritten"],
+                "key_info": result["key_info"],
+            }}
+        )
+    return len(results)
+
+
 def setup_admin_routes(
     api_router: APIRouter,
     db,
@@ -135,6 +173,7 @@ def setup_admin_routes(
                 jobs = await job_scraper.scrape_all()
                 saved_count = 0
                 draft_count = 0
+                new_drafts = []
                 
                 for job_data in jobs:
                     # Check if job already exists (by title + source_url)
@@ -165,6 +204,7 @@ def setup_admin_routes(
                                 "created_at": datetime.now(timezone.utc).isoformat()
                             }
                             await db.content_drafts.insert_one(draft_doc)
+                            new_drafts.append(draft_doc)
                             draft_count += 1
                         else:
                             # Direct save (old behavior)
@@ -186,15 +226,24 @@ def setup_admin_routes(
                             await db.jobs.insert_one(job_doc)
                             saved_count += 1
                 
+                if saved_count:
+                    get_job_feature_store().invalidate()
+                
+                summarized_count = await summarize_drafts(db, new_drafts)
+                
                 # Garbage collection after heavy scraping
                 gc.collect()
-                logger.info(f"Scraper: {draft_count} drafts, {saved_count} direct saves")
+                logger.info(
+                    f"Scraper: {draft_count} drafts ({summarized_count} summarized), "
+                    f"{saved_count} direct saves"
+                )
                 
                 await db.scrape_logs.insert_one({
                     "id": str(uuid.uuid4()),
                     "timestamp": datetime.now(timezone.utc).isoformat(),
                     "total_scraped": len(jobs),
                     "drafts_created": draft_count,
+                    "drafts_summarized": summarized_count,
                     "direct_saved": saved_count,
                     "status": "success"
                 })
@@ -334,6 +383,7 @@ def setup_admin_routes(
                 "applications": 0
             }
             await db.jobs.insert_one(job_doc)
+            get_job_feature_store().invalidate()
         else:
             slug = await get_unique_slug(base_slug, "yojana")
             yojana_doc = {
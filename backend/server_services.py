@@ -1,7 +1,7 @@
 """
 Server Services Module
 =====================
-Contains heavy services: JobScraper, AIJobMatcher, Content Rewriter
+Contains heavy services: JobScraper, AIJobMatcher, JobFeatureStore, Content Rewriter
 
 Separated from main server.py to keep files under 50KB
 Size: ~45KB | Lazy loaded when needed
@@ -13,12 +13,15 @@ Logging: Errors saved to logs/services.log
 import gc
 import re
 import json
+import time
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, timezone
 from pathlib import Path
 import httpx
+import numpy as np
 from bs4 import BeautifulSoup
 
 # Setup logging to file
@@ -283,28 +286,25 @@ class AIJobMatcher:
             return (18, int(matches[0]))
         return (18, 60)
     
+    @classmethod
+    def detect_education_level(cls, text: str) -> Optional[str]:
+        """Detect the first EDUCATION_LEVELS level whose keywords appear in text"""
+        text_lower = text.lower()
+        for level, keywords in cls.EDUCATION_LEVELS.items():
+            if any(kw in text_lower for kw in keywords):
+                return level
+        return None
+    
     def check_education_match(self, user_education: str, job_qualification: str) -> bool:
         """Check if user's education matches job requirements"""
         if not user_education or not job_qualification:
             return True
         
-        job_qual_lower = job_qualification.lower()
-        
-        user_level = None
-        for level, keywords in self.EDUCATION_LEVELS.items():
-            if any(kw in user_education.lower() for kw in keywords):
-                user_level = level
-                break
-        
+        user_level = self.detect_education_level(user_education)
         if not user_level:
             return True
         
-        required_level = None
-        for level, keywords in self.EDUCATION_LEVELS.items():
-            if any(kw in job_qual_lower for kw in keywords):
-                required_level = level
-                break
-        
+        required_level = self.detect_education_level(job_qualification)
         if not required_level:
             return True
         
@@ -354,36 +354,174 @@ class AIJobMatcher:
     
     def _generate_reason(self, user: dict, job: dict, score: int) -> str:
         """Generate a simple reason for job match"""
+        return self._format_reason(
+            self.check_education_match(user.get('education_level', ''), job.get('qualification', '')),
+            self.check_age_match(user.get('age'), job.get('age_limit', '')),
+            self.check_state_match(user.get('state', ''), job.get('state', '')),
+            bool(user.get('preferred_categories') and job.get('category') in user.get('preferred_categories', []))
+        )
+    
+    @staticmethod
+    def _format_reason(education_ok: bool, age_ok: bool, state_ok: bool, category_ok: bool) -> str:
         reasons = []
         
-        if self.check_education_match(user.get('education_level', ''), job.get('qualification', '')):
+        if education_ok:
             reasons.append("आपकी शिक्षा इस पद के लिए उपयुक्त है")
         
-        if self.check_age_match(user.get('age'), job.get('age_limit', '')):
+        if age_ok:
             reasons.append("आपकी आयु आयु सीमा में है")
         
-        if self.check_state_match(user.get('state', ''), job.get('state', '')):
+        if state_ok:
             reasons.append("यह नौकरी आपके राज्य में है")
         
-        if user.get('preferred_categories') and job.get('category') in user.get('preferred_categories', []):
+        if category_ok:
             reasons.append("यह आपकी पसंदीदा श्रेणी में है")
         
         return "; ".join(reasons) if reasons else "आपके लिए उपयुक्त हो सकती है"
     
-    async def get_ai_recommendations(self, user: dict, jobs: List[dict], limit: int = 10) -> List[dict]:
-        """Get AI-powered job recommendations"""
+    # ----- Vectorized scoring against a JobFeatures snapshot -----
+    
+    def rank_features(
+        self,
+        user: dict,
+        features: "JobFeatures",
+        rows: Optional[np.ndarray] = None,
+        min_score: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        calculate_match_score for every job in a JobFeatures snapshot at once
+        
+        Returns arrays ordered by descending score (stable, like list.sort):
+        'rows' (indices into features.jobs), 'score' and the per-check masks
+        'education', 'age', 'state', 'category' used to build reasons.
+        """
+        if rows is None:
+            rows = np.arange(len(features))
+        n = len(rows)
+        
+        education_ok = np.ones(n, dtype=bool)
+        user_level = None
+        if user.get('education_level', ''):
+            user_level = self.detect_education_level(user['education_level'])
+        if user_level:
+            tier = features.education_tier[rows]
+            education_ok = (tier < 0) | (self.EDUCATION_ORDER.index(user_level) >= tier)
+        
+        age_ok = np.ones(n, dtype=bool)
+        user_age = user.get('age')
+        if user_age:
+            age_ok = ~features.age_set[rows] | (
+                (features.age_min[rows] <= user_age) & (user_age <= features.age_max[rows])
+            )
+        
+        state_ok = np.ones(n, dtype=bool)
+        user_state = user.get('state', '')
+        if user_state:
+            codes = features.state_codes[rows]
+            state_ok = (codes < 0) | (codes == features.state_index.get(user_state.lower(), -2))
+        
+        category_ok = np.zeros(n, dtype=bool)
+        preferred_cats = user.get('preferred_categories', [])
+        if preferred_cats:
+            table = np.array([value in preferred_cats for value in features.category_values], dtype=bool)
+            category_ok = table[features.category_codes[rows]]
+        
+        score = (
+            50
+            + np.where(education_ok, 30, -20)
+            + np.where(age_ok, 20, -30)
+            + np.where(state_ok, 20, 0)
+            + np.where(category_ok, 10, 0)
+        )
+        score = np.clip(score, 0, 100)
+        
+        keep = np.ones(n, dtype=bool) if min_score is None else score >= min_score
+        order = np.flatnonzero(keep)
+        order = order[np.argsort(-score[order], kind='stable')]
+        return {
+            'rows': rows[order], 'score': score[order],
+            'education': education_ok[order], 'age': age_ok[order],
+            'state': state_ok[order], 'category': category_ok[order],
+        }
+    
+    def describe_match(
+        self,
+        features: "JobFeatures",
+        ranked: Dict[str, np.ndarray],
+        i: int,
+        reason_key: Optional[str] = None
+    ) -> dict:
+        """Copy of the i-th ranked job with its match_score (and reason under reason_key)"""
+        job = {**features.jobs[ranked['rows'][i]], 'match_score': int(ranked['score'][i])}
+        if reason_key:
+            job[reason_key] = self._format_reason(
+                bool(ranked['education'][i]), bool(ranked['age'][i]),
+                bool(ranked['state'][i]), bool(ranked['category'][i])
+            )
+        return job
+    
+    def profile_fingerprint(self, user: dict, features: "JobFeatures") -> Optional[tuple]:
+        """
+        Canonical key of what rank_features reads from a user, for one snapshot
+        
+        Age is bucketed at the snapshot's age-limit breakpoints and state /
+        categories are reduced to their codes, so users sharing a fingerprint
+        get identical rankings. None if the profile can't be canonicalized.
+        """
+        try:
+            user_level = None
+            if user.get('education_level', ''):
+                user_level = self.detect_education_level(user['education_level'])
+            
+            age_key = None
+            user_age = user.get('age')
+            if user_age:
+                if isinstance(user_age, (int, np.integer)):
+                    age_key = ('bucket', int(np.searchsorted(features.age_breakpoints, user_age, side='right')))
+                else:
+                    age_key = ('raw', repr(user_age))
+            
+            state_key = None
+            user_state = user.get('state', '')
+            if user_state:
+                state_key = features.state_index.get(user_state.lower(), -2)
+            
+            category_key = None
+            preferred_cats = user.get('preferred_categories', [])
+            if preferred_cats:
+                category_key = tuple(
+                    code for code, value in enumerate(features.category_values) if value in preferred_cats
+                )
+        except Exception:
+            return None
+        return (user_level, age_key, state_key, category_key)
+    
+    async def get_ai_recommendations(
+        self,
+        user: dict,
+        jobs: Union[List[dict], "JobFeatures"],
+        limit: int = 10
+    ) -> List[dict]:
+        """Get AI-powered job recommendations (jobs may be a JobFeatures snapshot)"""
         if not self.openai_client:
             return self.get_rule_based_recommendations(user, jobs, limit)
         
         try:
-            scored_jobs = []
-            for job in jobs:
-                score = self.calculate_match_score(user, job)
-                if score >= 40:
-                    scored_jobs.append({**job, 'match_score': score})
-            
-            scored_jobs.sort(key=lambda x: x['match_score'], reverse=True)
-            top_jobs = scored_jobs[:limit]
+            if isinstance(jobs, JobFeatures):
+                ranked = self.rank_features(user, jobs, min_score=40)
+                top_jobs = [
+                    self.describe_match(jobs, ranked, i)
+                    for i in range(len(ranked['rows']))[:limit]
+                ]
+            else:
+                scored_jobs = []
+                for job in jobs:
+                    score = self.calculate_match_score(user, job)
+                    if score >= 40:
+                        scored_jobs.append({**job, 'match_score': score})
+                
+                scored_jobs.sort(key=lambda x: x['match_score'], reverse=True)
+                top_jobs = scored_jobs[:limit]
             
             if not top_jobs:
                 return []
@@ -439,8 +577,20 @@ JSON में recommendations दें।"""
             logger.error(f"AI recommendation error: {e}")
             return self.get_rule_based_recommendations(user, jobs, limit)
     
-    def get_rule_based_recommendations(self, user: dict, jobs: List[dict], limit: int = 10) -> List[dict]:
+    def get_rule_based_recommendations(
+        self,
+        user: dict,
+        jobs: Union[List[dict], "JobFeatures"],
+        limit: int = 10
+    ) -> List[dict]:
         """Fallback rule-based job recommendations"""
+        if isinstance(jobs, JobFeatures):
+            ranked = self.rank_features(user, jobs, min_score=40)
+            return [
+                self.describe_match(jobs, ranked, i, 'ai_reason')
+                for i in range(len(ranked['rows']))[:limit]
+            ]
+        
         scored_jobs = []
         
         for job in jobs:
@@ -456,6 +606,188 @@ JSON में recommendations दें।"""
         return scored_jobs[:limit]
 
 
+# ===================== JOB FEATURE STORE =====================
+
+@dataclass
+class JobFeatures:
+    """
+    Immutable snapshot of the active jobs catalogue with pre-parsed match features
+    
+    Everything AIJobMatcher derives from a job document (age range, education
+    tier, normalized state, category) is parsed once per snapshot into arrays.
+    Categorical columns are dictionary-encoded (codes + values).
+    """
+    version: int
+    jobs: List[dict]
+    age_set: np.ndarray            # bool: job has an age_limit
+    age_min: np.ndarray            # int64, parsed with AIJobMatcher.parse_age_limit
+    age_max: np.ndarray
+    education_tier: np.ndarray     # int8 index into EDUCATION_ORDER, -1 = no requirement
+    state_codes: np.ndarray        # int32 code of lowercased state, -1 = open to all
+    state_index: Dict[str, int]
+    raw_state_codes: np.ndarray    # int32 code into raw_state_values (for query filters)
+    raw_state_values: List[Any]
+    category_codes: np.ndarray     # int32 code into category_values
+    category_values: List[Any]
+    loaded_at: float = field(default_factory=time.time)
+    _recommender_catalog: Any = field(default=None, repr=False)
+    _age_breakpoints: Any = field(default=None, repr=False)
+    
+    def __len__(self) -> int:
+        return len(self.jobs)
+    
+    @classmethod
+    def from_jobs(cls, jobs: List[dict], version: int = 0) -> "JobFeatures":
+        n = len(jobs)
+        age_set = np.zeros(n, dtype=bool)
+        age_min = np.zeros(n, dtype=np.int64)
+        age_max = np.zeros(n, dtype=np.int64)
+        education_tier = np.full(n, -1, dtype=np.int8)
+        state_codes = np.full(n, -1, dtype=np.int32)
+        state_index: Dict[str, int] = {}
+        encoders = {
+            'category': (np.zeros(n, dtype=np.int32), {}, []),
+            'state': (np.zeros(n, dtype=np.int32), {}, []),
+        }
+        
+        for row, job in enumerate(jobs):
+            try:
+                age_limit = job.get('age_limit', '')
+                if age_limit:
+                    age_min[row], age_max[row] = AIJobMatcher.parse_age_limit(age_limit)
+                    age_set[row] = True
+                
+                qualification = job.get('qualification', '')
+                if qualification:
+                    level = AIJobMatcher.detect_education_level(qualification)
+                    if level:
+                        education_tier[row] = AIJobMatcher.EDUCATION_ORDER.index(level)
+                
+                job_state = job.get('state', '')
+                if job_state and job_state != 'all':
+                    state_codes[row] = state_index.setdefault(job_state.lower(), len(state_index))
+            except Exception as e:
+                logger.warning(f"Job feature parse failed for {job.get('id')}: {e}")
+            
+            for key, (codes, index, values) in encoders.items():
+                value = job.get(key)
+                try:
+                    code = index.get(value)
+                except TypeError:
+                    value = str(value)  # Unhashable; only used for equality tests
+                    code = index.get(value)
+                if code is None:
+                    code = index[value] = len(values)
+                    values.append(value)
+                codes[row] = code
+        
+        return cls(
+            version=version, jobs=jobs,
+            age_set=age_set, age_min=age_min, age_max=age_max,
+            education_tier=education_tier,
+            state_codes=state_codes, state_index=state_index,
+            raw_state_codes=encoders['state'][0], raw_state_values=encoders['state'][2],
+            category_codes=encoders['category'][0], category_values=encoders['category'][2],
+        )
+    
+    @staticmethod
+    def _codes_of(values: List[Any], wanted: List[Any]) -> List[int]:
+        return [code for code, value in enumerate(values) if value in wanted]
+    
+    def filter(self, category: Optional[str] = None, state: Optional[str] = None) -> np.ndarray:
+        """Row indices matching the /jobs query filters (category, state in [state, 'all'])"""
+        mask = np.ones(len(self), dtype=bool)
+        if category:
+            mask &= np.isin(self.category_codes, self._codes_of(self.category_values, [category]))
+        if state and state != "all":
+            mask &= np.isin(self.raw_state_codes, self._codes_of(self.raw_state_values, [state, 'all']))
+        return np.flatnonzero(mask)
+    
+    @property
+    def age_breakpoints(self) -> np.ndarray:
+        """Sorted ages where some job's age check flips (age_min and age_max + 1)"""
+        if self._age_breakpoints is None:
+            self._age_breakpoints = np.unique(np.concatenate([
+                self.age_min[self.age_set], self.age_max[self.age_set] + 1
+            ]))
+        return self._age_breakpoints
+    
+    @property
+    def recommender_catalog(self):
+        """EncodedJobCatalog of this snapshot for ai.JobRecommender (built on first use)"""
+        if self._recommender_catalog is None:
+            from ai.job_recommender import EncodedJobCatalog
+            self._recommender_catalog = EncodedJobCatalog.from_jobs(self.jobs)
+        return self._recommender_catalog
+
+
+class JobFeatureStore:
+    """
+    In-process cache of JobFeatures for the active jobs collection
+    
+    Refreshed lazily on the next read after invalidate() (called on job
+    create/update/delete and scraper/draft publish), after a change stream
+    event when watch() is running, or once max_staleness seconds have passed
+    (writes from other worker processes).
+    """
+    
+    def __init__(self, query: Optional[dict] = None, max_staleness: float = 300.0):
+        self.query = query if query is not None else {"is_active": True}
+        self.max_staleness = max_staleness
+        self._snapshot: Optional[JobFeatures] = None
+        self._version = 0
+        self._stale = True
+        self._lock = asyncio.Lock()
+    
+    @property
+    def version(self) -> int:
+        """Monotonic catalogue version, bumped on every invalidation"""
+        return self._version
+    
+    def invalidate(self):
+        """Mark the catalogue as changed; the next get() reloads it"""
+        self._version += 1
+        self._stale = True
+    
+    def _is_fresh(self) -> bool:
+        return (
+            self._snapshot is not None
+            and not self._stale
+            and time.time() - self._snapshot.loaded_at < self.max_staleness
+        )
+    
+    async def get(self, db) -> JobFeatures:
+        """Current snapshot, reloading from Mongo if it is stale"""
+        if self._is_fresh():
+            return self._snapshot
+        async with self._lock:
+            if not self._is_fresh():
+                if not self._stale:
+                    self._version += 1  # Periodic reload may pick up other workers' writes
+                # Clear before reading so writes during the load trigger another reload
+                self._stale = False
+                version = self._version
+                try:
+                    jobs = await db.jobs.find(self.query, {"_id": 0}).to_list(None)
+                    self._snapshot = await asyncio.to_thread(JobFeatures.from_jobs, jobs, version)
+                    logger.info(f"Job feature store loaded {len(jobs)} jobs (v{version})")
+                except Exception:
+                    self._stale = True
+                    raise
+        return self._snapshot
+    
+    async def watch(self, db):
+        """Invalidate on jobs collection changes (requires a replica set)"""
+        try:
+            async with db.jobs.watch() as stream:
+                async for _ in stream:
+                    self.invalidate()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"Job change stream unavailable, relying on explicit invalidation: {e}")
+
+
 # ===================== AI CONTENT REWRITER =====================
 
 async def rewrite_content_with_ai(
@@ -549,6 +881,7 @@ def generate_slug(text: str, state: str = "") -> str:
 
 _job_scraper = None
 _ai_job_matcher = None
+_job_feature_store = None
 
 
 def get_job_scraper() -> JobScraper:
@@ -567,12 +900,23 @@ def get_ai_job_matcher(openai_client=None) -> AIJobMatcher:
     return _ai_job_matcher
 
 
+def get_job_feature_store() -> JobFeatureStore:
+    """Lazy load the process-wide JobFeatureStore"""
+    global _job_feature_store
+    if _job_feature_store is None:
+        _job_feature_store = JobFeatureStore()
+    return _job_feature_store
+
+
 # Export
 __all__ = [
     'JobScraper', 
     'AIJobMatcher', 
+    'JobFeatures',
+    'JobFeatureStore',
     'rewrite_content_with_ai',
     'generate_slug',
     'get_job_scraper',
-    'get_ai_job_matcher'
+    'get_ai_job_matcher',
+    'get_job_feature_store'
 ]
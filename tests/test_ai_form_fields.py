@@ -0,0 +1,31 @@
+"""
+Form field normalization of the AI routes (/classify/form, /map/user-to-form)
+"""
+
+import pytest
+
+ai_routes = pytest.importorskip("backend.routes.ai_routes_v2")
+
+from backend.ai import FieldClassifier
+
+
+def test_label_list_classifies_by_label():
+    fields = ai_routes.to_form_fields(["father name", "pincode", "email", "नाम"])
+    classified = FieldClassifier().classify_form_fields(fields)
+    assert [(field["type"], field["confidence"]) for field in classified] == [
+        ("father_name", 1.0), ("pincode", 1.0), ("email", 1.0), ("name", 1.0),
+    ]
+
+
+def test_label_dict_classifies_by_label():
+    fields = ai_routes.to_form_fields({"father name": "", "email": "a@example.com"})
+    classified = FieldClassifier().classify_form_fields(fields)
+    assert [field["type"] for field in classified] == ["father_name", "email"]
+
+
+def test_mapping_is_keyed_by_label_without_ids():
+    classifier = FieldClassifier()
+    classified = classifier.classify_form_fields(ai_routes.to_form_fields(["नाम", "email"]))
+    mapping = classifier.map_user_to_fields({"name": "Ram Kumar", "email": "ram@example.com"}, classified)
+    assert mapping["नाम"]["value"] == "Ram Kumar"
+    assert mapping["email"]["value"] == "ram@example.com"